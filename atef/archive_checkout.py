@@ -0,0 +1,470 @@
+"""
+Passive checkouts against archived data.
+
+Rather than reading live EPICS data, devices and PVs are read by way of the
+:class:`~atef.archive_device.ArchiverControlLayer` at a given time in the past.
+All PVs of a prepared checkout are requested together, with a single snapshot
+request per archiver appliance, before any comparisons are run.
+
+A checkout may also be evaluated over a range of time (:func:`sweep_archived_file`)
+or searched for the time it started failing (:func:`bisect_archived_file`).
+
+Tool-based comparisons (e.g., ping) are not archived and still run live.  They
+are not included in sweeps.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import happi
+import numpy as np
+import ophyd
+
+from .archive_device import (ArchivedValue, ArchiverHelper, ArchiverPV,
+                             get_archived_pvnames, get_archived_signal_cache)
+from .cache import DataCache
+from .config_model.passive import (ConfigurationFile,
+                                   PreparedDeviceConfiguration, PreparedFile,
+                                   PreparedSignalComparison)
+from .enums import Severity
+from .reduce import EnumValue
+
+logger = logging.getLogger(__name__)
+
+
+def make_archived_cache(dt: datetime.datetime, **kwargs) -> DataCache:
+    """
+    Make a data cache which reads archived data at the given time.
+
+    Parameters
+    ----------
+    dt : datetime.datetime
+        The time at which to read data.
+    **kwargs :
+        Passed to :class:`~atef.cache.DataCache`.
+
+    Returns
+    -------
+    DataCache
+    """
+    return DataCache(
+        signals=get_archived_signal_cache(dt),
+        archive_timestamp=dt,
+        **kwargs
+    )
+
+
+def get_prepared_pvnames(prepared_file: PreparedFile) -> List[str]:
+    """
+    Get the names of all archiver-backed PVs used in a prepared checkout.
+
+    This includes all PVs of prepared devices, and not only the compared
+    signals, as the former are requested on instantiation of the device.
+
+    Parameters
+    ----------
+    prepared_file : PreparedFile
+        The prepared checkout.
+
+    Returns
+    -------
+    list of str
+        Sorted, unique PV names.
+    """
+    objs: Dict[int, ophyd.ophydobj.OphydObject] = {}
+    for group in prepared_file.walk_groups():
+        if isinstance(group, PreparedDeviceConfiguration):
+            objs.update((id(device), device) for device in group.devices)
+    for comparison in prepared_file.walk_comparisons():
+        signal = getattr(comparison, "signal", None)
+        if signal is not None:
+            objs[id(signal)] = signal
+    return get_archived_pvnames(*objs.values())
+
+
+def prefetch_archived_data(
+    prepared_file: PreparedFile,
+) -> Dict[str, ArchivedValue]:
+    """
+    Request the archived data for all PVs of a prepared checkout at once.
+
+    The data is stored in the :class:`~atef.archive_device.ArchiverHelper`
+    cache, from where later reads are served.
+
+    Parameters
+    ----------
+    prepared_file : PreparedFile
+        The checkout, prepared with an archived data cache (see
+        :func:`make_archived_cache`).
+
+    Returns
+    -------
+    dict of str to ArchivedValue
+        Archived data, keyed by PV name.
+    """
+    dt = prepared_file.cache.archive_timestamp
+    if dt is None:
+        raise ValueError("The checkout was not prepared to use archived data")
+
+    pvnames = get_prepared_pvnames(prepared_file)
+    logger.debug("Requesting %d PVs from the archiver at %s", len(pvnames), dt)
+    if not pvnames:
+        return {}
+    return ArchiverHelper.instance().get_pvs_at_time(*pvnames, dt=dt)
+
+
+def prepare_archived_file(
+    file: ConfigurationFile,
+    dt: datetime.datetime,
+    *,
+    client: Optional[happi.Client] = None,
+    cache: Optional[DataCache] = None,
+) -> PreparedFile:
+    """
+    Prepare a ConfigurationFile to run against archived data at the given
+    time, and fetch that data.
+
+    Parameters
+    ----------
+    file : ConfigurationFile
+        The configuration file instance.
+    dt : datetime.datetime
+        The time at which to read data.
+    client : happi.Client, optional
+        A happi Client instance.
+    cache : DataCache, optional
+        An archived data cache for ``dt``.  If unspecified, a new one will be
+        made with :func:`make_archived_cache`.
+
+    Returns
+    -------
+    PreparedFile
+    """
+    if cache is None:
+        cache = make_archived_cache(dt)
+    elif cache.archive_timestamp != dt:
+        raise ValueError(
+            f"The data cache reads archived data at {cache.archive_timestamp}, "
+            f"not {dt}"
+        )
+
+    # Hold off on background requests for individual devices while preparing,
+    # so that everything may be requested at once
+    with ArchiverHelper.instance().hold():
+        prepared_file = PreparedFile.from_config(file, client=client, cache=cache)
+        prefetch_archived_data(prepared_file)
+    return prepared_file
+
+
+def is_failure(severity: Severity) -> bool:
+    """Whether ``severity`` marks a failed comparison."""
+    return severity in (Severity.error, Severity.internal_error)
+
+
+@dataclass
+class ArchivedComparison:
+    """
+    A prepared comparison evaluated directly on archived values of its PV.
+    """
+    #: The prepared comparison.
+    prepared: PreparedSignalComparison
+    #: The archived PV read by the comparison.
+    pvname: str
+    #: Enum strings of the PV, if an enum.
+    enum_strs: Optional[Tuple[str, ...]] = None
+
+    @property
+    def identifier(self) -> str:
+        return self.prepared.identifier
+
+    @classmethod
+    def from_prepared(
+        cls, prepared: PreparedSignalComparison
+    ) -> Optional[ArchivedComparison]:
+        """
+        Wrap ``prepared``, if it reads an archived PV.  Returns None otherwise.
+        """
+        pv = getattr(prepared.signal, "_read_pv", None)
+        if not isinstance(pv, ArchiverPV):
+            return None
+        enum_strs = getattr(prepared.signal, "enum_strs", None)
+        return cls(
+            prepared=prepared,
+            pvname=pv.pvname,
+            enum_strs=tuple(enum_strs) if enum_strs else None,
+        )
+
+    async def prepare(self) -> None:
+        """
+        Prepare the comparison for evaluation.  Dynamic values are read once,
+        at the time the checkout was prepared for.
+        """
+        await self.prepared.comparison.prepare(self.prepared.cache)
+
+    def to_data(self, value: Optional[ArchivedValue]) -> Any:
+        """
+        Convert an archived value to the data the comparison expects, as read
+        from the signal by :func:`atef.reduce.get_data_for_signal`.
+        """
+        if value is None or value.value is None:
+            return None
+        data = value.value
+        enum_strs = value.enum_strs or self.enum_strs
+        if enum_strs and isinstance(data, int) and 0 <= data < len(enum_strs):
+            return EnumValue(data, enum_strs[data])
+        if self.prepared.comparison.string:
+            return str(data)
+        return data
+
+    def evaluate(self, value: Optional[ArchivedValue]) -> Severity:
+        """Get the severity of the comparison for an archived value."""
+        comparison = self.prepared.comparison
+        data = self.to_data(value)
+        if data is None:
+            return comparison.if_disconnected
+        try:
+            result = comparison.compare(data, identifier=self.identifier)
+        except Exception:
+            logger.debug("Comparison %s failed", self.identifier, exc_info=True)
+            return Severity.internal_error
+        return result.severity
+
+
+async def get_archived_comparisons(
+    prepared_file: PreparedFile,
+) -> List[ArchivedComparison]:
+    """
+    Get all comparisons of a prepared checkout that read archived PVs, ready
+    for evaluation.
+    """
+    archived = []
+    for prepared in prepared_file.walk_comparisons():
+        if isinstance(prepared, PreparedSignalComparison):
+            comparison = ArchivedComparison.from_prepared(prepared)
+            if comparison is None:
+                continue
+            try:
+                await comparison.prepare()
+            except Exception as ex:
+                # Evaluated as an internal error
+                logger.warning(
+                    "Failed to prepare comparison for %s: %s",
+                    comparison.identifier,
+                    ex,
+                )
+            archived.append(comparison)
+    return archived
+
+
+@dataclass
+class ComparisonTimeline:
+    """
+    The severity of a single comparison at each time of an archived sweep.
+    """
+    #: The comparison.
+    comparison: ArchivedComparison
+    #: The times evaluated.
+    timestamps: List[datetime.datetime] = field(default_factory=list)
+    #: The severity at each of ``timestamps``.
+    severities: List[Severity] = field(default_factory=list)
+
+    @property
+    def identifier(self) -> str:
+        return self.comparison.identifier
+
+    @property
+    def passed(self) -> bool:
+        """Whether the comparison passed at all times."""
+        return not any(is_failure(severity) for severity in self.severities)
+
+    def first_failure(self) -> Optional[datetime.datetime]:
+        """The first time at which the comparison failed, if any."""
+        for timestamp, severity in zip(self.timestamps, self.severities):
+            if is_failure(severity):
+                return timestamp
+        return None
+
+
+def get_sweep_times(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    step: datetime.timedelta,
+) -> List[datetime.datetime]:
+    """Get evenly spaced times from ``start`` to ``end``, inclusive."""
+    if step <= datetime.timedelta(0):
+        raise ValueError(f"Sweep step must be positive, not {step}")
+    count = int((end - start) / step) + 1
+    return [start + idx * step for idx in range(max(count, 0))]
+
+
+def _evaluate_timeline(
+    comparison: ArchivedComparison,
+    history: Sequence[ArchivedValue],
+    times: np.ndarray,
+    timestamps: List[datetime.datetime],
+) -> ComparisonTimeline:
+    """
+    Evaluate ``comparison`` at ``times`` (epoch seconds), each time using the
+    last sample of ``history`` at or before it.
+
+    Archived values only change at sample times, so the comparison is run
+    once per sample in use rather than once per time.
+    """
+    sample_times = np.array([value.timestamp.timestamp() for value in history])
+    indices = np.searchsorted(sample_times, times, side="right") - 1
+    by_index: Dict[int, Severity] = {}
+    severities = []
+    for idx in indices.tolist():
+        try:
+            severity = by_index[idx]
+        except KeyError:
+            value = history[idx] if idx >= 0 else None
+            severity = by_index[idx] = comparison.evaluate(value)
+        severities.append(severity)
+    return ComparisonTimeline(
+        comparison=comparison,
+        timestamps=list(timestamps),
+        severities=severities,
+    )
+
+
+async def sweep_archived_file(
+    file: ConfigurationFile,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    step: datetime.timedelta,
+    *,
+    binned: bool = True,
+    client: Optional[happi.Client] = None,
+) -> List[ComparisonTimeline]:
+    """
+    Evaluate a checkout against archived data at regular times over a range.
+
+    The checkout is prepared once, at ``start``.  The history of each PV over
+    the range is then requested in a single query, rather than one snapshot
+    per time.
+
+    Parameters
+    ----------
+    file : ConfigurationFile
+        The configuration file instance.
+    start : datetime.datetime
+        The first time to evaluate.
+    end : datetime.datetime
+        The last time to evaluate.
+    step : datetime.timedelta
+        The interval between evaluated times.
+    binned : bool, optional
+        Have the appliance reduce the PV history to bins of ``step`` (rounded
+        to seconds), where the last value in each bin applies from the end of
+        the bin.  Bins are aligned to multiples of ``step`` since the epoch,
+        so changes may be seen up to one bin late.  Disable to evaluate every
+        raw sample, at the cost of larger queries.
+    client : happi.Client, optional
+        A happi Client instance.
+
+    Returns
+    -------
+    list of ComparisonTimeline
+        The timeline of each comparison reading an archived PV.
+    """
+    timestamps = get_sweep_times(start, end, step)
+    prepared_file = prepare_archived_file(file, start, client=client)
+    comparisons = await get_archived_comparisons(prepared_file)
+
+    helper = ArchiverHelper.instance()
+    bin_size = int(step.total_seconds()) if binned else None
+    # The value at ``start`` comes from the snapshot taken when preparing
+    initial = helper.get_pvs_at_time(
+        *{comparison.pvname for comparison in comparisons}, dt=start
+    )
+    histories: Dict[str, List[ArchivedValue]] = {}
+    for pvname in sorted(initial):
+        history = helper.get_pv_history(pvname, start, end, bin_size=bin_size)
+        if initial[pvname].appliance is not None:
+            history.insert(0, initial[pvname])
+        histories[pvname] = sorted(history, key=lambda value: value.timestamp)
+
+    times = np.array([timestamp.timestamp() for timestamp in timestamps])
+    return [
+        _evaluate_timeline(
+            comparison, histories[comparison.pvname], times, timestamps
+        )
+        for comparison in comparisons
+    ]
+
+
+def _failing_at(
+    comparisons: Sequence[ArchivedComparison],
+    dt: datetime.datetime,
+) -> List[ArchivedComparison]:
+    """Get the comparisons failing at ``dt``, using a single snapshot."""
+    data = ArchiverHelper.instance().get_pvs_at_time(
+        *{comparison.pvname for comparison in comparisons}, dt=dt
+    )
+    return [
+        comparison for comparison in comparisons
+        if is_failure(comparison.evaluate(data.get(comparison.pvname)))
+    ]
+
+
+async def bisect_archived_file(
+    file: ConfigurationFile,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    resolution: datetime.timedelta = datetime.timedelta(seconds=1),
+    *,
+    client: Optional[happi.Client] = None,
+) -> Optional[Tuple[datetime.datetime, List[ArchivedComparison]]]:
+    """
+    Find the time at which a checkout started failing on archived data.
+
+    Assuming the checkout passes at ``start`` and fails from some time on, a
+    binary search requires one snapshot per halving of the range, or
+    ``log2((end - start) / resolution)`` in total.
+
+    Parameters
+    ----------
+    file : ConfigurationFile
+        The configuration file instance.
+    start : datetime.datetime
+        A time at which the checkout passed.
+    end : datetime.datetime
+        A time at which the checkout failed.
+    resolution : datetime.timedelta, optional
+        Stop searching once the failure is known to within this interval.
+    client : happi.Client, optional
+        A happi Client instance.
+
+    Returns
+    -------
+    (datetime.datetime, list of ArchivedComparison) or None
+        The earliest time found with failures and the comparisons failing
+        then, or None if the checkout does not fail at ``end``.
+
+    Raises
+    ------
+    ValueError
+        If the checkout already fails at ``start``.
+    """
+    prepared_file = prepare_archived_file(file, start, client=client)
+    comparisons = await get_archived_comparisons(prepared_file)
+    if _failing_at(comparisons, start):
+        raise ValueError(f"The checkout already fails at {start}")
+
+    failing = _failing_at(comparisons, end)
+    if not failing:
+        return None
+
+    good, bad = start, end
+    while bad - good > resolution:
+        middle = good + (bad - good) / 2
+        failing_middle = _failing_at(comparisons, middle)
+        if failing_middle:
+            bad, failing = middle, failing_middle
+        else:
+            good = middle
+    return bad, failing
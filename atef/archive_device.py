@@ -1,19 +1,25 @@
 from __future__ import annotations
 
+import bisect
 import collections
+import concurrent.futures
+import contextlib
 import copy
 import dataclasses
 import datetime
+import functools
 import inspect
 import logging
 import math
 import threading
 import time
+import weakref
 from types import SimpleNamespace
-from typing import (Any, Callable, ClassVar, Deque, Dict, Generator, Iterable,
-                    List, Optional, Tuple, Type)
+from typing import (TYPE_CHECKING, Any, Callable, ClassVar, Dict, Generator,
+                    Iterable, List, Optional, Tuple, Type)
 
 import archapp
+import happi
 import ophyd
 from ophyd import Component as Cpt
 from ophyd import Device
@@ -25,10 +31,10 @@ from ophyd.signal import EpicsSignalBase
 from .pyepics_compat import (PyepicsConnectionCallback, PyepicsPutCallback,
                              PyepicsPvCompatibility)
 
-logger = logging.getLogger(__name__)
-
+if TYPE_CHECKING:
+    from .cache import _SignalCache
 
-PER_PV_CACHE = 100
+logger = logging.getLogger(__name__)
 
 
 def get_dispatcher():
@@ -116,7 +122,17 @@ class ArchivedValue:
 @dataclasses.dataclass
 class ArchivedValueStore:
     """
-    Archived value cache entry.
+    Archived value cache entry for a single PV.
+
+    Samples are kept sorted by time, such that the value at a given time may
+    be found by bisection.
+
+    The requested timestamp is not always equal to that which the archiver
+    responds with.  The archived values may not change as frequently as those
+    in the control system due to PV configuration or archiver configuration,
+    so many requested values may map onto a single archiver appliance data
+    value.  Rather than recording each requested timestamp, each sample
+    records the latest time it is known to apply through (``valid_until``).
 
     Attributes
     ----------
@@ -126,38 +142,138 @@ class ArchivedValueStore:
     appliance : archapp.EpicsArchive
         The appliance that sources the PV's data.
 
-    data : deque[ArchivedValue]
-        Length-limited deque of historical data.
+    times : list[float]
+        Sorted sample times, in seconds since the epoch.
+
+    values : list[ArchivedValue]
+        The samples, in the order of ``times``.
 
-    timestamp_aliases : dict[datetime, datetime]
-        The requested timestamp is not always equal to that which the archiver
-        responds with.  The archived values may not change as frequently as
-        those in the control system due to PV configuration or archiver
-        configuration, so many requested values may map onto a single archiver
-        appliance data value.  This dictionary is implicitly kept up-to-date on
-        access of ``by_timestamp``.
+    valid_until : list[float]
+        For each sample, the latest time (in seconds since the epoch) known
+        to have no newer sample.  The sample applies from its own time
+        through this time.
     """
     pvname: str
     appliance: archapp.EpicsArchive
-    data: Deque[ArchivedValue] = dataclasses.field(
-        default_factory=lambda: collections.deque(maxlen=PER_PV_CACHE)
-    )
-    timestamp_aliases: Dict[datetime.datetime, datetime.datetime] = dataclasses.field(
-        default_factory=dict
-    )
+    times: List[float] = dataclasses.field(default_factory=list)
+    values: List[ArchivedValue] = dataclasses.field(default_factory=list)
+    valid_until: List[float] = dataclasses.field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def get(self, dt: datetime.datetime) -> Optional[ArchivedValue]:
+        """
+        Get the value at ``dt``, if known.
+
+        This is either a sample at exactly ``dt`` or the nearest preceding
+        sample known to still apply at ``dt``.
+        """
+        timestamp = dt.timestamp()
+        idx = bisect.bisect_right(self.times, timestamp) - 1
+        if idx >= 0 and timestamp <= self.valid_until[idx]:
+            return self.values[idx]
+        return None
+
+    def add(
+        self,
+        value: ArchivedValue,
+        dt: Optional[datetime.datetime] = None,
+    ) -> int:
+        """
+        Add a sample, which the archiver returned as the value at ``dt``.
+
+        Parameters
+        ----------
+        value : ArchivedValue
+            The sample.
+
+        dt : datetime.datetime, optional
+            The requested time.  Defaults to the time of the sample.
+
+        Returns
+        -------
+        int
+            The number of samples added: 0 if the sample was already stored.
+        """
+        timestamp = value.timestamp.timestamp()
+        valid_until = timestamp if dt is None else max(dt.timestamp(), timestamp)
+        idx = bisect.bisect_left(self.times, timestamp)
+        if idx < len(self.times) and self.times[idx] == timestamp:
+            self.values[idx] = value
+            self.valid_until[idx] = max(self.valid_until[idx], valid_until)
+            return 0
+
+        if idx < len(self.times):
+            # There is a newer sample, which limits how long this one applies
+            valid_until = min(valid_until, self.times[idx])
+        if idx > 0:
+            # ... and this one limits how long the preceding sample applies
+            self.valid_until[idx - 1] = min(self.valid_until[idx - 1], timestamp)
+        self.times.insert(idx, timestamp)
+        self.values.insert(idx, value)
+        self.valid_until.insert(idx, valid_until)
+        return 1
+
+    def add_history(
+        self,
+        values: Iterable[ArchivedValue],
+        end: datetime.datetime,
+    ) -> int:
+        """
+        Add all raw samples of a time range ending at ``end``.  Each sample
+        applies until the next.
+
+        Returns
+        -------
+        int
+            The number of samples added.
+        """
+        values = sorted(values, key=lambda value: value.timestamp)
+        added = 0
+        for value, next_value in zip(values, values[1:] + [None]):
+            added += self.add(
+                value, end if next_value is None else next_value.timestamp
+            )
+        return added
+
+    def trim(self, count: int) -> int:
+        """
+        Remove up to ``count`` of the oldest samples.
+
+        Returns
+        -------
+        int
+            The number of samples removed.
+        """
+        count = min(count, len(self.times))
+        del self.times[:count]
+        del self.values[:count]
+        del self.valid_until[:count]
+        return count
+
+
+@dataclasses.dataclass
+class ArchiverStatistics:
+    """
+    Counters describing the use of the ArchiverHelper.
+    """
+    #: PV values found in the cache.
+    cache_hits: int = 0
+    #: PV values not found in the cache.
+    cache_misses: int = 0
+    #: Snapshot queries sent to appliances.
+    queries: int = 0
+    #: Total time spent in snapshot queries [sec].
+    query_time: float = 0.0
 
     @property
-    def by_timestamp(self) -> Dict[datetime.datetime, ArchivedValue]:
-        result = {
-            data.timestamp: data
-            for data in self.data
-        }
-        for from_, to in list(self.timestamp_aliases.items()):
-            try:
-                result[from_] = result[to]
-            except KeyError:
-                self.timestamp_aliases.pop(to)
-        return result
+    def hit_rate(self) -> float:
+        """The fraction of PV values found in the cache."""
+        total = self.cache_hits + self.cache_misses
+        if not total:
+            return 0.0
+        return self.cache_hits / total
 
 
 ArchiverCallback = Callable[[ArchivedValue], None]
@@ -168,19 +284,46 @@ MatchPVsResult = Tuple[
 ]
 
 
+def _get_bin_end(
+    timestamp: datetime.datetime, bin_size: int
+) -> datetime.datetime:
+    """The end of the ``bin_size`` second archiver bin holding ``timestamp``."""
+    bin_end = (int(timestamp.timestamp()) // bin_size + 1) * bin_size
+    return datetime.datetime.fromtimestamp(bin_end, tz=timestamp.tzinfo)
+
+
 class ArchiverHelper:
     _instance_: ClassVar[ArchiverHelper]
     appliances: List[archapp.EpicsArchive]
-    cache: Dict[str, ArchivedValueStore]
-    search_loop_rate: ClassVar[float] = 0.2
+    #: Cached values by PV name, least recently used first.
+    cache: collections.OrderedDict[str, ArchivedValueStore]
+    #: Counters for monitoring.
+    statistics: ArchiverStatistics
+    #: Time to wait for further requests before searching for queued PVs
+    #: [sec].  Requests queued in this window are searched for together.
+    batch_delay: ClassVar[float] = 0.005
+    #: The maximum number of appliance queries in progress at once.
+    max_concurrent_queries: ClassVar[int] = 4
+    #: The maximum number of values cached over all PVs.  Least recently used
+    #: PVs are evicted beyond this.
+    max_cached_values: ClassVar[int] = 100_000
     _pv_to_callbacks: Dict[datetime.datetime, Dict[str, List[ArchiverCallback]]]
 
     def __init__(self):
         self.appliances = []
         self.add_appliance("localhost")
-        self.cache = {}
+        self.cache = collections.OrderedDict()
+        self._cache_lock = threading.RLock()
+        self._cached_values = 0
+        self.statistics = ArchiverStatistics()
         self._callback_lock = threading.Lock()
+        self._pending = threading.Condition(self._callback_lock)
         self._pv_to_callbacks = {}
+        self._holds = 0
+        self._query_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_concurrent_queries,
+            thread_name_prefix="archiver_query",
+        )
         self.thread = threading.Thread(target=self._search_thread_loop, daemon=True)
         self.thread.start()
 
@@ -218,50 +361,137 @@ class ArchiverHelper:
         if dt is None:
             dt = datetime.datetime.now()
 
-        by_appliance = collections.defaultdict(list)
-        cached = {}
-        to_find = []
-        for pvname in set(pvnames):
-            cache_item = self.cache.get(pvname, None)
-            if cache_item is None:
-                to_find.append(pvname)
-            else:
-                try:
-                    cached[pvname] = cache_item.by_timestamp[dt]
-                except KeyError:
-                    by_appliance[cache_item.appliance].append(pvname)
-
-        to_find = list(sorted(to_find))
+        cached, by_appliance, to_find = self._match_cached(pvnames, dt)
         for appliance in self.appliances:
             if not to_find:
                 break
 
-            try:
-                event = appliance.get_snapshot(*to_find, at=dt)
-            except ValueError:
-                ...
-            else:
-                for pvname, data in event.items():
-                    value = ArchivedValue.from_archapp(
-                        pvname, appliance, **data
-                    )
+            found = self._query_snapshot(appliance, dt, to_find)
+            cached.update(found)
+            to_find = [pvname for pvname in to_find if pvname not in found]
+
+        return cached, by_appliance, to_find
+
+    def _match_cached(
+        self,
+        pvnames: Iterable[str],
+        dt: datetime.datetime,
+    ) -> MatchPVsResult:
+        """
+        Match PVs to cached values or appliances, without querying appliances.
+        See `match_pvs_to_appliance`.
+        """
+        pvnames = set(pvnames)
+        by_appliance = collections.defaultdict(list)
+        cached = {}
+        to_find = set()
+        with self._cache_lock:
+            for pvname in pvnames:
+                cache_item = self.cache.get(pvname, None)
+                if cache_item is None:
+                    to_find.add(pvname)
+                    continue
+                self.cache.move_to_end(pvname)
+                value = cache_item.get(dt)
+                if value is not None:
                     cached[pvname] = value
-                    self.add_to_cache(pvname, value, dt)
-                    to_find.remove(pvname)
+                else:
+                    by_appliance[cache_item.appliance].append(pvname)
+            self.statistics.cache_hits += len(cached)
+            self.statistics.cache_misses += len(pvnames) - len(cached)
 
-        return cached, dict(by_appliance), to_find
+        return cached, dict(by_appliance), sorted(to_find)
 
-    def add_to_cache(self, pvname: str, value: ArchivedValue, dt: datetime.datetime):
-        """Add an ArchivedValue to the cache for the given pvname."""
-        if pvname not in self.cache:
-            self.cache[pvname] = ArchivedValueStore(
+    def _query_snapshot(
+        self,
+        appliance: archapp.EpicsArchive,
+        dt: datetime.datetime,
+        pvnames: List[str],
+    ) -> Dict[str, ArchivedValue]:
+        """Query ``appliance`` for the values of ``pvnames`` at ``dt``."""
+        start = time.monotonic()
+        try:
+            event = appliance.get_snapshot(*pvnames, at=dt)
+        except ValueError:
+            return {}
+        finally:
+            with self._cache_lock:
+                self.statistics.queries += 1
+                self.statistics.query_time += time.monotonic() - start
+
+        values = {}
+        for pvname, data in event.items():
+            value = ArchivedValue.from_archapp(pvname, appliance, **data)
+            values[pvname] = value
+            self.add_to_cache(pvname, value, dt)
+        return values
+
+    def get_cached_value(
+        self, pvname: str, dt: datetime.datetime
+    ) -> Optional[ArchivedValue]:
+        """Get the cached value of ``pvname`` at ``dt``, if available."""
+        with self._cache_lock:
+            cache_item = self.cache.get(pvname, None)
+            if cache_item is None:
+                return None
+            self.cache.move_to_end(pvname)
+            return cache_item.get(dt)
+
+    def _get_store(
+        self, pvname: str, appliance: archapp.EpicsArchive
+    ) -> ArchivedValueStore:
+        """Get the cache entry for ``pvname``, marking it as recently used."""
+        cache_item = self.cache.get(pvname, None)
+        if cache_item is None:
+            cache_item = self.cache[pvname] = ArchivedValueStore(
                 pvname=pvname,
-                appliance=value.appliance,
+                appliance=appliance,
             )
-        cache_item = self.cache[pvname]
-        cache_item.data.append(value)
-        if dt != value.timestamp:
-            cache_item.timestamp_aliases[dt] = value.timestamp
+        else:
+            self.cache.move_to_end(pvname)
+        return cache_item
+
+    def _evict(self) -> None:
+        """Evict least recently used values beyond ``max_cached_values``."""
+        while self._cached_values > self.max_cached_values and self.cache:
+            pvname, cache_item = next(iter(self.cache.items()))
+            excess = self._cached_values - self.max_cached_values
+            if len(self.cache) > 1 or excess >= len(cache_item):
+                del self.cache[pvname]
+                self._cached_values -= len(cache_item)
+            else:
+                # A single PV over the limit keeps its newest values
+                self._cached_values -= cache_item.trim(excess)
+
+    def add_to_cache(self, pvname: str, value: ArchivedValue, dt: datetime.datetime):
+        """Add an ArchivedValue to the cache for the given pvname."""
+        with self._cache_lock:
+            cache_item = self._get_store(pvname, value.appliance)
+            self._cached_values += cache_item.add(value, dt)
+            self._evict()
+
+    def add_history_to_cache(
+        self,
+        pvname: str,
+        values: List[ArchivedValue],
+        end: datetime.datetime,
+    ):
+        """
+        Add all raw ArchivedValues of a time range ending at ``end`` to the
+        cache for the given pvname.
+        """
+        if not values:
+            return
+        with self._cache_lock:
+            cache_item = self._get_store(pvname, values[0].appliance)
+            self._cached_values += cache_item.add_history(values, end)
+            self._evict()
+
+    def clear_cache(self):
+        """Remove all cached values."""
+        with self._cache_lock:
+            self.cache.clear()
+            self._cached_values = 0
 
     def get_pvs_at_time(
         self, *pvnames: str, dt: datetime.datetime
@@ -285,28 +515,92 @@ class ArchiverHelper:
         archive_data : dict[str, ArchivedValue]
             PV name to ArchivedValue.
         """
-        data, by_appliance, missing = self.match_pvs_to_appliance(*pvnames, dt=dt)
-        for appliance, appliance_pvs in by_appliance.items():
-            try:
-                event = appliance.get_snapshot(*appliance_pvs, at=dt)
-            except ValueError:
-                ...
-            else:
-                missing.extend(list(set(appliance_pvs) - set(event)))
-                for pvname, per_pv_data in event.items():
-                    value = ArchivedValue.from_archapp(
-                        pvname, appliance, **per_pv_data
-                    )
-                    data[pvname] = value
-                    self.add_to_cache(pvname, value, dt)
+        return self.get_pvs_at_times({dt: pvnames})[dt]
 
-        for pv in missing:
-            data[pv] = ArchivedValue.from_missing_data(
-                pvname=pv,
-                timestamp=dt,
-            )
+    def get_pvs_at_times(
+        self,
+        requests: Dict[datetime.datetime, Iterable[str]],
+        errors: Optional[Dict[datetime.datetime, Exception]] = None,
+    ) -> Dict[datetime.datetime, Dict[str, ArchivedValue]]:
+        """
+        Bulk request many PVs at many timestamps.
+
+        Uncached PVs are requested with one query per timestamp and
+        appliance, and the queries are run concurrently (up to
+        ``max_concurrent_queries`` at once).  PVs of unknown appliances are
+        searched for in each appliance in the order of addition.  Missing PVs
+        are initialized with stub values.
+
+        Parameters
+        ----------
+        requests : dict[datetime.datetime, iterable of str]
+            PV names by timestamp.
 
-        return data
+        errors : dict[datetime.datetime, Exception], optional
+            If provided, failed queries are recorded here by timestamp and
+            the timestamp is left out of the result.  Otherwise, the first
+            failure is raised.
+
+        Returns
+        -------
+        archive_data : dict[datetime.datetime, dict[str, ArchivedValue]]
+            Timestamp to PV name to ArchivedValue.
+        """
+        appliances = list(self.appliances)
+        requests = {dt: list(pvnames) for dt, pvnames in requests.items()}
+        results = {}
+        # Each query is (dt, pvnames, appliance, index of appliance in search)
+        queries = []
+        for dt, pvnames in requests.items():
+            cached, by_appliance, to_find = self._match_cached(pvnames, dt)
+            results[dt] = cached
+            for appliance, appliance_pvs in by_appliance.items():
+                queries.append((dt, appliance_pvs, appliance, None))
+            if to_find and appliances:
+                queries.append((dt, to_find, appliances[0], 0))
+
+        failed = {}
+        while queries:
+            futures = [
+                self._query_executor.submit(
+                    self._query_snapshot, appliance, dt, pvnames
+                )
+                for dt, pvnames, appliance, _ in queries
+            ]
+            next_queries = []
+            for (dt, pvnames, _, search_idx), future in zip(queries, futures):
+                try:
+                    found = future.result()
+                except Exception as ex:
+                    failed.setdefault(dt, ex)
+                    continue
+                results[dt].update(found)
+                to_find = [pvname for pvname in pvnames if pvname not in found]
+                if to_find and search_idx is not None:
+                    search_idx += 1
+                    if search_idx < len(appliances):
+                        next_queries.append(
+                            (dt, to_find, appliances[search_idx], search_idx)
+                        )
+            queries = next_queries
+
+        if failed and errors is None:
+            raise next(iter(failed.values()))
+
+        for dt, pvnames in requests.items():
+            if dt in failed:
+                errors[dt] = failed[dt]
+                del results[dt]
+                continue
+            data = results[dt]
+            for pvname in pvnames:
+                if pvname not in data:
+                    data[pvname] = ArchivedValue.from_missing_data(
+                        pvname=pvname,
+                        timestamp=dt,
+                    )
+
+        return results
 
     def get_pv_at_time(
         self, pvname: str, dt: datetime.datetime
@@ -330,40 +624,148 @@ class ArchiverHelper:
         """
         return self.get_pvs_at_time(pvname, dt=dt)[pvname]
 
+    def get_pv_history(
+        self,
+        pvname: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        bin_size: Optional[int] = None,
+    ) -> List[ArchivedValue]:
+        """
+        Request the archived samples of a PV over a time range, in a single
+        query.
+
+        Parameters
+        ----------
+        pvname : str
+            PV name.
+
+        start : datetime.datetime
+            The start of the time range.
+
+        end : datetime.datetime
+            The end of the time range.
+
+        bin_size : int, optional
+            If provided, have the appliance reduce the data to bins of this
+            many seconds, each holding the last sample (``lastFill``).  Falls
+            back to raw data for PVs that cannot be binned.  The appliance
+            aligns bins to multiples of ``bin_size`` since the epoch, and
+            stamps each somewhere within it (its start or middle).  Binned
+            values are instead stamped with the end of their bin, by which
+            time the last sample has occurred.
+
+        Returns
+        -------
+        archive_data : list of ArchivedValue
+            The samples, ordered by time.  Empty if no data is available.
+        """
+        with self._cache_lock:
+            cache_item = self.cache.get(pvname, None)
+        if cache_item is not None and cache_item.appliance is not None:
+            appliances = [cache_item.appliance]
+        else:
+            appliances = self.appliances
+
+        queries = [pvname]
+        if bin_size is not None:
+            bin_size = max(int(bin_size), 1)
+            queries.insert(0, f"lastFill_{bin_size}({pvname})")
+
+        for appliance in appliances:
+            for query in queries:
+                data = appliance._data.get_raw(query, start, end)
+                points = data.get("data", []) if isinstance(data, dict) else []
+                if points:
+                    values = sorted(
+                        (
+                            ArchivedValue.from_archapp(pvname, appliance, **point)
+                            for point in points
+                        ),
+                        key=lambda value: value.timestamp,
+                    )
+                    if query == pvname:
+                        # Binned values are not samples, and aren't cached
+                        self.add_history_to_cache(pvname, values, end)
+                    else:
+                        values = [
+                            dataclasses.replace(
+                                value,
+                                timestamp=_get_bin_end(value.timestamp, bin_size),
+                            )
+                            for value in values
+                        ]
+                    return values
+        return []
+
+    def _has_pending(self) -> bool:
+        return bool(self._pv_to_callbacks) and not self._holds
+
     def _search_thread_loop(self):
         """
-        Thread which searches for new PVs in bulk.
+        Thread which searches for queued PVs in bulk, as soon as they are
+        queued.
         """
         while True:
-            time.sleep(self.search_loop_rate)
-            if not self._pv_to_callbacks:
-                continue
+            with self._pending:
+                self._pending.wait_for(self._has_pending)
+            # Let closely-spaced requests (e.g., of a single device) coalesce
+            time.sleep(self.batch_delay)
+            self._process_pending()
+
+    def _process_pending(self):
+        """Retrieve all queued PVs and run their callbacks."""
+        with self._callback_lock:
+            to_update = self._pv_to_callbacks
+            self._pv_to_callbacks = {}
 
-            with self._callback_lock:
-                to_update = copy.deepcopy(self._pv_to_callbacks)
-                self._pv_to_callbacks.clear()
+        if not to_update:
+            return
 
-            for dt, pv_to_callback in to_update.items():
-                try:
-                    data_by_pv = self.get_pvs_at_time(*pv_to_callback, dt=dt)
-                except Exception:
-                    logger.exception(
-                        "Fatal error when retrieving PVs from archiver; "
-                        "associated devices may not work. PVs: %s",
-                        list(pv_to_callback)
-                    )
-                    continue
-                for pvname, data in data_by_pv.items():
-                    for callback in pv_to_callback[pvname]:
-                        try:
-                            callback(data)
-                        except Exception:
-                            logger.exception(
-                                "Failed to run callback %s for PV %s with data %s",
-                                callback,
-                                pvname,
-                                data,
-                            )
+        errors = {}
+        data_by_dt = self.get_pvs_at_times(to_update, errors=errors)
+        for dt, ex in errors.items():
+            logger.error(
+                "Fatal error when retrieving PVs from archiver; "
+                "associated devices may not work. PVs: %s",
+                list(to_update[dt]),
+                exc_info=ex,
+            )
+
+        for dt, data_by_pv in data_by_dt.items():
+            pv_to_callback = to_update[dt]
+            for pvname, data in data_by_pv.items():
+                for callback in pv_to_callback[pvname]:
+                    try:
+                        callback(data)
+                    except Exception:
+                        logger.exception(
+                            "Failed to run callback %s for PV %s with data %s",
+                            callback,
+                            pvname,
+                            data,
+                        )
+
+    @contextlib.contextmanager
+    def hold(self) -> Generator[None, None, None]:
+        """
+        Queue PVs without searching for them until the block exits.
+
+        This allows for PVs of many devices to be collected and requested
+        together (e.g., by way of `get_pvs_at_time`) rather than in several
+        batches.  Pending PVs are processed on exit.
+        """
+        with self._callback_lock:
+            self._holds += 1
+        try:
+            yield
+        finally:
+            with self._pending:
+                self._holds -= 1
+                release = not self._holds
+                self._pending.notify()
+            if release:
+                self._process_pending()
 
     def queue_pv(
         self,
@@ -377,19 +779,31 @@ class ArchiverHelper:
         """
         # ophyd ensures the callback won't be wrapped twice - just in case
         callback = wrap_callback(event_type, callback)
-        try:
-            cached_value = self.cache[pvname].by_timestamp[dt]
-        except KeyError:
-            ...
-        else:
+        cached_value = self.get_cached_value(pvname, dt)
+        if cached_value is not None:
             # Queue the callback to be run in the appropriate thread
             callback(cached_value)
             return
 
-        with self._callback_lock:
+        with self._pending:
             if dt not in self._pv_to_callbacks:
                 self._pv_to_callbacks[dt] = {}
             self._pv_to_callbacks[dt].setdefault(pvname, []).append(callback)
+            self._pending.notify()
+
+    def prefetch(self, pvnames: Iterable[str], dt: datetime.datetime):
+        """
+        Queue ``pvnames`` to be cached at ``dt``, without callbacks.
+
+        Used within `hold` to include PVs that will be needed shortly (e.g.,
+        those of lazy components) in the same query as the queued ones.
+        """
+        with self._pending:
+            pv_to_callbacks = self._pv_to_callbacks.setdefault(dt, {})
+            for pvname in pvnames:
+                if self.get_cached_value(pvname, dt) is None:
+                    pv_to_callbacks.setdefault(pvname, [])
+            self._pending.notify()
 
     @staticmethod
     def instance() -> ArchiverHelper:
@@ -422,6 +836,30 @@ class ArchiverDevice(Device):
     component_names: List[str]
     archive_timestamp: datetime.datetime = datetime.datetime.now()
 
+    def __init__(
+        self,
+        *args,
+        archive_timestamp: Optional[datetime.datetime] = None,
+        **kwargs
+    ):
+        # Set prior to component creation, as components look up their data
+        # at this time
+        if archive_timestamp is not None:
+            self.archive_timestamp = archive_timestamp
+
+        helper = ArchiverHelper.instance()
+        # Components (including those of sub-devices) queue their PVs as they
+        # are created; have them all requested at once, along with those
+        # expected of lazy components.
+        with helper.hold():
+            prefix = args[0] if args else kwargs.get("prefix", "")
+            if kwargs.get("parent") is None and isinstance(prefix, str):
+                helper.prefetch(
+                    get_expected_pvnames(type(self), prefix),
+                    self.archive_timestamp,
+                )
+            super().__init__(*args, **kwargs)
+
     def _find_archiver_pvs(self) -> Generator[Tuple[str, ArchiverPV], None, None]:
         for walk in self.walk_signals(include_lazy=True):
             if isinstance(walk.item, EpicsSignalBase):
@@ -451,9 +889,21 @@ class ArchiverControlLayer:
 
     _instance_: ClassVar[ArchiverControlLayer]
     _pvs: Dict[str, List[ArchiverPV]]
+    _states: weakref.WeakValueDictionary[
+        Tuple[str, datetime.datetime], ArchivedPVState
+    ]
 
     def __init__(self):
         self._pvs = {}
+        self._states = weakref.WeakValueDictionary()
+        self._states_lock = threading.Lock()
+
+    def __copy__(self) -> ArchiverControlLayer:
+        # Component kwargs may be copied; the control layer is shared
+        return self
+
+    def __deepcopy__(self, memo) -> ArchiverControlLayer:
+        return self
 
     @staticmethod
     def instance() -> ArchiverControlLayer:
@@ -508,6 +958,20 @@ class ArchiverControlLayer:
         self._pvs[pvname].append(pv)
         return pv
 
+    def get_pv_state(
+        self, pvname: str, dt: datetime.datetime
+    ) -> ArchivedPVState:
+        """
+        Get the state of ``pvname`` at ``dt``, shared by all ArchiverPVs
+        referencing it.  States are kept only as long as they are referenced.
+        """
+        with self._states_lock:
+            state = self._states.get((pvname, dt), None)
+            if state is None:
+                state = ArchivedPVState(pvname, dt)
+                self._states[(pvname, dt)] = state
+            return state
+
     def release_pvs(self, *pvs: str):
         for pvname in pvs:
             try:
@@ -551,6 +1015,215 @@ def make_archived_device(cls: Type[Device]) -> Type[ArchiverDevice]:
     )
 
 
+class ArchivedEpicsSignal(ophyd.EpicsSignalRO):
+    """
+    An EpicsSignalRO reading archiver appliance data at ``archive_timestamp``
+    by way of the :class:`ArchiverControlLayer`.
+    """
+    archive_timestamp: datetime.datetime = datetime.datetime.now()
+
+    def __init__(
+        self,
+        read_pv: str,
+        *,
+        archive_timestamp: Optional[datetime.datetime] = None,
+        **kwargs
+    ):
+        if archive_timestamp is not None:
+            self.archive_timestamp = archive_timestamp
+        kwargs.setdefault("cl", ArchiverControlLayer.instance())
+        super().__init__(read_pv, **kwargs)
+
+
+def get_archived_signal_cache(
+    dt: datetime.datetime,
+) -> _SignalCache[ArchivedEpicsSignal]:
+    """
+    Get a signal cache of :class:`ArchivedEpicsSignal` at the given time, for
+    use in a :class:`~atef.cache.DataCache`.
+    """
+    from .cache import _SignalCache
+
+    return _SignalCache[ArchivedEpicsSignal](
+        functools.partial(ArchivedEpicsSignal, archive_timestamp=dt)
+    )
+
+
+def _create_archived_device(
+    *args,
+    _archived_class: Type[Device],
+    _archive_timestamp: datetime.datetime,
+    **kwargs,
+) -> ArchiverDevice:
+    """
+    Instantiate the archived variant of ``_archived_class``.  The device class
+    of happi items loaded by :func:`load_archived_device`.
+    """
+    return make_archived_device(_archived_class)(
+        *args, archive_timestamp=_archive_timestamp, **kwargs
+    )
+
+
+def load_archived_device(
+    item: happi.HappiItem,
+    dt: datetime.datetime,
+) -> ArchiverDevice:
+    """
+    Instantiate the archived variant of the device described by a happi item,
+    reading data at the given time.
+
+    Unlike ``happi.loader.from_container``, the device is not stored in the
+    happi device cache.
+
+    Parameters
+    ----------
+    item : happi.HappiItem
+        The happi item.
+    dt : datetime.datetime
+        The time at which to read data.
+
+    Returns
+    -------
+    ArchiverDevice
+
+    Raises
+    ------
+    TypeError
+        If the item does not describe an ophyd Device.
+    """
+    cls = happi.loader.import_class(item.device_class)
+    if not inspect.isclass(cls) or not issubclass(cls, Device):
+        raise TypeError(
+            f"{item.name} is not an ophyd Device ({item.device_class}) and "
+            f"cannot be read from the archiver"
+        )
+
+    # Let happi fill in the arguments, instantiating the archived class in
+    # place of the original
+    archived_item = type(item)(**item.post())
+    archived_item.device_class = (
+        f"{_create_archived_device.__module__}.{_create_archived_device.__name__}"
+    )
+    archived_item.kwargs = dict(
+        item.kwargs, _archived_class=cls, _archive_timestamp=dt
+    )
+    # from_container always stores the result in the happi device cache, where
+    # it would replace any live device of the same name
+    missing = object()
+    cached = happi.loader.cache.get(item.name, missing)
+    try:
+        device = happi.loader.from_container(
+            archived_item, attach_md=False, use_cache=False
+        )
+    finally:
+        if cached is missing:
+            happi.loader.cache.pop(item.name, None)
+        else:
+            happi.loader.cache[item.name] = cached
+
+    try:
+        device.md = item
+    except Exception:
+        logger.warning("Unable to attach metadata to device %s", item.name)
+    return device
+
+
+def get_archived_pvnames(*objs: OphydObject) -> List[str]:
+    """
+    Get the names of all archiver-backed PVs of the given signals and devices.
+
+    Parameters
+    ----------
+    *objs : OphydObject
+        Signals or devices, including any lazy components of the latter.
+
+    Returns
+    -------
+    list of str
+        Sorted, unique PV names.
+    """
+    signals = []
+    for obj in objs:
+        if isinstance(obj, Device):
+            signals.extend(
+                walk.item for walk in obj.walk_signals(include_lazy=True)
+            )
+        else:
+            signals.append(obj)
+
+    pvnames = set()
+    for signal in signals:
+        for attr in ("_read_pv", "_write_pv"):
+            pv = getattr(signal, attr, None)
+            if isinstance(pv, ArchiverPV):
+                pvnames.add(pv.pvname)
+    return sorted(pvnames)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_component_pv_plan(
+    cls: Type[Device],
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Precompute the archiver-backed PVs of the components of ``cls``, lazy or
+    not, as (suffixes to the device prefix, full PV names).
+
+    Only components which name their PVs in the standard way are included,
+    as others (e.g., ``FormattedComponent``) depend on the instance.
+    """
+    suffixes = []
+    pvnames = []
+
+    def add(suffix: str, prefixed: bool):
+        (suffixes if prefixed else pvnames).append(suffix)
+
+    for cpt_name in cls.component_names:
+        cpt = getattr(cls, cpt_name)
+        if (
+            type(cpt).maybe_add_prefix is not Cpt.maybe_add_prefix
+            or type(cpt).create_component is not Cpt.create_component
+            or not isinstance(cpt.suffix, str)
+            or not inspect.isclass(cpt.cls)
+        ):
+            continue
+        prefixed = "suffix" in cpt.add_prefix
+        if issubclass(cpt.cls, EpicsSignalBase):
+            if not isinstance(cpt.kwargs.get("cl"), ArchiverControlLayer):
+                continue
+            add(cpt.suffix, prefixed)
+            write_pv = cpt.kwargs.get("write_pv")
+            if isinstance(write_pv, str):
+                add(write_pv, "write_pv" in cpt.add_prefix)
+        elif issubclass(cpt.cls, Device):
+            sub_suffixes, sub_pvnames = _get_component_pv_plan(cpt.cls)
+            pvnames.extend(sub_pvnames)
+            for sub_suffix in sub_suffixes:
+                add(cpt.suffix + sub_suffix, prefixed)
+
+    return tuple(suffixes), tuple(pvnames)
+
+
+def get_expected_pvnames(cls: Type[Device], prefix: str) -> List[str]:
+    """
+    Get the archiver-backed PV names expected of an instance of ``cls`` with
+    the given prefix, including those of lazy components.
+
+    Parameters
+    ----------
+    cls : type[Device]
+        An archived device class, as from `make_archived_device`.
+    prefix : str
+        The device prefix.
+
+    Returns
+    -------
+    list of str
+        Sorted, unique PV names.
+    """
+    suffixes, pvnames = _get_component_pv_plan(cls)
+    return sorted({prefix + suffix for suffix in suffixes} | set(pvnames))
+
+
 def switch_control_layer(
     cls: Type[Device],
     control_layer: SimpleNamespace,
@@ -650,6 +1323,55 @@ def switch_control_layer(
     return new_class
 
 
+class ArchivedPVState:
+    """
+    The archived data of a PV at a given time, shared by all
+    :class:`ArchiverPV` instances referencing it.
+
+    The PV is queued with the :class:`ArchiverHelper` once, by the first
+    subscriber; later subscribers receive the data as soon as it is known.
+    """
+    pvname: str
+    dt: datetime.datetime
+    #: The data, once received.
+    value: Optional[ArchivedValue]
+
+    def __init__(self, pvname: str, dt: datetime.datetime):
+        self.pvname = pvname
+        self.dt = dt
+        self.value = None
+        self._lock = threading.Lock()
+        self._subscribers: List[ArchiverCallback] = []
+        self._queued = False
+
+    def subscribe(self, callback: ArchiverCallback):
+        """Run ``callback`` (in the metadata thread) once data is known."""
+        callback = wrap_callback("metadata", callback)
+        with self._lock:
+            value = self.value
+            if value is None:
+                self._subscribers.append(callback)
+                queue = not self._queued
+                self._queued = True
+        if value is not None:
+            callback(value)
+        elif queue:
+            ArchiverHelper.instance().queue_pv(
+                pvname=self.pvname,
+                dt=self.dt,
+                callback=self._received,
+            )
+
+    def _received(self, value: ArchivedValue):
+        """ArchiverHelper.queue_pv callback."""
+        with self._lock:
+            self.value = value
+            subscribers = self._subscribers
+            self._subscribers = []
+        for callback in subscribers:
+            callback(value)
+
+
 class ArchiverPV(PyepicsPvCompatibility):
     """
     An epics.PV-like interface to archiver appliance data.
@@ -657,7 +1379,8 @@ class ArchiverPV(PyepicsPvCompatibility):
     Notes
     -----
     There is a 1-to-1 correspondence of :class:`ArchiverPV` to Component,
-    whereas normally :class:`epics.PV` can be shared.
+    whereas normally :class:`epics.PV` can be shared.  The archived data
+    itself is shared by way of :class:`ArchivedPVState`.
     """
 
     # `_make_connection` below will be in the main thread
@@ -667,15 +1390,13 @@ class ArchiverPV(PyepicsPvCompatibility):
 
     def _make_connection(self):
         """PyepicsPvCompatibility hook at startup."""
-        helper = ArchiverHelper.instance()
-        helper.queue_pv(
-            pvname=self.pvname,
-            dt=self._referrer_timestamp,
-            callback=self._archiver_initial_data,
+        self._state = ArchiverControlLayer.instance().get_pv_state(
+            self.pvname, self._referrer_timestamp
         )
+        self._state.subscribe(self._archiver_initial_data)
 
     def _archiver_initial_data(self, data: ArchivedValue):
-        """ArchiverHelper.queue_pv callback."""
+        """ArchivedPVState.subscribe callback."""
         # found_in_archiver = data.appliance is not None
         self._update_state_from_archiver(data)
         self._change_connection_status(connected=True)
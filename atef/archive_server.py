@@ -0,0 +1,527 @@
+"""
+A local stand-in for an archiver appliance, for tests and benchmarks.
+
+:class:`LocalArchiver` is an in-process HTTP server speaking the subset of the
+archiver appliance API used by ``archapp.EpicsArchive``:
+
+* ``/retrieval/data/getData.json`` for time ranges, with binning operators
+  such as ``lastFill_60(PV)`` and ``mean_60(PV)``
+* ``/retrieval/data/getDataAtTime`` for snapshots
+* ``/mgmt/bpl/getAllPVs`` for PV searches
+
+Data may be synthetic (:meth:`LocalArchiver.add_synthetic`), recorded from a
+real appliance (:meth:`LocalArchiver.record`) or loaded from a recording
+(:meth:`LocalArchiver.load`).  Each request can be delayed by ``latency`` to
+approximate a remote appliance.
+"""
+from __future__ import annotations
+
+import bisect
+import collections
+import contextlib
+import dataclasses
+import datetime
+import fnmatch
+import http.server
+import json
+import logging
+import math
+import pathlib
+import random
+import re
+import statistics
+import threading
+import time
+import urllib.parse
+from typing import (Any, Callable, Dict, Generator, Iterable, List, Optional,
+                    Tuple, Union)
+
+import archapp
+
+from .archive_device import ArchivedValue, ArchiverHelper
+
+logger = logging.getLogger(__name__)
+
+DATA_PATH = "/retrieval/data/getData.json"
+SNAPSHOT_PATH = "/retrieval/data/getDataAtTime"
+SEARCH_PATH = "/mgmt/bpl/getAllPVs"
+
+# Reduces the samples of one bin to a single value
+BinReducer = Callable[[List[Any]], Any]
+
+BIN_OPERATORS: Dict[str, BinReducer] = {
+    "firstSample": lambda values: values[0],
+    "lastSample": lambda values: values[-1],
+    "lastFill": lambda values: values[-1],
+    "mean": statistics.fmean,
+    "min": min,
+    "max": max,
+    "ncount": len,
+}
+
+_OPERATOR_RE = re.compile(r"^(?P<operator>\w+?)_(?P<bin_size>\d+)\((?P<pvname>.+)\)$")
+
+
+def parse_date_spec(spec: str) -> float:
+    """
+    Parse an archiver appliance date (ISO 8601 in UTC, as in
+    ``2023-05-01T07:00:00.000Z``) into seconds since the epoch.
+    """
+    if spec.endswith("Z"):
+        spec = spec[:-1] + "+00:00"
+    return datetime.datetime.fromisoformat(spec).timestamp()
+
+
+@dataclasses.dataclass
+class ArchivedPVData:
+    """
+    Archived samples of a single PV, sorted by time.
+    """
+    #: Metadata returned with retrieval requests (e.g., EGU and PREC).
+    meta: Dict[str, Any] = dataclasses.field(default_factory=dict)
+    #: Sample times, in seconds since the epoch.
+    times: List[float] = dataclasses.field(default_factory=list)
+    #: Samples, as returned by the appliance (``secs``, ``nanos``, ``val``,
+    #: ``severity`` and ``status``).
+    samples: List[Dict[str, Any]] = dataclasses.field(default_factory=list)
+
+    def add(self, sample: Dict[str, Any]) -> None:
+        """Add a sample, as returned by the appliance."""
+        timestamp = sample["secs"] + 1e-9 * sample.get("nanos", 0)
+        idx = bisect.bisect_right(self.times, timestamp)
+        self.times.insert(idx, timestamp)
+        self.samples.insert(idx, sample)
+
+    def at(self, timestamp: float) -> Optional[Dict[str, Any]]:
+        """The sample in effect at ``timestamp``, if any."""
+        idx = bisect.bisect_right(self.times, timestamp) - 1
+        if idx < 0:
+            return None
+        return self.samples[idx]
+
+    def between(self, start: float, end: float) -> List[Dict[str, Any]]:
+        """
+        Samples from ``start`` to ``end``, led by the sample in effect at
+        ``start`` as the appliance does.
+        """
+        first = max(bisect.bisect_right(self.times, start) - 1, 0)
+        last = bisect.bisect_right(self.times, end)
+        return self.samples[first:last]
+
+    def binned(
+        self,
+        operator: str,
+        bin_size: int,
+        start: float,
+        end: float,
+    ) -> List[Dict[str, Any]]:
+        """
+        Reduce samples from ``start`` to ``end`` to one per ``bin_size``
+        seconds.  As in the appliance, bins are aligned to multiples of
+        ``bin_size`` since the epoch, and stamped with their middle (rounded
+        down to the second).  Empty bins are skipped, apart from
+        ``lastFill``, which repeats the last value.
+        """
+        reduce = BIN_OPERATORS[operator]
+        bins: Dict[int, List[Dict[str, Any]]] = collections.defaultdict(list)
+        for sample in self.between(start, end):
+            timestamp = sample["secs"] + 1e-9 * sample.get("nanos", 0)
+            bins[int(max(timestamp, start)) // bin_size].append(sample)
+
+        result = []
+        previous = None
+        for idx in range(int(start) // bin_size, int(end) // bin_size + 1):
+            samples = bins.get(idx)
+            if not samples:
+                if operator != "lastFill" or previous is None:
+                    continue
+                samples = [previous]
+            result.append({
+                **samples[-1],
+                "secs": idx * bin_size + bin_size // 2,
+                "nanos": 0,
+                "val": reduce([sample["val"] for sample in samples]),
+            })
+            previous = samples[-1]
+        return result
+
+
+class _ArchiverRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Request handler for LocalArchiver."""
+    server: _ArchiverHTTPServer
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format, *args)
+
+    def _reply(self, data: Any, status: int = 200) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, body: Optional[bytes] = None) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query, keep_blank_values=True))
+        archiver = self.server.archiver
+        try:
+            result = archiver.handle_request(url.path, query, body)
+        except Exception as ex:
+            logger.debug("Bad request %s", self.path, exc_info=True)
+            self._reply({"error": str(ex)}, status=400)
+            return
+
+        if result is None:
+            self._reply({"error": f"Not found: {url.path}"}, status=404)
+        else:
+            self._reply(result)
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        self._handle(self.rfile.read(length))
+
+
+class _ArchiverHTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    archiver: LocalArchiver
+
+
+class LocalArchiver:
+    """
+    An in-process archiver appliance stand-in.
+
+    Parameters
+    ----------
+    latency : float, optional
+        Time to delay each request by [sec].
+
+    host : str, optional
+        The interface to listen on.  Defaults to localhost.
+
+    port : int, optional
+        The port to listen on for both retrieval and management requests.
+        Defaults to any free port.
+
+    Examples
+    --------
+    >>> with LocalArchiver(latency=0.05) as archiver:
+    ...     archiver.add_synthetic(["PV:1", "PV:2"], start, end, period=1.0)
+    ...     appliance = archiver.get_appliance()
+    ...     appliance.get_snapshot("PV:1", "PV:2", at=end)
+    """
+    #: Samples by PV name.
+    pvs: Dict[str, ArchivedPVData]
+    #: Time to delay each request by [sec].
+    latency: float
+    #: Requests handled, by path.
+    request_counts: collections.Counter[str]
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.pvs = {}
+        self.latency = latency
+        self.host = host
+        self.request_counts = collections.Counter()
+        self._requested_port = port
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        """The port being listened on."""
+        if self._server is None:
+            raise RuntimeError("The archiver is not running")
+        return self._server.server_address[1]
+
+    @property
+    def url(self) -> str:
+        """The base URL of the appliance."""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self) -> None:
+        """Start serving requests in a background thread."""
+        if self._server is not None:
+            return
+        self._server = _ArchiverHTTPServer(
+            (self.host, self._requested_port), _ArchiverRequestHandler
+        )
+        self._server.archiver = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="local_archiver",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving requests."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = None
+        self._thread = None
+
+    def __enter__(self) -> LocalArchiver:
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def get_appliance(self) -> archapp.EpicsArchive:
+        """Get an ``archapp.EpicsArchive`` using this archiver."""
+        return archapp.EpicsArchive(
+            hostname=self.host, data_port=self.port, mgmt_port=self.port
+        )
+
+    @contextlib.contextmanager
+    def use(self) -> Generator[archapp.EpicsArchive, None, None]:
+        """
+        Use this archiver (alone) for the ArchiverHelper for the duration of
+        the block.  The cache is cleared on entry and exit.
+        """
+        helper = ArchiverHelper.instance()
+        orig = helper.appliances
+        appliance = self.get_appliance()
+        helper.appliances = [appliance]
+        helper.clear_cache()
+        try:
+            yield appliance
+        finally:
+            helper.appliances = orig
+            helper.clear_cache()
+
+    # Data
+    def add_samples(
+        self,
+        pvname: str,
+        samples: Iterable[Dict[str, Any]],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Add samples for ``pvname`` as returned by the appliance, i.e.
+        dictionaries of ``secs``, ``nanos``, ``val``, ``severity`` and
+        ``status``.
+        """
+        with self._lock:
+            data = self.pvs.setdefault(pvname, ArchivedPVData())
+            if meta:
+                data.meta.update(meta)
+            for sample in samples:
+                data.add(sample)
+
+    def add_values(
+        self,
+        values: Iterable[ArchivedValue],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Add ArchivedValues, each for its own PV."""
+        by_pv = collections.defaultdict(list)
+        for value in values:
+            by_pv[value.pvname].append(value.to_archapp())
+        for pvname, samples in by_pv.items():
+            self.add_samples(pvname, samples, meta=meta)
+
+    def add_synthetic(
+        self,
+        pvnames: Iterable[str],
+        start: datetime.datetime,
+        end: datetime.datetime,
+        period: float = 1.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        """
+        Add a random walk for each of ``pvnames``, sampled every ``period``
+        seconds from ``start`` to ``end``.
+
+        Parameters
+        ----------
+        pvnames : iterable of str
+            The PV names.
+
+        start : datetime.datetime
+            The time of the first sample.
+
+        end : datetime.datetime
+            No samples are added after this time.
+
+        period : float, optional
+            The average time between samples [sec].
+
+        jitter : float, optional
+            The fraction of ``period`` by which the time between samples
+            varies at random.
+
+        seed : int, optional
+            Seed for the random number generator, for reproducible data.
+
+        meta : dict, optional
+            Metadata for each PV.  Defaults to ``EGU`` and ``PREC``.
+
+        Returns
+        -------
+        int
+            The number of samples added.
+        """
+        rand = random.Random(seed)
+        if meta is None:
+            meta = {"EGU": "mm", "PREC": "3"}
+        end_time = end.timestamp()
+        added = 0
+        for pvname in pvnames:
+            timestamp = start.timestamp()
+            value = rand.uniform(-1.0, 1.0)
+            samples = []
+            while timestamp <= end_time:
+                secs = math.floor(timestamp)
+                samples.append({
+                    "secs": secs,
+                    "nanos": int((timestamp - secs) * 1e9),
+                    "val": value,
+                    "severity": 0,
+                    "status": 0,
+                })
+                value += rand.gauss(0.0, 0.1)
+                timestamp += period * (1.0 + jitter * rand.uniform(-1.0, 1.0))
+            self.add_samples(pvname, samples, meta=meta)
+            added += len(samples)
+        return added
+
+    @classmethod
+    def record(
+        cls,
+        appliance: archapp.EpicsArchive,
+        pvnames: Iterable[str],
+        start: datetime.datetime,
+        end: datetime.datetime,
+        **kwargs,
+    ) -> LocalArchiver:
+        """
+        Create a LocalArchiver with data retrieved from ``appliance``.
+        Keyword arguments are passed to the LocalArchiver.
+        """
+        archiver = cls(**kwargs)
+        for pvname in pvnames:
+            data = appliance._data.get_raw(pvname, start, end)
+            if not isinstance(data, dict) or not data.get("data"):
+                logger.warning("No data recorded for %s", pvname)
+                continue
+            archiver.add_samples(pvname, data["data"], meta=data.get("meta"))
+        return archiver
+
+    def save(self, path: Union[str, pathlib.Path]) -> None:
+        """Save the data of all PVs to a JSON file."""
+        with self._lock:
+            recording = {
+                pvname: {"meta": data.meta, "data": data.samples}
+                for pvname, data in self.pvs.items()
+            }
+        with open(path, "w") as fp:
+            json.dump(recording, fp)
+
+    def load(self, path: Union[str, pathlib.Path]) -> None:
+        """Add the data of all PVs from a JSON file written by `save`."""
+        with open(path) as fp:
+            recording = json.load(fp)
+        for pvname, data in recording.items():
+            self.add_samples(pvname, data["data"], meta=data.get("meta"))
+
+    # Requests
+    def handle_request(
+        self,
+        path: str,
+        query: Dict[str, str],
+        body: Optional[bytes] = None,
+    ) -> Optional[Any]:
+        """
+        Handle a request, as received by the HTTP server.
+
+        Returns
+        -------
+        Any
+            The JSON-serializable response, or None if not found.
+        """
+        with self._lock:
+            self.request_counts[path] += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if path == DATA_PATH:
+            return self.get_data(query["pv"], query["from"], query["to"])
+        if path == SNAPSHOT_PATH:
+            return self.get_data_at_time(json.loads(body or b"[]"), query["at"])
+        if path == SEARCH_PATH:
+            return self.get_all_pvs(query.get("pv", "*"))
+        return None
+
+    def get_data(
+        self, pv: str, start: str, end: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Respond to getData.json, optionally with a binning operator."""
+        operator, bin_size = None, None
+        match = _OPERATOR_RE.match(pv)
+        if match is not None and match["operator"] in BIN_OPERATORS:
+            operator = match["operator"]
+            bin_size = max(int(match["bin_size"]), 1)
+            pv = match["pvname"]
+
+        with self._lock:
+            data = self.pvs.get(pv, None)
+            if data is None:
+                return None
+            start_time, end_time = parse_date_spec(start), parse_date_spec(end)
+            if operator is None:
+                samples = data.between(start_time, end_time)
+            else:
+                samples = data.binned(operator, bin_size, start_time, end_time)
+            return [{"meta": {"name": pv, **data.meta}, "data": samples}]
+
+    def get_data_at_time(
+        self, pvnames: List[str], at: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Respond to getDataAtTime.  Unknown PVs are left out."""
+        timestamp = parse_date_spec(at)
+        result = {}
+        with self._lock:
+            for pvname in pvnames:
+                data = self.pvs.get(pvname, None)
+                sample = data.at(timestamp) if data is not None else None
+                if sample is not None:
+                    result[pvname] = sample
+        return result
+
+    def get_all_pvs(self, pattern: str) -> List[str]:
+        """Respond to getAllPVs, matching ``pattern`` as a glob."""
+        with self._lock:
+            return sorted(fnmatch.filter(self.pvs, pattern))
+
+    def get_time_range(self) -> Tuple[datetime.datetime, datetime.datetime]:
+        """The time range spanned by all samples."""
+        with self._lock:
+            times = [data.times for data in self.pvs.values() if data.times]
+        if not times:
+            raise ValueError("The archiver holds no samples")
+        return (
+            datetime.datetime.fromtimestamp(min(ts[0] for ts in times)),
+            datetime.datetime.fromtimestamp(max(ts[-1] for ts in times)),
+        )
+
+    def get_request_count(self, path: Optional[str] = None) -> int:
+        """The number of requests handled for ``path``, or for all paths."""
+        with self._lock:
+            if path is None:
+                return sum(self.request_counts.values())
+            return self.request_counts[path]
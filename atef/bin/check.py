@@ -2,6 +2,7 @@
 `atef check` runs passive checkouts of devices given a configuration file.
 """
 import argparse
+import datetime
 
 DESCRIPTION = __doc__
 
@@ -62,6 +63,71 @@ def build_arg_parser(argparser=None):
         help="Acquire data for comparisons in parallel",
     )
 
+    argparser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help=(
+            "With --parallel, limit the number of data acquisitions in "
+            "progress at once"
+        ),
+    )
+
+    argparser.add_argument(
+        "--max-subscriptions",
+        type=int,
+        default=None,
+        help=(
+            "With --parallel, limit the number of data acquisitions with a "
+            "reduce period in progress at once"
+        ),
+    )
+
+    argparser.add_argument(
+        "--max-reads",
+        type=int,
+        default=None,
+        help="Limit the number of control system reads in progress at once",
+    )
+
+    argparser.add_argument(
+        "--max-read-rate",
+        type=float,
+        default=None,
+        help="Limit the rate of new control system reads [per second]",
+    )
+
+    argparser.add_argument(
+        "--max-reads-per-host",
+        type=int,
+        default=None,
+        help=(
+            "Limit the number of control system reads in progress at once "
+            "from each IOC host"
+        ),
+    )
+
+    argparser.add_argument(
+        "--max-read-rate-per-host",
+        type=float,
+        default=None,
+        help=(
+            "Limit the rate of new control system reads from each IOC host "
+            "[per second]"
+        ),
+    )
+
+    argparser.add_argument(
+        "--at",
+        dest="archive_time",
+        type=datetime.datetime.fromisoformat,
+        default=None,
+        help=(
+            "Check against archived data at this local time rather than live "
+            "data, e.g. 2024-01-31T13:45:00"
+        ),
+    )
+
     argparser.add_argument(
         "-r", "--report-path",
         help="Path to the report save path, if provided"
@@ -4,6 +4,7 @@
 from __future__ import annotations
 
 import asyncio
+import datetime
 import enum
 import itertools
 import logging
@@ -20,7 +21,7 @@ from ..config_model.passive import (AnyConfiguration, AnyPreparedConfiguration,
                                     ConfigurationFile, FailedConfiguration,
                                     PreparedComparison, PreparedFile,
                                     PreparedGroup)
-from ..report import PassiveAtefReport
+from ..governor import AccessBudget, AccessGovernor
 from ..result import Result
 from ..util import ophyd_cleanup
 
@@ -229,12 +230,13 @@ def get_tree_heading(
         The displayable name.
     """
     severity: Severity = getattr(obj.result, "severity", Severity.error)
+    status: str = getattr(obj.result, "status", severity.name)
 
     severity_text = []
     if VerbositySetting.show_severity_emoji in verbosity:
         severity_text.append(severity_to_rich[severity])
     if VerbositySetting.show_severity_description in verbosity:
-        severity_text.append(severity.name.replace("_", " ").capitalize())
+        severity_text.append(status.replace("_", " ").capitalize())
         severity_text.append(": ")
 
     severity_text = "".join(severity_text)
@@ -346,6 +348,8 @@ async def check_and_log(
     parallel: bool = True,
     cache: Optional[DataCache] = None,
     filename: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    max_subscriptions: Optional[int] = None,
 ) -> PreparedFile:
     """
     Check a configuration and log the results.
@@ -365,7 +369,15 @@ async def check_and_log(
     parallel : bool, optional
         Pre-fill cache in parallel when possible.
     cache : DataCache
-        The data cache instance.
+        The data cache instance.  Archived data is checked if the cache has an
+        ``archive_timestamp``.
+    filename : str, optional
+        The filename to show at the top of the results tree.
+    max_concurrency : int, optional
+        The maximum number of parallel data acquisitions in progress at once.
+    max_subscriptions : int, optional
+        The maximum number of parallel reduce-period data acquisitions in
+        progress at once.
 
     Returns
     -------
@@ -377,12 +389,21 @@ async def check_and_log(
     if cache is None:
         cache = DataCache()
 
-    prepared_file = PreparedFile.from_config(config, cache=cache, client=client)
+    if cache.archive_timestamp is None:
+        prepared_file = PreparedFile.from_config(config, cache=cache, client=client)
+    else:
+        from ..archive_checkout import prepare_archived_file
+        prepared_file = prepare_archived_file(
+            config, cache.archive_timestamp, cache=cache, client=client
+        )
 
     cache_fill_tasks = []
     if parallel:
         try:
-            cache_fill_tasks = await prepared_file.fill_cache()
+            cache_fill_tasks = await prepared_file.fill_cache(
+                max_concurrency=max_concurrency,
+                max_subscriptions=max_subscriptions,
+            )
         except asyncio.CancelledError:
             console.print("Tests interrupted; no results available.")
             return
@@ -407,6 +428,9 @@ async def check_and_log(
 
 
 def save_report(prep_file: PreparedFile, report_path: str):
+    # reportlab is only needed here, so import it on demand
+    from ..report import PassiveAtefReport
+
     # Normalize report path
     from pathlib import Path
     save_path = Path(report_path).resolve()
@@ -428,6 +452,13 @@ async def main(
     show_tags: bool = False,
     show_passed_tests: bool = False,
     report_path: Optional[str] = None,
+    max_concurrency: Optional[int] = None,
+    max_subscriptions: Optional[int] = None,
+    max_reads: Optional[int] = None,
+    max_read_rate: Optional[float] = None,
+    max_reads_per_host: Optional[int] = None,
+    max_read_rate_per_host: Optional[float] = None,
+    archive_time: Optional[datetime.datetime] = None,
 ):
 
     verbosity = VerbositySetting.from_kwargs(
@@ -441,7 +472,33 @@ async def main(
     config_file = ConfigurationFile.from_filename(filename)
 
     console = rich.console.Console()
-    cache = DataCache(signals=signal_cache or get_signal_cache())
+    governor = None
+    host_budget = None
+    if max_reads_per_host is not None or max_read_rate_per_host is not None:
+        host_budget = AccessBudget(
+            max_concurrency=max_reads_per_host,
+            rate=max_read_rate_per_host,
+        )
+    if (
+        max_reads is not None
+        or max_read_rate is not None
+        or host_budget is not None
+    ):
+        governor = AccessGovernor(
+            global_budget=AccessBudget(
+                max_concurrency=max_reads,
+                rate=max_read_rate,
+            ),
+            default_host_budget=host_budget,
+        )
+    if archive_time is None:
+        cache = DataCache(
+            signals=signal_cache or get_signal_cache(),
+            governor=governor,
+        )
+    else:
+        from ..archive_checkout import make_archived_cache
+        cache = make_archived_cache(archive_time, governor=governor)
     try:
         with console.status("[bold green] Performing checks..."):
             prep_file = await check_and_log(
@@ -452,6 +509,18 @@ async def main(
                 cache=cache,
                 filename=filename,
                 verbosity=verbosity,
+                max_concurrency=max_concurrency,
+                max_subscriptions=max_subscriptions,
+            )
+        if governor is not None:
+            stats = governor.statistics
+            logger.info(
+                "Performed %d reads; waited %.3f s on average (%.3f s max) "
+                "with up to %d queued",
+                stats.requests,
+                stats.mean_wait_time,
+                stats.max_wait_time,
+                stats.max_queued,
             )
         if report_path is not None:
             with console.status("[bold green] Saving report..."):
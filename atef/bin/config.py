@@ -1,9 +1,9 @@
 import argparse
 
-from qtpy.QtWidgets import QStyleFactory
-
 
 def build_arg_parser(argparser=None):
+    from qtpy.QtWidgets import QStyleFactory
+
     if argparser is None:
         argparser = argparse.ArgumentParser()
 
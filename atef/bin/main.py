@@ -6,54 +6,107 @@ Try:
 """
 
 import argparse
-import asyncio
 import importlib
 import logging
+from dataclasses import dataclass
 from inspect import iscoroutinefunction
+from typing import Callable, Dict, Optional, Tuple
 
 import atef
 
 DESCRIPTION = __doc__
 
 
-COMMAND_TO_MODULE = {
-    "check": "check",
-    "config": "config",
-    "scripts": "scripts",
-}
-
-
-def _try_import(module_name):
-    return importlib.import_module(f".{module_name}", 'atef.bin')
-
-
-def _build_commands():
-    global DESCRIPTION
-    result = {}
-    unavailable = []
-
-    for command, module_name in sorted(COMMAND_TO_MODULE.items()):
+@dataclass(frozen=True)
+class Command:
+    """
+    A subcommand, declared without importing its implementation.
+
+    The module is only imported when the subcommand is selected on the
+    command line.
+    """
+    #: The subcommand name
+    name: str
+    #: The module in ``atef.bin`` providing ``build_arg_parser`` and ``main``
+    module: str
+    #: Short help text for the subcommand list
+    help: str
+
+    def load(self) -> Tuple[Callable, Callable]:
+        """Import the module, returning its (build_arg_parser, main)"""
+        module = importlib.import_module(f".{self.module}", 'atef.bin')
+        return module.build_arg_parser, module.main
+
+
+class LazyArgumentParser(argparse.ArgumentParser):
+    """
+    An ArgumentParser filled in by ``loader`` only when it is used to parse
+    arguments.  As a subparser, only the selected subcommand is loaded.
+
+    Parameters
+    ----------
+    loader : Callable[[argparse.ArgumentParser], None], optional
+        Adds arguments and defaults to the parser.
+    """
+    def __init__(
+        self,
+        *args,
+        loader: Optional[Callable[[argparse.ArgumentParser], None]] = None,
+        **kwargs
+    ):
+        super().__init__(*args, **kwargs)
+        self._loader = loader
+
+    def load(self) -> None:
+        """Fill in the parser, if not yet done"""
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            loader(self)
+
+    def parse_known_args(self, args=None, namespace=None):
+        self.load()
+        return super().parse_known_args(args, namespace)
+
+
+def command_loader(
+    command: str,
+    load: Callable[[], Tuple[Callable, Callable]],
+) -> Callable[[argparse.ArgumentParser], None]:
+    """
+    Create a LazyArgumentParser loader for a subcommand.
+
+    Parameters
+    ----------
+    command : str
+        The full command, used when reporting that it is unavailable.
+    load : Callable[[], Tuple[Callable, Callable]]
+        Returns the (build_arg_parser, main) of the subcommand.
+    """
+    def loader(parser: argparse.ArgumentParser) -> None:
         try:
-            module = _try_import(module_name)
+            build_func, main = load()
         except Exception as ex:
-            unavailable.append((command, ex))
-        else:
-            result[module_name] = (module.build_arg_parser, module.main)
-            DESCRIPTION += f'\n    $ atef {command} --help'
-
-    if unavailable:
-        DESCRIPTION += '\n\n'
-
-        for command, ex in unavailable:
-            DESCRIPTION += (
-                f'\nWARNING: "atef {command}" is unavailable due to:'
+            parser.error(
+                f'"{command}" is unavailable due to:'
                 f'\n\t{ex.__class__.__name__}: {ex}'
             )
+        build_func(parser)
+        parser.set_defaults(func=main)
+
+    return loader
 
-    return result
 
+COMMANDS: Dict[str, Command] = {
+    command.name: command
+    for command in (
+        Command("check", "check", "Run passive checkouts"),
+        Command("config", "config", "Open the configuration GUI"),
+        Command("scripts", "scripts", "Run helper scripts"),
+    )
+}
 
-COMMANDS = _build_commands()
+for _command in COMMANDS:
+    DESCRIPTION += f'\n    $ atef {_command} --help'
 
 
 def main():
@@ -77,11 +130,15 @@ def main():
         help='Python logging level (e.g. DEBUG, INFO, WARNING)'
     )
 
-    subparsers = top_parser.add_subparsers(help='Possible subcommands')
-    for command_name, (build_func, main) in COMMANDS.items():
-        sub = subparsers.add_parser(command_name)
-        build_func(sub)
-        sub.set_defaults(func=main)
+    subparsers = top_parser.add_subparsers(
+        help='Possible subcommands', parser_class=LazyArgumentParser
+    )
+    for command_name, command in COMMANDS.items():
+        subparsers.add_parser(
+            command_name,
+            help=command.help,
+            loader=command_loader(f'atef {command_name}', command.load),
+        )
 
     args = top_parser.parse_args()
     kwargs = vars(args)
@@ -95,6 +152,8 @@ def main():
         func = kwargs.pop('func')
         logger.debug('%s(**%r)', func.__name__, kwargs)
         if iscoroutinefunction(func):
+            # asyncio is slow to import, and only needed by some subcommands
+            import asyncio
             asyncio.run(func(**kwargs))
         else:
             func(**kwargs)
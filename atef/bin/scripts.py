@@ -6,46 +6,39 @@ import argparse
 import importlib
 import logging
 from pkgutil import iter_modules
-from typing import Callable, Dict, Tuple
+from typing import Callable, List, Tuple
+
+from .main import LazyArgumentParser, command_loader
 
 logger = logging.getLogger(__name__)
 
 DESCRIPTION = __doc__
 
 
-def gather_scripts() -> Dict[str, Tuple[Callable, Callable]]:
-    """Gather scripts, one main function from each submodule"""
-    # similar to main's _build_commands
+def gather_scripts() -> List[str]:
+    """Gather script names, one for each submodule, without importing them"""
+    # similar to main's COMMANDS
     global DESCRIPTION
     DESCRIPTION += "\nTry:\n"
-    results = {}
-    unavailable = []
+    results = []
 
     scripts_module = importlib.import_module("atef.scripts")
     for sub_module in iter_modules(scripts_module.__path__):
         module_name = sub_module.name
         if "_main" in module_name:
             continue
-        try:
-            module = importlib.import_module(f".{module_name}", "atef.scripts")
-        except Exception as ex:
-            unavailable.append((module_name, ex))
-        else:
-            results[module_name] = (module.build_arg_parser, module.main)
-            DESCRIPTION += f'\n    $ atef scripts {module_name} --help'
-
-    if unavailable:
-        DESCRIPTION += '\n\n'
-
-        for command, ex in unavailable:
-            DESCRIPTION += (
-                f'\nWARNING: "atef scripts {command}" is unavailable due to:'
-                f'\n\t{ex.__class__.__name__}: {ex}'
-            )
+        results.append(module_name)
+        DESCRIPTION += f'\n    $ atef scripts {module_name} --help'
 
     return results
 
 
+def load_script(script_name: str) -> Tuple[Callable, Callable]:
+    """Import a script, returning its (build_arg_parser, main)"""
+    module = importlib.import_module(f".{script_name}", "atef.scripts")
+    return module.build_arg_parser, module.main
+
+
 SCRIPTS = gather_scripts()
 
 
@@ -57,11 +50,17 @@ def build_arg_parser(argparser=None):
     Runs atef related scripts.  Pick a subcommand to run its script
     """
 
-    sub_parsers = argparser.add_subparsers(help='available script subcommands')
-    for script_name, (build_parser_func, script_main) in SCRIPTS.items():
-        sub = sub_parsers.add_parser(script_name)
-        build_parser_func(sub)
-        sub.set_defaults(func=script_main)
+    sub_parsers = argparser.add_subparsers(
+        help='available script subcommands', parser_class=LazyArgumentParser
+    )
+    for script_name in SCRIPTS:
+        sub_parsers.add_parser(
+            script_name,
+            loader=command_loader(
+                f'atef scripts {script_name}',
+                lambda script_name=script_name: load_script(script_name),
+            ),
+        )
 
     return argparser
 
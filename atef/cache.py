@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import asyncio
 import concurrent.futures
+import contextlib
 import dataclasses
+import datetime
 import logging
 import typing
 from dataclasses import dataclass, field
@@ -11,6 +13,7 @@ from typing import (Any, Dict, Hashable, Iterable, Mapping, Optional, Type,
 
 import ophyd
 
+from .governor import AccessGovernor
 from .reduce import ReduceMethod, get_data_for_signal_async
 from .type_hints import Number
 
@@ -121,6 +124,16 @@ class DataCache:
     tool_data: Dict[ToolKey, Any] = field(
         default_factory=dict
     )
+    #: Limits on concurrent reads and read rates, if any.
+    governor: Optional[AccessGovernor] = None
+    #: If set, devices and PVs are read from the archiver at this time rather
+    #: than live.  ``signals`` should then hold archived signals as well (see
+    #: :func:`atef.archive_checkout.make_archived_cache`).
+    archive_timestamp: Optional[datetime.datetime] = None
+    #: Number of callers awaiting each pending acquisition.
+    _waiters: Dict[asyncio.Future, int] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def clear(self) -> None:
         """Clear the data cache."""
@@ -219,9 +232,48 @@ class DataCache:
             signal_data[key] = data
 
         if isinstance(data, asyncio.Future):
-            return await data
+            return await self._await_pending(data, signal_data, key)
         return data
 
+    async def _await_pending(
+        self,
+        pending: asyncio.Future,
+        store: Dict[Any, Any],
+        key: Hashable,
+    ) -> Any:
+        """
+        Await an acquisition that may be shared between multiple callers.
+
+        Cancelling one caller does not affect the others.  The acquisition
+        itself is only cancelled - and removed from ``store`` so that it may
+        be requested again - once every caller awaiting it has been cancelled.
+
+        Parameters
+        ----------
+        pending : asyncio.Future
+            The pending acquisition.
+        store : dict
+            The cache dictionary holding ``pending``.
+        key : Hashable
+            The key of ``pending`` in ``store``.
+
+        Returns
+        -------
+        Any
+            The acquired data.
+        """
+        self._waiters[pending] = self._waiters.get(pending, 0) + 1
+        try:
+            return await asyncio.shield(pending)
+        finally:
+            self._waiters[pending] -= 1
+            if not self._waiters[pending]:
+                del self._waiters[pending]
+                if not pending.done():
+                    pending.cancel()
+                    if store.get(key) is pending:
+                        del store[key]
+
     async def _update_signal_data_by_key(
         self,
         signal: ophyd.Signal,
@@ -247,16 +299,23 @@ class DataCache:
             The acquired data.
         """
         signal_data = self.signal_data[signal]
+        reduce_period = key.period
+        if self.archive_timestamp is not None:
+            # There is a single archived value to read; don't wait for more
+            reduce_period = None
         try:
-            acquired = await asyncio.shield(
-                get_data_for_signal_async(
+            async with contextlib.AsyncExitStack() as stack:
+                if self.governor is not None:
+                    await stack.enter_async_context(
+                        self.governor.limit_signal(signal, executor=executor)
+                    )
+                acquired = await get_data_for_signal_async(
                     signal,
-                    reduce_period=key.period,
+                    reduce_period=reduce_period,
                     reduce_method=key.method,
                     string=key.string,
                     executor=executor,
                 )
-            )
         except TimeoutError:
             acquired = None
 
@@ -303,7 +362,7 @@ class DataCache:
             self.tool_data[key] = data
 
         if isinstance(data, asyncio.Future):
-            return await data
+            return await self._await_pending(data, self.tool_data, key)
 
         return data
 
@@ -7,12 +7,14 @@ from atef.config_model.passive import ConfigurationFile
 from atef.type_hints import AnyPath
 
 
-def load_file(filepath: AnyPath) -> Union[ConfigurationFile, ProcedureFile]:
+def load_file(
+    filepath: AnyPath, lazy: bool = False
+) -> Union[ConfigurationFile, ProcedureFile]:
     try:
-        data = ConfigurationFile.from_filename(filepath)
+        data = ConfigurationFile.from_filename(filepath, lazy=lazy)
     except ValidationError:
         try:
-            data = ProcedureFile.from_filename(filepath)
+            data = ProcedureFile.from_filename(filepath, lazy=lazy)
         except ValidationError:
             raise ValueError(f'failed to open file ({filepath}) as either active '
                              'or passive checkout')
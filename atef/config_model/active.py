@@ -16,22 +16,18 @@ from __future__ import annotations
 
 import dataclasses
 import datetime
-import json
 import logging
 import pathlib
 from asyncio import CancelledError
 from copy import deepcopy
 from dataclasses import dataclass, field
-from typing import (Any, Dict, Generator, List, Literal, Optional, Sequence,
-                    Tuple, Union, cast)
+from typing import (TYPE_CHECKING, Any, Dict, Generator, List, Literal,
+                    Optional, Sequence, Tuple, Union, cast)
 from uuid import UUID, uuid4
 
 import apischema
 import ophyd
-import pandas as pd
 import yaml
-from bluesky_queueserver.manager.profile_ops import (
-    existing_plans_and_devices_from_nspace, validate_plan)
 
 from atef import util
 from atef.cache import DataCache, _SignalCache, get_signal_cache
@@ -43,16 +39,21 @@ from atef.config_model.tree_manipulation import get_status_logger
 from atef.enums import GroupResultMode, PlanDestination, Severity
 from atef.exceptions import PreparationError, PreparedComparisonException
 from atef.find_replace import RegexFindReplace
-from atef.plan_utils import (BlueskyState, GlobalRunEngine,
-                             get_default_namespace, register_run_identifier,
-                             run_in_local_RE)
 from atef.reduce import ReduceMethod
-from atef.result import Result, _summarize_result_severity, incomplete_result
+from atef.result import (Result, _summarize_result_severity, incomplete_result,
+                         notify_result)
 from atef.type_hints import AnyDataclass, AnyPath, Number, PrimitiveType
 from atef.yaml_support import init_yaml_support
 
 from .. import serialization
 
+if TYPE_CHECKING:
+    # bluesky, databroker and pandas are only needed to run plan steps, and
+    # are imported there
+    import pandas as pd
+
+    from atef.plan_utils import BlueskyState
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +64,19 @@ BS_STATE_MAP: Dict[int, BlueskyState] = {}
 # Max depth for plan steps
 MAX_PLAN_DEPTH = 200
 
+# Plan utilities formerly imported here, now loaded on first access
+_PLAN_UTILS_NAMES = {
+    'BlueskyState', 'GlobalRunEngine', 'get_default_namespace',
+    'register_run_identifier', 'run_in_local_RE',
+}
+
+
+def __getattr__(name: str):
+    if name in _PLAN_UTILS_NAMES:
+        from atef import plan_utils
+        return getattr(plan_utils, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 @dataclasses.dataclass
 @serialization.as_tagged_union
@@ -96,8 +110,10 @@ class ProcedureStep:
 
 
 @dataclass
-class ProcedureGroup(ProcedureStep):
+class ProcedureGroup(ProcedureStep, serialization.LazyChildren):
     """A group of procedure steps (or nested groups)."""
+    _lazy_field = "steps"
+
     #: Steps included in the procedure.
     steps: Sequence[Union[ProcedureStep, ProcedureGroup]] = field(default_factory=list)
 
@@ -381,8 +397,9 @@ class ProcedureFile:
     root: ProcedureGroup = field(default_factory=ProcedureGroup)
 
     def __post_init__(self):
-        # register a BSState for this ProcedureFile
-        BS_STATE_MAP[id(self)] = BlueskyState()
+        # Discard any BSState left by a previous object with this id.  A new
+        # one is registered on first use (see get_bs_state)
+        BS_STATE_MAP.pop(id(self), None)
 
     def walk_steps(self) -> Generator[AnyProcedure, None, None]:
         yield self.root
@@ -393,31 +410,46 @@ class ProcedureFile:
         return [self.root]
 
     @classmethod
-    def from_filename(cls, filename: AnyPath) -> ProcedureFile:
+    def from_filename(cls, filename: AnyPath, lazy: bool = False) -> ProcedureFile:
+        """
+        Load a procedure file from a file.  Dispatches based on file type
+
+        If ``lazy``, the steps of each group are only deserialized when the
+        group's ``steps`` are first accessed.  See
+        `ConfigurationFile.from_filename`.
+        """
         path = pathlib.Path(filename)
         if path.suffix.lower() == '.json':
-            config = ProcedureFile.from_json(path)
+            config = ProcedureFile.from_json(path, lazy=lazy)
         else:
-            config = ProcedureFile.from_yaml(path)
+            config = ProcedureFile.from_yaml(path, lazy=lazy)
         return config
 
     @classmethod
-    def from_json(cls, filename: AnyPath) -> ProcedureFile:
+    def from_json(cls, filename: AnyPath, lazy: bool = False) -> ProcedureFile:
         """Load a configuration file from JSON."""
-        with open(filename) as fp:
-            serialized_config = json.load(fp)
-        return apischema.deserialize(cls, serialized_config)
+        with serialization.gc_paused():
+            with open(filename) as fp:
+                serialized_config = serialization.load_json(fp)
+            if lazy:
+                return serialization.deserialize_lazily(cls, serialized_config)
+            return serialization.get_deserializer(cls)(serialized_config)
 
     @classmethod
-    def from_yaml(cls, filename: AnyPath) -> ProcedureFile:
+    def from_yaml(cls, filename: AnyPath, lazy: bool = False) -> ProcedureFile:
         """Load a configuration file from yaml."""
-        with open(filename) as fp:
-            serialized_config = yaml.safe_load(fp)
-        return apischema.deserialize(cls, serialized_config)
+        with serialization.gc_paused():
+            with open(filename) as fp:
+                serialized_config = serialization.load_yaml(fp)
+            if lazy:
+                return serialization.deserialize_lazily(cls, serialized_config)
+            return serialization.get_deserializer(cls)(serialized_config)
 
     def to_json(self):
         """Dump this configuration file to a JSON-compatible dictionary."""
-        return apischema.serialize(ProcedureFile, self, exclude_defaults=True)
+        serializer = serialization.get_serializer(ProcedureFile, exclude_defaults=True)
+        with serialization.gc_paused():
+            return serializer(self)
 
     def to_yaml(self):
         """Dump this configuration file to yaml."""
@@ -463,6 +495,8 @@ class PreparedProcedureFile:
     start_timestamp: Optional[datetime.datetime] = None
     #: Time when this active checkout finished running.
     end_timestamp: Optional[datetime.datetime] = None
+    #: Hashes of the steps as prepared, keyed by step id.
+    step_hashes: Dict[int, str] = field(default_factory=dict, repr=False)
 
     @classmethod
     def from_origin(
@@ -489,9 +523,42 @@ class PreparedProcedureFile:
             group=file.root, parent=prep_proc_file
         )
         prep_proc_file.root = prepared_root
+        _record_step_hashes(file.root, prep_proc_file.step_hashes)
 
         return prep_proc_file
 
+    def update_from_origin(self) -> List[Union[AnyPreparedProcedure, FailedStep]]:
+        """
+        Re-prepare only the steps edited since this file was prepared.
+
+        Steps are matched to their prepared counterparts by identity and
+        compared by way of :func:`get_step_hash`.  Unchanged steps are kept
+        along with their results.  Edited, added, moved, and previously failed
+        steps are prepared again, and removed steps are dropped.
+
+        Returns
+        -------
+        list of AnyPreparedProcedure or FailedStep
+            The newly prepared steps.  Descendants of these are not listed
+            separately.
+        """
+        hashes: Dict[int, str] = {}
+        root = self.file.root
+        root_hash = get_step_hash(root)
+        if (
+            self.root.origin is root
+            and self.step_hashes.get(id(root)) == root_hash
+        ):
+            hashes[id(root)] = root_hash
+            updated = self.root.update_from_origin(self.step_hashes, hashes)
+        else:
+            self.root = PreparedProcedureGroup.from_origin(group=root, parent=self)
+            _record_step_hashes(root, hashes)
+            updated = [self.root]
+
+        self.step_hashes = hashes
+        return updated
+
     async def run(self) -> Result:
         """
         Run the entire procedure file.
@@ -630,6 +697,7 @@ class PreparedProcedureStep:
             f"Result: {self.result.severity.name}"
         )
         self.end_timestamp = datetime.datetime.now(datetime.timezone.utc)
+        notify_result(self, self.result)
         return self.result
 
     @classmethod
@@ -740,6 +808,63 @@ class PreparedProcedureGroup(PreparedProcedureStep):
 
         return prepared
 
+    def update_from_origin(
+        self,
+        previous_hashes: Dict[int, str],
+        hashes: Dict[int, str],
+    ) -> List[Union[AnyPreparedProcedure, FailedStep]]:
+        """
+        Re-prepare only the steps in this group edited since it was prepared.
+        See :meth:`PreparedProcedureFile.update_from_origin`.
+
+        Parameters
+        ----------
+        previous_hashes : Dict[int, str]
+            Step hashes at the time of the last preparation, keyed by step id.
+        hashes : Dict[int, str]
+            Current step hashes, filled in by this method.
+
+        Returns
+        -------
+        list of AnyPreparedProcedure or FailedStep
+            The newly prepared steps.
+        """
+        existing = {
+            id(prepared.origin): prepared
+            for prepared in [*self.steps, *self.prepare_failures]
+        }
+        steps = []
+        prepare_failures = []
+        updated = []
+        for step in self.origin.steps:
+            step_hash = get_step_hash(step)
+            prepared = existing.get(id(step), None)
+            if (
+                isinstance(prepared, PreparedProcedureStep)
+                and previous_hashes.get(id(step)) == step_hash
+            ):
+                hashes[id(step)] = step_hash
+                if isinstance(prepared, PreparedProcedureGroup):
+                    updated.extend(
+                        prepared.update_from_origin(previous_hashes, hashes)
+                    )
+            else:
+                prepared = PreparedProcedureStep.from_origin(
+                    step=cast(AnyPreparedProcedure, step),
+                    parent=self
+                )
+                _record_step_hashes(step, hashes)
+                updated.append(prepared)
+
+            if isinstance(prepared, FailedStep):
+                prepare_failures.append(prepared)
+            else:
+                steps.append(prepared)
+
+        self.steps = steps
+        self.prepare_failures = prepare_failures
+        return updated
+
     async def run(self) -> Result:
         """
         Run all steps and return a combined result. Also attaches a timestamp.
@@ -765,6 +890,7 @@ class PreparedProcedureGroup(PreparedProcedureStep):
                 result = Result(severity=severity)
 
             self.step_result = result
+            notify_result(self, self.result)
             return self.result
         finally:
             self.end_timestamp = datetime.datetime.now(datetime.timezone.utc)
@@ -1216,6 +1342,8 @@ class PreparedPlan:
     result: Result = field(default_factory=incomplete_result)
 
     async def run(self) -> Result:
+        from atef.plan_utils import run_in_local_RE
+
         # submit the plan to the destination
         if self.parent.origin.destination != PlanDestination.local:
             self.result = Result(
@@ -1233,6 +1361,8 @@ class PreparedPlan:
         origin: PlanOptions,
         parent: Optional[PreparedPlanStep] = None
     ) -> PreparedPlan:
+        from atef.plan_utils import register_run_identifier
+
         # register run identifier, store in prepared_plan name
         bs_state = get_bs_state(parent)
         identifier = register_run_identifier(bs_state, origin.name or origin.plan)
@@ -1271,6 +1401,10 @@ class PreparedPlanStep(PreparedProcedureStep):
         # send plan to destination (local, queue server, ...)
         # local -> get global run engine, setup
         # qserver -> send to queueserver
+        from bluesky_queueserver.manager.profile_ops import (
+            existing_plans_and_devices_from_nspace, validate_plan)
+
+        from atef.plan_utils import get_default_namespace
 
         if self.origin.require_plan_success and self.prepared_plan_failures:
             return Result(
@@ -1417,6 +1551,8 @@ def get_bs_state(dclass: PreparedProcedureStep) -> BlueskyState:
     BlueskyState
         the BlueskyState holding run information and allowed devices/plans
     """
+    from atef.plan_utils import BlueskyState
+
     # dclass should be a Prepared dataclass
     if dclass is None:
         top_dclass = None
@@ -1526,6 +1662,8 @@ def get_RE_data(bs_state: BlueskyState, plan_data: PlanData) -> Any:
     ValueError
         if ``plan_data`` does not provide parsable datapoints
     """
+    from atef.plan_utils import GlobalRunEngine
+
     gre = GlobalRunEngine()
     run_uuids = bs_state.run_map[plan_data.plan_id]
     if run_uuids is None:
@@ -1550,6 +1688,33 @@ def get_RE_data(bs_state: BlueskyState, plan_data: PlanData) -> Any:
     return reduced_data
 
 
+def get_step_hash(step: AnyProcedure) -> str:
+    """
+    Get a hash of the settings of ``step``, used to detect edits.
+
+    The child steps of a group are not included, such that editing a child
+    does not mark its parent group as changed.
+
+    Parameters
+    ----------
+    step : AnyProcedure
+        The procedure step.
+
+    Returns
+    -------
+    str
+    """
+    exclude = ("parent", "steps") if isinstance(step, ProcedureGroup) else ("parent",)
+    return serialization.get_structural_hash(step, exclude=exclude)
+
+
+def _record_step_hashes(step: AnyProcedure, hashes: Dict[int, str]) -> None:
+    """Add the hashes of ``step`` and its descendants to ``hashes``."""
+    hashes[id(step)] = get_step_hash(step)
+    for child in getattr(step, "steps", []):
+        _record_step_hashes(child, hashes)
+
+
 AnyProcedure = Union[
     ProcedureGroup,
     DescriptionStep,
@@ -7,13 +7,13 @@ which link ``Comparisons`` to specific identifiers and hold ``Result`` objects.
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import datetime
-import json
 import logging
 import pathlib
 from dataclasses import dataclass, field
-from typing import (Any, Dict, Generator, List, Literal, Optional, Sequence,
-                    Tuple, Union, cast, get_args)
+from typing import (Any, Dict, Generator, Hashable, List, Literal, Optional,
+                    Sequence, Tuple, Union, cast, get_args)
 from uuid import UUID, uuid4
 
 import apischema
@@ -27,11 +27,12 @@ from atef.find_replace import RegexFindReplace
 from atef.result import _summarize_result_severity
 
 from .. import serialization, tools, util
-from ..cache import DataCache
+from ..cache import DataCache, ToolKey
 from ..check import Comparison
 from ..enums import GroupResultMode, Severity
 from ..exceptions import PreparationError, PreparedComparisonException
-from ..result import Result, incomplete_result
+from ..result import (Result, _all_skipped, incomplete_result, notify_result,
+                      skipped_result)
 from ..type_hints import AnyPath
 from ..yaml_support import init_yaml_support
 
@@ -130,16 +131,22 @@ class Configuration:
 
 
 @dataclass
-class ConfigurationGroup(Configuration):
+class ConfigurationGroup(Configuration, serialization.LazyChildren):
     """
     Configuration group.
     """
+    _lazy_field = "configs"
+
     #: Configurations underneath this group.
     configs: List[Configuration] = field(default_factory=list)
     #: Values that can be reused in comparisons underneath this group.
     values: Dict[str, Any] = field(default_factory=dict)
     #: Result mode.
     mode: GroupResultMode = GroupResultMode.all_
+    #: Stop running configurations once the result of the group is decided
+    #: (on the first failure for "all", or the first success for "any").
+    #: Remaining configurations are marked as skipped.
+    short_circuit: bool = False
 
     def walk_configs(self) -> Generator[AnyConfiguration, None, None]:
         for config in self.configs:
@@ -390,32 +397,51 @@ class ConfigurationFile:
                 yield config
 
     @classmethod
-    def from_filename(cls, filename: AnyPath) -> ConfigurationFile:
-        """Load a configuration file from a file.  Dispatches based on file type"""
+    def from_filename(
+        cls, filename: AnyPath, lazy: bool = False
+    ) -> ConfigurationFile:
+        """
+        Load a configuration file from a file.  Dispatches based on file type
+
+        If ``lazy``, the configurations of each group are only deserialized
+        when the group's ``configs`` are first accessed, such that the top
+        levels are available early.  This only saves time for callers reading
+        part of the file: preparing the file (``PreparedFile.from_config``)
+        accesses every group.  Errors in such configurations are raised on
+        access.
+        """
         path = pathlib.Path(filename)
         if path.suffix.lower() == '.json':
-            config = ConfigurationFile.from_json(path)
+            config = ConfigurationFile.from_json(path, lazy=lazy)
         else:
-            config = ConfigurationFile.from_yaml(path)
+            config = ConfigurationFile.from_yaml(path, lazy=lazy)
         return config
 
     @classmethod
-    def from_json(cls, filename: AnyPath) -> ConfigurationFile:
+    def from_json(cls, filename: AnyPath, lazy: bool = False) -> ConfigurationFile:
         """Load a configuration file from JSON."""
-        with open(filename) as fp:
-            serialized_config = json.load(fp)
-        return apischema.deserialize(cls, serialized_config)
+        with serialization.gc_paused():
+            with open(filename) as fp:
+                serialized_config = serialization.load_json(fp)
+            if lazy:
+                return serialization.deserialize_lazily(cls, serialized_config)
+            return serialization.get_deserializer(cls)(serialized_config)
 
     @classmethod
-    def from_yaml(cls, filename: AnyPath) -> ConfigurationFile:
+    def from_yaml(cls, filename: AnyPath, lazy: bool = False) -> ConfigurationFile:
         """Load a configuration file from yaml."""
-        with open(filename) as fp:
-            serialized_config = yaml.safe_load(fp)
-        return apischema.deserialize(cls, serialized_config)
+        with serialization.gc_paused():
+            with open(filename) as fp:
+                serialized_config = serialization.load_yaml(fp)
+            if lazy:
+                return serialization.deserialize_lazily(cls, serialized_config)
+            return serialization.get_deserializer(cls)(serialized_config)
 
     def to_json(self):
         """Dump this configuration file to a JSON-compatible dictionary."""
-        return apischema.serialize(ConfigurationFile, self, exclude_defaults=True)
+        serializer = serialization.get_serializer(ConfigurationFile, exclude_defaults=True)
+        with serialization.gc_paused():
+            return serializer(self)
 
     def to_yaml(self):
         """Dump this configuration file to yaml."""
@@ -456,6 +482,8 @@ class PreparedFile:
     root: PreparedGroup
     #: UUID for instance tracking
     uuid: UUID = field(default_factory=uuid4)
+    #: Hashes of the configurations as prepared, keyed by configuration id.
+    config_hashes: Dict[int, str] = field(default_factory=dict, repr=False)
 
     @classmethod
     def from_config(
@@ -504,17 +532,76 @@ class PreparedFile:
             root=prepared_root,
         )
         prepared_root.parent = prepared_file
+        _record_config_hashes(file.root, prepared_file.config_hashes)
         return prepared_file
 
-    async def fill_cache(self, parallel: bool = True) -> Optional[List[asyncio.Task]]:
+    def update_from_config(
+        self,
+    ) -> List[Union[AnyPreparedConfiguration, FailedConfiguration]]:
+        """
+        Re-prepare only the configurations edited since this file was
+        prepared.
+
+        Configurations are matched to their prepared counterparts by identity
+        and compared by way of :func:`get_config_hash`.  Unchanged
+        configurations are kept along with their results.  Edited, added,
+        moved, and previously failed configurations are prepared again, and
+        removed configurations are dropped.
+
+        Returns
+        -------
+        list of AnyPreparedConfiguration or FailedConfiguration
+            The newly prepared configurations.  Descendants of these are not
+            listed separately.
+        """
+        hashes: Dict[int, str] = {}
+        root = self.file.root
+        root_hash = get_config_hash(root)
+        if (
+            self.root.config is root
+            and self.config_hashes.get(id(root)) == root_hash
+        ):
+            hashes[id(root)] = root_hash
+            updated = self.root.update_from_config(
+                self.config_hashes, hashes, client=self.client
+            )
+        else:
+            self.root = PreparedGroup.from_config(
+                root, parent=self, client=self.client, cache=self.cache
+            )
+            _record_config_hashes(root, hashes)
+            updated = [self.root]
+
+        self.config_hashes = hashes
+        return updated
+
+    async def fill_cache(
+        self,
+        parallel: bool = True,
+        *,
+        max_concurrency: Optional[int] = None,
+        max_subscriptions: Optional[int] = None,
+    ) -> Optional[List[asyncio.Task]]:
         """
         Fill the DataCache.
 
+        In parallel mode, acquisitions are started in order of their expected
+        duration, longest first, such that long ``reduce_period`` windows
+        overlap with quick reads.  With no limits set, a checkout then takes
+        roughly as long as its longest acquisition window.
+
         Parameters
         ----------
         parallel : bool, optional
             By default, fill the cache in parallel with multiple asyncio tasks.
             If False, fill the cache sequentially.
+        max_concurrency : int, optional
+            The maximum number of acquisitions in progress at once.
+            Unlimited by default.
+        max_subscriptions : int, optional
+            The maximum number of ``reduce_period`` acquisitions - each of
+            which holds a subscription open for its window - in progress at
+            once.  Unlimited by default.
 
         Returns
         -------
@@ -526,9 +613,41 @@ class PreparedFile:
                 await prepared.get_data_async()
             return None
 
+        concurrency_limit = _optional_semaphore(max_concurrency)
+        subscription_limit = _optional_semaphore(max_subscriptions)
+        # The first task scheduled for each distinct acquisition
+        first_by_key: Dict[Any, asyncio.Task] = {}
+
+        async def acquire(
+            prepared: PreparedComparison,
+            first: Optional[asyncio.Task],
+        ) -> Any:
+            if first is not None:
+                # Let the first request for the same data fill the cache,
+                # rather than holding a slot waiting on it:
+                await asyncio.wait([first])
+
+            limits = [concurrency_limit]
+            if _expected_acquisition_time(prepared) > 0:
+                limits.insert(0, subscription_limit)
+
+            async with contextlib.AsyncExitStack() as stack:
+                for limit in limits:
+                    if limit is not None:
+                        await stack.enter_async_context(limit)
+                return await prepared.get_data_async()
+
+        comparisons = sorted(
+            self.walk_comparisons(),
+            key=_expected_acquisition_time,
+            reverse=True,
+        )
         tasks = []
-        for prepared in self.walk_comparisons():
-            task = asyncio.create_task(prepared.get_data_async())
+        for prepared in comparisons:
+            key = _get_acquisition_key(prepared)
+            task = asyncio.create_task(acquire(prepared, first_by_key.get(key)))
+            first_by_key.setdefault(key, task)
+            prepared.cache_fill_task = task
             tasks.append(task)
 
         return tasks
@@ -703,9 +822,19 @@ class PreparedConfiguration:
         status_logger.info(
             f"Starting config: '{cfg_name}' ({type(self).__name__})"
         )
-        for config in self.comparisons:
-            if isinstance(config, PreparedComparison):
-                results.append(await config.compare())
+        short_circuit = self.short_circuit
+        comparisons = [
+            config for config in self.comparisons
+            if isinstance(config, PreparedComparison)
+        ]
+        for idx, config in enumerate(comparisons):
+            results.append(await config.compare())
+            if short_circuit and _is_group_result_decided(
+                GroupResultMode.all_, results
+            ):
+                for remaining in comparisons[idx + 1:]:
+                    remaining.skip()
+                break
 
         if self.prepare_failures:
             result = Result(
@@ -720,8 +849,24 @@ class PreparedConfiguration:
         status_logger.info(
             f"Finished config: '{cfg_name}' ({type(self).__name__})"
         )
+        notify_result(self, result)
         return result
 
+    @property
+    def short_circuit(self) -> bool:
+        """
+        Whether comparisons may be skipped once this result is decided.
+
+        Follows the setting of the parent group.
+        """
+        return isinstance(self.parent, PreparedGroup) and self.parent.config.short_circuit
+
+    def skip(self) -> None:
+        """Mark this configuration and its comparisons as skipped."""
+        for comparison in self.comparisons:
+            comparison.skip()
+        self.combined_result = skipped_result()
+
     @property
     def result(self) -> Result:
         """Re-compute the combined result and return it"""
@@ -735,6 +880,8 @@ class PreparedConfiguration:
                 severity=Severity.error,
                 reason="At least one configuration failed to initialize",
             )
+        elif _all_skipped(results):
+            result = skipped_result()
         else:
             severity = _summarize_result_severity(GroupResultMode.all_, results)
             result = Result(severity=severity)
@@ -840,6 +987,72 @@ class PreparedGroup(PreparedConfiguration):
 
         return prepared
 
+    def update_from_config(
+        self,
+        previous_hashes: Dict[int, str],
+        hashes: Dict[int, str],
+        *,
+        client: Optional[happi.Client] = None,
+    ) -> List[Union[AnyPreparedConfiguration, FailedConfiguration]]:
+        """
+        Re-prepare only the configurations in this group edited since it was
+        prepared.  See :meth:`PreparedFile.update_from_config`.
+
+        Parameters
+        ----------
+        previous_hashes : Dict[int, str]
+            Configuration hashes at the time of the last preparation, keyed by
+            configuration id.
+        hashes : Dict[int, str]
+            Current configuration hashes, filled in by this method.
+        client : happi.Client, optional
+            A happi Client instance.
+
+        Returns
+        -------
+        list of AnyPreparedConfiguration or FailedConfiguration
+            The newly prepared configurations.
+        """
+        existing = {
+            id(prepared.config): prepared
+            for prepared in [*self.configs, *self.prepare_failures]
+        }
+        configs = []
+        prepare_failures = []
+        updated = []
+        for config in self.config.configs:
+            config_hash = get_config_hash(config)
+            prepared = existing.get(id(config), None)
+            if (
+                isinstance(prepared, PreparedConfiguration)
+                and previous_hashes.get(id(config)) == config_hash
+            ):
+                hashes[id(config)] = config_hash
+                if isinstance(prepared, PreparedGroup):
+                    updated.extend(
+                        prepared.update_from_config(
+                            previous_hashes, hashes, client=client
+                        )
+                    )
+            else:
+                prepared = PreparedConfiguration.from_config(
+                    config=cast(AnyConfiguration, config),
+                    parent=self,
+                    client=client,
+                    cache=self.cache,
+                )
+                _record_config_hashes(config, hashes)
+                updated.append(prepared)
+
+            if isinstance(prepared, FailedConfiguration):
+                prepare_failures.append(prepared)
+            else:
+                configs.append(prepared)
+
+        self.configs = configs
+        self.prepare_failures = prepare_failures
+        return updated
+
     @property
     def subgroups(self) -> List[PreparedGroup]:
         """
@@ -871,11 +1084,33 @@ class PreparedGroup(PreparedConfiguration):
             yield from config.walk_comparisons()
 
     async def compare(self) -> Result:
-        """Run all comparisons and return a combined result."""
+        """
+        Run all comparisons and return a combined result.
+
+        If the group is configured to short-circuit, configurations are
+        skipped once the group result has been decided.
+        """
         results = []
-        for config in self.configs:
-            if isinstance(config, PreparedConfiguration):
-                results.append(await config.compare())
+        configs = [
+            config for config in self.configs
+            if isinstance(config, PreparedConfiguration)
+        ]
+        if self.config.short_circuit and self.prepare_failures:
+            # The group fails regardless of what its configurations find
+            configs, skipped = [], configs
+        else:
+            skipped = []
+
+        for idx, config in enumerate(configs):
+            results.append(await config.compare())
+            if self.config.short_circuit and _is_group_result_decided(
+                self.config.mode, results
+            ):
+                skipped = configs[idx + 1:]
+                break
+
+        for config in skipped:
+            config.skip()
 
         if self.prepare_failures:
             result = Result(
@@ -888,8 +1123,15 @@ class PreparedGroup(PreparedConfiguration):
                 severity=severity
             )
         self.combined_result = result
+        notify_result(self, result)
         return result
 
+    def skip(self) -> None:
+        """Mark this group and everything underneath it as skipped."""
+        for config in self.configs:
+            config.skip()
+        self.combined_result = skipped_result()
+
     @property
     def result(self) -> Result:
         """Re-compute the combined result and return it"""
@@ -904,6 +1146,8 @@ class PreparedGroup(PreparedConfiguration):
                 severity=Severity.error,
                 reason="At least one configuration failed to initialize",
             )
+        elif _all_skipped(results):
+            result = skipped_result()
         else:
             severity = _summarize_result_severity(self.config.mode, results)
             result = Result(
@@ -1021,7 +1265,15 @@ class PreparedDeviceConfiguration(PreparedConfiguration):
         devices = list(additional_devices or [])
         for dev_name in config.devices:
             try:
-                devices.append(util.get_happi_device_by_name(dev_name, client=client))
+                if cache.archive_timestamp is None:
+                    device = util.get_happi_device_by_name(dev_name, client=client)
+                else:
+                    device = util.get_happi_device_by_name(
+                        dev_name,
+                        client=client,
+                        archive_timestamp=cache.archive_timestamp,
+                    )
+                devices.append(device)
             except Exception as ex:
                 raise PreparedComparisonException(
                     message=f"Failed to load happi device: {dev_name}",
@@ -1372,8 +1624,14 @@ class PreparedTemplateConfiguration(PreparedConfiguration):
         """Run the edited checkout and return the combined result"""
         result = await self.file.compare()
         self.combined_result = result
+        notify_result(self, result)
         return result
 
+    def skip(self) -> None:
+        """Mark the edited checkout as skipped."""
+        self.file.root.skip()
+        self.combined_result = skipped_result()
+
     @property
     def result(self) -> Result:
         """
@@ -1405,6 +1663,10 @@ class PreparedComparison:
     start_timestamp: Optional[datetime.datetime] = None
     #: Time when this comparison finished running.
     end_timestamp: Optional[datetime.datetime] = None
+    #: The pending data acquisition started by ``PreparedFile.fill_cache``.
+    cache_fill_task: Optional[asyncio.Task] = field(
+        default=None, repr=False, compare=False
+    )
 
     async def get_data_async(self) -> Any:
         """
@@ -1509,9 +1771,23 @@ class PreparedComparison:
         """
         self.start_timestamp = datetime.datetime.now(datetime.timezone.utc)
         try:
-            return await self._run_comparison()
+            result = await self._run_comparison()
         finally:
             self.end_timestamp = datetime.datetime.now(datetime.timezone.utc)
+        notify_result(self, result)
+        return result
+
+    def skip(self) -> None:
+        """
+        Mark this comparison as skipped without running it.
+
+        Any pending data acquisition started for it is cancelled, unless
+        other comparisons are still waiting on the same data.
+        """
+        if self.cache_fill_task is not None and not self.cache_fill_task.done():
+            self.cache_fill_task.cancel()
+        self.result = skipped_result()
+        notify_result(self, self.result)
 
 
 @dataclass
@@ -1849,6 +2125,94 @@ _class_to_prepared: Dict[type, type] = {
 }
 
 
+def get_config_hash(config: AnyConfiguration) -> str:
+    """
+    Get a hash of the settings of ``config``, used to detect edits.
+
+    The child configurations of a group are not included, such that editing a
+    child does not mark its parent group as changed.
+
+    Parameters
+    ----------
+    config : AnyConfiguration
+        The configuration.
+
+    Returns
+    -------
+    str
+    """
+    exclude = ("configs",) if isinstance(config, ConfigurationGroup) else ()
+    return serialization.get_structural_hash(config, exclude=exclude)
+
+
+def _record_config_hashes(config: AnyConfiguration, hashes: Dict[int, str]) -> None:
+    """Add the hashes of ``config`` and its descendants to ``hashes``."""
+    hashes[id(config)] = get_config_hash(config)
+    for child in getattr(config, "configs", []):
+        _record_config_hashes(child, hashes)
+
+
+def _expected_acquisition_time(prepared: PreparedComparison) -> float:
+    """The expected time to acquire data for a comparison, in seconds."""
+    return float(getattr(prepared.comparison, "reduce_period", None) or 0.0)
+
+
+def _get_acquisition_key(prepared: PreparedComparison) -> Hashable:
+    """
+    Get a key identifying the data acquisition required by ``prepared``.
+
+    Comparisons sharing a key share the same entry in the DataCache.
+    """
+    if isinstance(prepared, PreparedSignalComparison) and prepared.signal is not None:
+        comparison = prepared.comparison
+        return (
+            prepared.signal,
+            comparison.reduce_period,
+            comparison.reduce_method,
+            comparison.string or False,
+        )
+    if isinstance(prepared, PreparedToolComparison):
+        try:
+            return ToolKey.from_tool(prepared.tool)
+        except Exception:
+            ...
+    return id(prepared)
+
+
+def _optional_semaphore(limit: Optional[int]) -> Optional[asyncio.Semaphore]:
+    """A semaphore for ``limit``, or None if unlimited."""
+    if limit is None:
+        return None
+    return asyncio.Semaphore(max(limit, 1))
+
+
+def _is_group_result_decided(
+    mode: GroupResultMode,
+    results: Sequence[Result],
+) -> bool:
+    """
+    Determine if further results can no longer change a group's outcome.
+
+    Parameters
+    ----------
+    mode : GroupResultMode
+        The result mode of the group.
+    results : Sequence[Result]
+        The results gathered so far.
+
+    Returns
+    -------
+    bool
+        True on the first failure in "all" mode or the first success in "any"
+        mode.
+    """
+    if mode == GroupResultMode.all_:
+        return any(result.severity >= Severity.error for result in results)
+    if mode == GroupResultMode.any_:
+        return any(result.severity == Severity.success for result in results)
+    return False
+
+
 def get_result_from_comparison(
     item: Union[PreparedComparison, Exception, None]
 ) -> Tuple[Optional[PreparedComparison], Result]:
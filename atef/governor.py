@@ -0,0 +1,322 @@
+"""
+Access governor for limiting the load that checkouts place on the control
+system.
+
+An :class:`AccessGovernor` limits concurrent reads and the rate of new reads,
+both globally and for subsets of channels matched by PV name prefix or by the
+host serving them.
+
+``atef check`` exposes the global budget and a default per-host budget.
+Budgets for specific PV name prefixes or hosts are only available through
+this API.
+"""
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import ophyd
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AccessBudget:
+    """
+    Limits on reads for a set of channels.
+    """
+    #: The maximum number of reads in progress at once.  Unlimited if None.
+    max_concurrency: Optional[int] = None
+    #: The sustained rate of new reads [per second].  Unlimited if None.
+    rate: Optional[float] = None
+    #: The number of reads which may be started at once before ``rate``
+    #: applies.
+    burst: int = 1
+
+
+@dataclass
+class TokenBucket:
+    """
+    Token bucket rate limiter for asyncio.
+
+    Tokens are added at ``rate`` per second, up to ``capacity``.  Each call to
+    :meth:`acquire` consumes one token, waiting for it if necessary.
+    """
+    #: Tokens added per second.
+    rate: float
+    #: Maximum number of tokens held.
+    capacity: float = 1.0
+    #: The current number of tokens.
+    tokens: float = field(init=False)
+    #: Monotonic time of the last update of ``tokens``.
+    _last: float = field(init=False, repr=False)
+    #: Ensures tokens are handed out in order of request.
+    _lock: asyncio.Lock = field(init=False, repr=False, default_factory=asyncio.Lock)
+
+    def __post_init__(self):
+        self.capacity = max(self.capacity, 1.0)
+        self.tokens = self.capacity
+        self._last = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self) -> None:
+        """Wait for and consume a single token."""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1.0:
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1.0
+
+
+@dataclass
+class _BudgetState:
+    """Runtime state for enforcing an AccessBudget."""
+    budget: AccessBudget
+    semaphore: Optional[asyncio.Semaphore] = None
+    bucket: Optional[TokenBucket] = None
+
+    @classmethod
+    def from_budget(cls, budget: AccessBudget) -> _BudgetState:
+        semaphore = None
+        if budget.max_concurrency is not None:
+            semaphore = asyncio.Semaphore(max(budget.max_concurrency, 1))
+        bucket = None
+        if budget.rate is not None and budget.rate > 0:
+            bucket = TokenBucket(rate=budget.rate, capacity=budget.burst)
+        return cls(budget=budget, semaphore=semaphore, bucket=bucket)
+
+
+@dataclass
+class GovernorStatistics:
+    """
+    Counters describing the load on an AccessGovernor.
+    """
+    #: Total number of reads requested.
+    requests: int = 0
+    #: Reads currently in progress.
+    active: int = 0
+    #: Reads currently waiting on a budget (i.e., the queue depth).
+    queued: int = 0
+    #: The largest queue depth seen.
+    max_queued: int = 0
+    #: Total time spent waiting on budgets [sec].
+    total_wait_time: float = 0.0
+    #: The longest time a single read waited on budgets [sec].
+    max_wait_time: float = 0.0
+
+    @property
+    def mean_wait_time(self) -> float:
+        """Average time a read waited on budgets [sec]."""
+        if not self.requests:
+            return 0.0
+        return self.total_wait_time / self.requests
+
+
+def get_signal_pvname(signal: ophyd.Signal) -> Optional[str]:
+    """Get the PV name of ``signal``, if it has one."""
+    return getattr(signal, "pvname", None)
+
+
+def get_signal_host(signal: ophyd.Signal) -> Optional[str]:
+    """
+    Get the host name of the server of ``signal``, if known.
+
+    This is only known once the underlying channel has been connected (see
+    :func:`get_signal_host_async`), and includes the port as in
+    ``host:port``.
+    """
+    pv = getattr(signal, "_read_pv", None)
+    host = getattr(pv, "host", None)
+    if not isinstance(host, str) or not host:
+        return None
+    return host
+
+
+async def get_signal_host_async(
+    signal: ophyd.Signal,
+    executor: Optional[concurrent.futures.Executor] = None,
+) -> Optional[str]:
+    """
+    Get the host name of the server of ``signal``, connecting to it first if
+    necessary.
+
+    Parameters
+    ----------
+    signal : ophyd.Signal
+        The signal.
+    executor : concurrent.futures.Executor, optional
+        The executor to wait for the connection in.  Defaults to the
+        loop-defined default executor.
+
+    Returns
+    -------
+    str or None
+        The host, as in ``host:port``, or None if not known (e.g., the
+        signal did not connect).
+    """
+    host = get_signal_host(signal)
+    if host is not None or getattr(signal, "_read_pv", None) is None:
+        return host
+
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(executor, signal.wait_for_connection)
+    except Exception as ex:
+        # The read itself reports the failure
+        logger.debug("Unable to connect %s to find its host: %s", signal.name, ex)
+        return None
+    return get_signal_host(signal)
+
+
+@dataclass
+class AccessGovernor:
+    """
+    Limit concurrent reads and read rates for control system channels.
+
+    Every read must fit into the global budget, the budget of the longest
+    matching PV name prefix (if any), and the budget of the host serving
+    the channel.  Where host budgets are set, signals are connected before
+    waiting on budgets so that their host is known.
+    """
+    #: The budget for all reads.
+    global_budget: AccessBudget = field(default_factory=AccessBudget)
+    #: Budgets by PV name prefix.  Only the longest matching prefix applies.
+    prefix_budgets: Dict[str, AccessBudget] = field(default_factory=dict)
+    #: Budgets by host, as in ``host:port``.
+    host_budgets: Dict[str, AccessBudget] = field(default_factory=dict)
+    #: Budget applied separately to each host without an entry in
+    #: ``host_budgets``.
+    default_host_budget: Optional[AccessBudget] = None
+    #: Counters for monitoring.
+    statistics: GovernorStatistics = field(default_factory=GovernorStatistics)
+    #: Budget states keyed by (kind, name).
+    _states: Dict[Tuple[str, str], _BudgetState] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    #: The event loop ``_states`` were created in.
+    _loop: Optional[asyncio.AbstractEventLoop] = field(
+        default=None, init=False, repr=False
+    )
+
+    def _get_state(self, kind: str, name: str, budget: AccessBudget) -> _BudgetState:
+        key = (kind, name)
+        try:
+            return self._states[key]
+        except KeyError:
+            state = _BudgetState.from_budget(budget)
+            self._states[key] = state
+            return state
+
+    def _get_states(
+        self,
+        pvname: Optional[str] = None,
+        host: Optional[str] = None,
+    ) -> List[_BudgetState]:
+        """Get the budget states applicable to a read, in acquisition order."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # asyncio primitives are bound to the loop they are used in
+            self._states.clear()
+            self._loop = loop
+
+        states = [self._get_state("global", "", self.global_budget)]
+        if pvname:
+            matching = [
+                prefix for prefix in self.prefix_budgets
+                if pvname.startswith(prefix)
+            ]
+            if matching:
+                prefix = max(matching, key=len)
+                states.append(
+                    self._get_state("prefix", prefix, self.prefix_budgets[prefix])
+                )
+        if host:
+            budget = self.host_budgets.get(host, self.default_host_budget)
+            if budget is not None:
+                states.append(self._get_state("host", host, budget))
+        return states
+
+    @contextlib.asynccontextmanager
+    async def limit(
+        self,
+        pvname: Optional[str] = None,
+        host: Optional[str] = None,
+    ) -> AsyncIterator[None]:
+        """
+        [Async context manager] Wait for room in all applicable budgets, and
+        hold it for the duration of the block.
+
+        Parameters
+        ----------
+        pvname : str, optional
+            The PV name to be read, used to match ``prefix_budgets``.
+        host : str, optional
+            The host serving the PV, used to match ``host_budgets``.
+        """
+        stats = self.statistics
+        stats.requests += 1
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        start = time.monotonic()
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                for state in self._get_states(pvname=pvname, host=host):
+                    if state.semaphore is not None:
+                        await stack.enter_async_context(state.semaphore)
+                    if state.bucket is not None:
+                        await state.bucket.acquire()
+            finally:
+                stats.queued -= 1
+                waited = time.monotonic() - start
+                stats.total_wait_time += waited
+                stats.max_wait_time = max(stats.max_wait_time, waited)
+
+            stats.active += 1
+            try:
+                yield
+            finally:
+                stats.active -= 1
+
+    @property
+    def uses_hosts(self) -> bool:
+        """Whether any budget applies by host."""
+        return bool(self.host_budgets) or self.default_host_budget is not None
+
+    @contextlib.asynccontextmanager
+    async def limit_signal(
+        self,
+        signal: ophyd.Signal,
+        executor: Optional[concurrent.futures.Executor] = None,
+    ) -> AsyncIterator[None]:
+        """
+        [Async context manager] Wait for room in all budgets applicable to
+        ``signal``, and hold it for the duration of the block.
+
+        If host budgets are set, the signal is connected first (outside of
+        any budget) so that the budget of its host applies.
+
+        Parameters
+        ----------
+        signal : ophyd.Signal
+            The signal to be read.
+        executor : concurrent.futures.Executor, optional
+            The executor to wait for the connection in.  Defaults to the
+            loop-defined default executor.
+        """
+        if self.uses_hosts:
+            host = await get_signal_host_async(signal, executor=executor)
+        else:
+            host = get_signal_host(signal)
+
+        async with self.limit(pvname=get_signal_pvname(signal), host=host):
+            yield
@@ -6,17 +6,23 @@ widgets.
 """
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
 import functools
 import logging
 import platform
-from collections.abc import Sequence
+import threading
+from collections.abc import Coroutine, Sequence
 from typing import (Any, Callable, ClassVar, Dict, Generator, List, Optional,
-                    Tuple, Type, Union, get_args, get_origin, get_type_hints)
+                    Set, Tuple, Type, Union, get_args, get_origin,
+                    get_type_hints)
 
 from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtCore import QObject
 from qtpy.QtCore import Signal as QSignal
 
+from atef.result import result_callback
+
 logger = logging.getLogger(__name__)
 
 
@@ -365,6 +371,111 @@ class ThreadWorker(QtCore.QThread):
             self.returned.emit(self.return_value)
 
 
+class AsyncioWorker(QObject):
+    """
+    A long-lived asyncio event loop running in a background thread.
+
+    Coroutines submitted from the GUI thread run concurrently in this loop.
+    Submitting does not wait on the loop, such that a coroutine blocking the
+    loop does not block the GUI.  Completion and per-item results (see
+    :func:`atef.result.notify_result`) are reported back through signals,
+    which are queued to receivers in the GUI thread.
+
+    Use :func:`get_asyncio_worker` to get the shared instance.
+    """
+    #: Emitted with the future returned by :meth:`submit` when the submitted
+    #: coroutine has finished or been cancelled.
+    task_finished: ClassVar[QSignal] = QSignal(object)
+    #: Emitted with the item and its Result as each finishes running.
+    result_ready: ClassVar[QSignal] = QSignal(object, object)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.loop = asyncio.new_event_loop()
+        self.tasks: Set[concurrent.futures.Future] = set()
+        self._tasks_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="atef-asyncio-worker", daemon=True
+        )
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _emit_result(self, item: Any, result: Any) -> None:
+        self.result_ready.emit(item, result)
+
+    def _task_done(self, future: concurrent.futures.Future) -> None:
+        with self._tasks_lock:
+            self.tasks.discard(future)
+        if threading.current_thread() is self._thread or self.loop.is_closed():
+            self.task_finished.emit(future)
+        else:
+            # Cancelled (or finished before submit returned) in another thread.
+            # Emit from the loop, so that the signal is queued to the GUI
+            # thread after any results already emitted.
+            self.loop.call_soon_threadsafe(self.task_finished.emit, future)
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """
+        Run ``coro`` in the worker loop, without waiting for it to start.
+
+        May be called from any thread, including that of the worker loop.
+
+        Parameters
+        ----------
+        coro : Coroutine
+            The coroutine to run.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The future for the result of ``coro``.  Cancelling it (or passing
+            it to :meth:`cancel`) cancels the coroutine.
+        """
+        async def run() -> Any:
+            result_callback.set(self._emit_result)
+            return await coro
+
+        future = asyncio.run_coroutine_threadsafe(run(), self.loop)
+        with self._tasks_lock:
+            self.tasks.add(future)
+        future.add_done_callback(self._task_done)
+        return future
+
+    def cancel(self, future: concurrent.futures.Future) -> None:
+        """Cancel ``future``, as returned by :meth:`submit`."""
+        future.cancel()
+
+    def cancel_all(self) -> None:
+        """Cancel all running tasks."""
+        with self._tasks_lock:
+            futures = list(self.tasks)
+        for future in futures:
+            future.cancel()
+
+    def stop(self) -> None:
+        """Cancel all running tasks and stop the worker loop."""
+        self.cancel_all()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+_asyncio_worker: Optional[AsyncioWorker] = None
+
+
+def get_asyncio_worker() -> AsyncioWorker:
+    """
+    Get the shared :class:`AsyncioWorker`, starting it if necessary.  Must be
+    first called from the GUI thread.
+    """
+    global _asyncio_worker
+    if _asyncio_worker is None:
+        _asyncio_worker = AsyncioWorker()
+    return _asyncio_worker
+
+
 def run_in_gui_thread(func: Callable, *args, _start_delay_ms: int = 0, **kwargs):
     """Run the provided function in the GUI thread."""
     QtCore.QTimer.singleShot(_start_delay_ms, functools.partial(func, *args, **kwargs))
@@ -87,7 +87,7 @@ def get_result_text(result: Result) -> Paragraph:
     severity = result.severity
 
     text = (f'<font color={RESULT_COLOR[severity]}>'
-            f'<b>{severity.name}</b>: {result.reason or "-"}</font>')
+            f'<b>{result.status}</b>: {result.reason or "-"}</font>')
     para = Paragraph(text)
     para.wrap(1.5*units.inch, 10*units.inch)
     return para
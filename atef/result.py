@@ -4,15 +4,19 @@ class, as well as accompanying helper functions
 """
 from __future__ import annotations
 
+import contextvars
 import datetime
+import logging
 from dataclasses import dataclass, field
 from functools import partial
-from typing import List, Optional, Union
+from typing import Any, Callable, List, Optional, Union
 
 from atef import exceptions, util
 from atef.enums import GroupResultMode, Severity
 from atef.exceptions import PreparedComparisonException
 
+logger = logging.getLogger(__name__)
+
 # Python 3.11+ exposes datetime.UTC; older versions use datetime.timezone.utc.
 UTC = getattr(datetime, 'UTC', datetime.timezone.utc)
 
@@ -22,7 +26,8 @@ class Result:
     """
     The result of a check or step.  Contains a severity enum and reason.
     The timestamp field should not be specified at creation, as it will be
-    automatically filled.
+    automatically filled.  Checks or steps that were not run, as the result of
+    their group was already decided, are marked as skipped.
     """
     severity: Severity = Severity.success
     reason: Optional[str] = None
@@ -30,6 +35,14 @@ class Result:
         default_factory=partial(datetime.datetime.now, UTC),
         compare=False
     )
+    skipped: bool = False
+
+    @property
+    def status(self) -> str:
+        """The status for display: "skipped", or the severity name."""
+        if self.skipped:
+            return "skipped"
+        return self.severity.name
 
     @classmethod
     def from_exception(cls, error: Exception) -> Result:
@@ -57,10 +70,47 @@ def incomplete_result():
     return Result(severity=Severity.warning, reason='step incomplete')
 
 
+def skipped_result():
+    return Result(
+        severity=Severity.warning,
+        reason='step skipped: group result already determined',
+        skipped=True,
+    )
+
+
 def successful_result():
     return Result()
 
 
+#: Called with each prepared comparison, configuration or step and its Result
+#: as it finishes running.  Being a context variable, it applies only to the
+#: task it is set in and tasks started from it.
+result_callback: contextvars.ContextVar[
+    Optional[Callable[[Any, Result], None]]
+] = contextvars.ContextVar("result_callback", default=None)
+
+
+def notify_result(item: Any, result: Result) -> None:
+    """
+    Report a newly finished ``result`` of ``item`` to the ``result_callback``
+    of the current context, if any.
+
+    Parameters
+    ----------
+    item : Any
+        The prepared comparison, configuration or step.
+    result : Result
+        Its new result.
+    """
+    callback = result_callback.get()
+    if callback is None:
+        return
+    try:
+        callback(item, result)
+    except Exception:
+        logger.exception("Result callback failed for %s", item)
+
+
 def combine_results(results: List[Result]) -> Result:
     """
     Combines results into a single result.
@@ -82,6 +132,13 @@ def combine_results(results: List[Result]) -> Result:
     return Result(severity=severity, reason=reason)
 
 
+def _all_skipped(results: List[Union[Result, Exception, None]]) -> bool:
+    """Whether there are results, and all of them were skipped."""
+    return bool(results) and all(
+        isinstance(result, Result) and result.skipped for result in results
+    )
+
+
 def _summarize_result_severity(
     mode: GroupResultMode,
     results: List[Union[Result, Exception, None]]
@@ -0,0 +1,119 @@
+"""
+This script benchmarks archived data access against a local archiver appliance
+stand-in, filled with synthetic or recorded data.  It reports snapshot
+throughput, cache hit rates, history retrieval and (optionally) archive viewer
+load times.
+
+An example invocation might be:
+atef scripts archive_benchmark --pvs 500 --timestamps 20 --latency 0.05
+"""
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION = __doc__
+
+
+def build_arg_parser(argparser=None) -> argparse.ArgumentParser:
+    """Create the argparser."""
+    if argparser is None:
+        argparser = argparse.ArgumentParser()
+
+    argparser.description = DESCRIPTION
+    argparser.formatter_class = argparse.RawTextHelpFormatter
+
+    argparser.add_argument(
+        "--pvs",
+        dest="num_pvs",
+        type=int,
+        default=100,
+        help="Number of synthetic PVs, by default 100",
+    )
+
+    argparser.add_argument(
+        "--duration",
+        type=float,
+        default=24.0,
+        help="Hours of synthetic data, by default 24",
+    )
+
+    argparser.add_argument(
+        "--period",
+        type=float,
+        default=10.0,
+        help="Seconds between synthetic samples, by default 10",
+    )
+
+    argparser.add_argument(
+        "--timestamps",
+        dest="num_timestamps",
+        type=int,
+        default=10,
+        help="Number of timestamps to request snapshots at, by default 10",
+    )
+
+    argparser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds to delay each archiver request by, by default 0",
+    )
+
+    argparser.add_argument(
+        "--bin-size",
+        type=int,
+        default=60,
+        help="Seconds per bin for binned history requests, by default 60",
+    )
+
+    argparser.add_argument(
+        "--recording",
+        type=str,
+        help="Load archiver data from this file rather than generating it",
+    )
+
+    argparser.add_argument(
+        "--save",
+        type=str,
+        help="Save the archiver data to this file, for later --recording use",
+    )
+
+    argparser.add_argument(
+        "--viewer",
+        action="store_true",
+        help="Benchmark the archive viewer as well.  This requires Qt and a "
+             "free port 17668",
+    )
+
+    return argparser
+
+
+def main(*args, **kwargs):
+    from atef.scripts.archive_benchmark_main import main
+    main(*args, **kwargs)
+
+
+def main_script(args=None) -> None:
+    """Run the benchmarks."""
+    parser = build_arg_parser()
+    # Add log_level if running file alone
+    parser.add_argument(
+        "--log",
+        "-l",
+        dest="log_level",
+        default="INFO",
+        type=str,
+        help="Python logging level (e.g. DEBUG, INFO, WARNING), by default INFO",
+    )
+    args = parser.parse_args()
+    kwargs = vars(args)
+    logger.setLevel(args.log_level)
+    kwargs.pop('log_level')
+    logging.basicConfig()
+
+    main(**kwargs)
+
+
+if __name__ == "__main__":
+    main_script()
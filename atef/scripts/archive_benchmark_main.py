@@ -0,0 +1,309 @@
+"""
+This script benchmarks archived data access against a local archiver appliance
+stand-in, filled with synthetic or recorded data.  It reports snapshot
+throughput, cache hit rates, history retrieval and (optionally) archive viewer
+load times.
+
+An example invocation might be:
+atef scripts archive_benchmark --pvs 500 --timestamps 20 --latency 0.05
+"""
+import dataclasses
+import datetime
+import logging
+import os
+import threading
+import time
+from typing import List, Optional
+
+from atef.archive_device import (ArchivedValue, ArchiverHelper,
+                                 ArchiverStatistics)
+from atef.archive_server import DATA_PATH, SNAPSHOT_PATH, LocalArchiver
+
+DESCRIPTION = __doc__
+logger = logging.getLogger(__name__)
+
+#: The port the archive viewer expects the appliance on.
+VIEWER_PORT = 17668
+
+
+@dataclasses.dataclass
+class BenchmarkResult:
+    """The result of a single benchmark."""
+    #: The benchmark name.
+    name: str
+    #: The number of PV values or samples retrieved.
+    count: int
+    #: The time taken [sec].
+    elapsed: float
+    #: The number of requests the archiver handled.
+    requests: int
+    #: The fraction of PV values found in the ArchiverHelper cache, if
+    #: applicable.
+    hit_rate: Optional[float] = None
+
+    @property
+    def rate(self) -> float:
+        """PV values or samples retrieved per second."""
+        if self.elapsed <= 0:
+            return float("inf")
+        return self.count / self.elapsed
+
+
+class _Measurement:
+    """Measures time, archiver requests and cache use of a block."""
+    def __init__(self, archiver: LocalArchiver, name: str):
+        self.archiver = archiver
+        self.name = name
+        self.count = 0
+        self.result = None
+
+    def _requests(self) -> int:
+        return self.archiver.get_request_count()
+
+    def __enter__(self):
+        helper = ArchiverHelper.instance()
+        helper.statistics = ArchiverStatistics()
+        self._start_requests = self._requests()
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.monotonic() - self._start
+        stats = ArchiverHelper.instance().statistics
+        hit_rate = None
+        if stats.cache_hits or stats.cache_misses:
+            hit_rate = stats.hit_rate
+        self.result = BenchmarkResult(
+            name=self.name,
+            count=self.count,
+            elapsed=elapsed,
+            requests=self._requests() - self._start_requests,
+            hit_rate=hit_rate,
+        )
+
+
+def get_timestamps(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    count: int,
+) -> List[datetime.datetime]:
+    """``count`` timestamps evenly spread from ``start`` to ``end``."""
+    if count <= 1:
+        return [end]
+    step = (end - start) / (count - 1)
+    return [start + step * idx for idx in range(count)]
+
+
+def benchmark_snapshots(
+    archiver: LocalArchiver,
+    pvnames: List[str],
+    timestamps: List[datetime.datetime],
+    name: str,
+) -> BenchmarkResult:
+    """Request all PVs at all timestamps at once."""
+    helper = ArchiverHelper.instance()
+    with _Measurement(archiver, name) as measurement:
+        data = helper.get_pvs_at_times({dt: pvnames for dt in timestamps})
+        measurement.count = sum(len(values) for values in data.values())
+    return measurement.result
+
+
+def benchmark_queued(
+    archiver: LocalArchiver,
+    pvnames: List[str],
+    timestamps: List[datetime.datetime],
+    name: str,
+    timeout: float = 60.0,
+) -> BenchmarkResult:
+    """Queue all PVs at all timestamps, as archived devices do."""
+    helper = ArchiverHelper.instance()
+    expected = len(pvnames) * len(timestamps)
+    received = []
+    done = threading.Event()
+
+    def callback(value: ArchivedValue):
+        received.append(value)
+        if len(received) >= expected:
+            done.set()
+
+    with _Measurement(archiver, name) as measurement:
+        for dt in timestamps:
+            for pvname in pvnames:
+                helper.queue_pv(pvname, dt, callback)
+        if not done.wait(timeout):
+            logger.warning("Timed out waiting for queued PVs")
+        measurement.count = len(received)
+    return measurement.result
+
+
+def benchmark_history(
+    archiver: LocalArchiver,
+    pvnames: List[str],
+    start: datetime.datetime,
+    end: datetime.datetime,
+    name: str,
+    bin_size: Optional[int] = None,
+) -> BenchmarkResult:
+    """Request the history of each PV."""
+    helper = ArchiverHelper.instance()
+    with _Measurement(archiver, name) as measurement:
+        for pvname in pvnames:
+            values = helper.get_pv_history(pvname, start, end, bin_size=bin_size)
+            measurement.count += len(values)
+    return measurement.result
+
+
+def benchmark_viewer(
+    archiver: LocalArchiver,
+    pvnames: List[str],
+    name: str,
+) -> BenchmarkResult:
+    """Add all PVs to a new archive viewer and draw the curves."""
+    if archiver.port != VIEWER_PORT:
+        raise ValueError(
+            f"The archive viewer requires the archiver on port {VIEWER_PORT}"
+        )
+
+    from qtpy import QtWidgets
+
+    from atef.widgets.archive_viewer import ArchiverViewerWidget
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    os.environ["PYDM_ARCHIVER_URL"] = archiver.url
+    with _Measurement(archiver, name) as measurement:
+        viewer = ArchiverViewerWidget()
+        viewer.add_signals(
+            [(pvname, None) for pvname in pvnames], update_curves=False
+        )
+        viewer.update_curves()
+        app.processEvents()
+        measurement.count = len(viewer.model.pvs)
+    viewer.deleteLater()
+    return measurement.result
+
+
+def run_benchmarks(
+    archiver: LocalArchiver,
+    num_timestamps: int = 10,
+    bin_size: int = 60,
+    viewer: bool = False,
+) -> List[BenchmarkResult]:
+    """
+    Run all benchmarks against ``archiver``, which must be running.
+
+    Parameters
+    ----------
+    archiver : LocalArchiver
+        The archiver, holding the data to be requested.
+
+    num_timestamps : int, optional
+        The number of timestamps to request snapshots at.
+
+    bin_size : int, optional
+        Seconds per bin for binned history requests.
+
+    viewer : bool, optional
+        Benchmark the archive viewer as well.
+
+    Returns
+    -------
+    list of BenchmarkResult
+    """
+    pvnames = sorted(archiver.pvs)
+    start, end = archiver.get_time_range()
+    timestamps = get_timestamps(start, end, num_timestamps)
+    # Between the first set, such that cached values do not apply
+    offset = (end - start) / (2 * max(num_timestamps, 1))
+    other_timestamps = [dt - offset for dt in timestamps]
+
+    results = []
+    with archiver.use():
+        results.append(
+            benchmark_snapshots(archiver, pvnames, timestamps, "snapshot (cold)")
+        )
+        results.append(
+            benchmark_snapshots(archiver, pvnames, timestamps, "snapshot (warm)")
+        )
+        results.append(
+            benchmark_queued(archiver, pvnames, other_timestamps, "queued (cold)")
+        )
+        results.append(
+            benchmark_history(archiver, pvnames, start, end, "history (raw)")
+        )
+        results.append(
+            benchmark_snapshots(
+                archiver, pvnames, other_timestamps, "snapshot (after history)"
+            )
+        )
+        results.append(
+            benchmark_history(
+                archiver, pvnames, start, end, f"history ({bin_size} s bins)",
+                bin_size=bin_size,
+            )
+        )
+        if viewer:
+            results.append(benchmark_viewer(archiver, pvnames, "viewer"))
+    return results
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    """Format benchmark results as a table."""
+    lines = [
+        f"{'benchmark':<28} {'count':>9} {'time [s]':>9} {'rate [/s]':>11} "
+        f"{'requests':>9} {'hit rate':>9}"
+    ]
+    for result in results:
+        hit_rate = "" if result.hit_rate is None else f"{result.hit_rate:.1%}"
+        lines.append(
+            f"{result.name:<28} {result.count:>9} {result.elapsed:>9.3f} "
+            f"{result.rate:>11.1f} {result.requests:>9} {hit_rate:>9}"
+        )
+    return "\n".join(lines)
+
+
+def main(
+    num_pvs: int = 100,
+    duration: float = 24.0,
+    period: float = 10.0,
+    num_timestamps: int = 10,
+    latency: float = 0.0,
+    bin_size: int = 60,
+    recording: Optional[str] = None,
+    save: Optional[str] = None,
+    viewer: bool = False,
+) -> List[BenchmarkResult]:
+    archiver = LocalArchiver(
+        latency=latency, port=VIEWER_PORT if viewer else 0
+    )
+    if recording is not None:
+        archiver.load(recording)
+    else:
+        end = datetime.datetime.now().replace(microsecond=0)
+        start = end - datetime.timedelta(hours=duration)
+        archiver.add_synthetic(
+            [f"BENCH:PV:{idx:05d}" for idx in range(num_pvs)],
+            start, end, period=period, jitter=0.1,
+        )
+    if save is not None:
+        archiver.save(save)
+
+    logger.info(
+        "Archiver holds %d samples of %d PVs",
+        sum(len(data.times) for data in archiver.pvs.values()),
+        len(archiver.pvs),
+    )
+    with archiver:
+        results = run_benchmarks(
+            archiver,
+            num_timestamps=num_timestamps,
+            bin_size=bin_size,
+            viewer=viewer,
+        )
+        logger.debug(
+            "Requests: %d data, %d snapshot",
+            archiver.get_request_count(DATA_PATH),
+            archiver.get_request_count(SNAPSHOT_PATH),
+        )
+
+    print(format_results(results))
+    return results
@@ -0,0 +1,76 @@
+"""
+This script benchmarks loading and saving a configuration file (checkout).
+The file may be enlarged by repeating the contents of its root group, to
+stand in for large generated checkouts.
+
+An example invocation might be:
+atef scripts config_benchmark atef/tests/configs/all_fields.json --copies 3000
+"""
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION = __doc__
+
+
+def build_arg_parser(argparser=None) -> argparse.ArgumentParser:
+    """Create the argparser."""
+    if argparser is None:
+        argparser = argparse.ArgumentParser()
+
+    argparser.description = DESCRIPTION
+    argparser.formatter_class = argparse.RawTextHelpFormatter
+
+    argparser.add_argument(
+        "filename",
+        type=str,
+        help="Configuration file (passive or active) to benchmark",
+    )
+
+    argparser.add_argument(
+        "--copies",
+        type=int,
+        default=1,
+        help="Repeat the contents of the root group this many times, by "
+             "default 1",
+    )
+
+    argparser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of times to run each benchmark, by default 3",
+    )
+
+    return argparser
+
+
+def main(*args, **kwargs):
+    from atef.scripts.config_benchmark_main import main
+    main(*args, **kwargs)
+
+
+def main_script(args=None) -> None:
+    """Run the benchmarks."""
+    parser = build_arg_parser()
+    # Add log_level if running file alone
+    parser.add_argument(
+        "--log",
+        "-l",
+        dest="log_level",
+        default="INFO",
+        type=str,
+        help="Python logging level (e.g. DEBUG, INFO, WARNING), by default INFO",
+    )
+    args = parser.parse_args()
+    kwargs = vars(args)
+    logger.setLevel(args.log_level)
+    kwargs.pop('log_level')
+    logging.basicConfig()
+
+    main(**kwargs)
+
+
+if __name__ == "__main__":
+    main_script()
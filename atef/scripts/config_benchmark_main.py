@@ -0,0 +1,116 @@
+"""
+This script benchmarks loading and saving a configuration file (checkout).
+The file may be enlarged by repeating the contents of its root group, to
+stand in for large generated checkouts.
+
+An example invocation might be:
+atef scripts config_benchmark atef/tests/configs/all_fields.json --copies 3000
+"""
+import json
+import logging
+import pathlib
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import apischema
+
+from atef.config_model import load_file
+from atef.serialization import dumps_json, gc_paused, get_serializer
+
+DESCRIPTION = __doc__
+logger = logging.getLogger(__name__)
+
+
+def enlarge(serialized: Dict[str, Any], copies: int) -> Dict[str, Any]:
+    """Repeat the contents of the root group of a serialized file."""
+    root = dict(serialized["root"])
+    key = "configs" if "configs" in root else "steps"
+    root[key] = list(root.get(key, [])) * copies
+    return {**serialized, "root": root}
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """The best time taken by ``func`` [sec], and its result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run_benchmarks(
+    path: pathlib.Path,
+    repeat: int = 3,
+) -> List[Tuple[str, float, float]]:
+    """
+    Benchmark the file at ``path`` against plain apischema and json use.
+
+    Returns
+    -------
+    list of (name, time [sec], reference time [sec])
+    """
+    text = path.read_text()
+    results = []
+
+    elapsed, file = measure(lambda: load_file(path), repeat)
+    cls = type(file)
+    reference, _ = measure(
+        lambda: apischema.deserialize(cls, json.loads(text)), repeat
+    )
+    results.append(("load", elapsed, reference))
+    # Only the top level is deserialized when loading lazily
+    elapsed, _ = measure(lambda: load_file(path, lazy=True), repeat)
+    results.append(("load (lazy)", elapsed, reference))
+
+    def serialize():
+        with gc_paused():
+            return get_serializer(cls)(file)
+
+    elapsed, serialized = measure(serialize, repeat)
+    reference, _ = measure(lambda: apischema.serialize(cls, file), repeat)
+    results.append(("serialize", elapsed, reference))
+
+    elapsed, dumped = measure(lambda: dumps_json(serialized), repeat)
+    reference, expected = measure(
+        lambda: json.dumps(serialized, indent=2), repeat
+    )
+    if dumped != expected:
+        logger.warning("Dumped JSON differs from that of the json module")
+    results.append(("dump", elapsed, reference))
+    return results
+
+
+def format_results(results: List[Tuple[str, float, float]]) -> str:
+    """Format benchmark results as a table."""
+    lines = [
+        f"{'benchmark':<12} {'time [s]':>9} {'reference [s]':>14} {'speedup':>8}"
+    ]
+    for name, elapsed, reference in results:
+        lines.append(
+            f"{name:<12} {elapsed:>9.3f} {reference:>14.3f} "
+            f"{reference / max(elapsed, 1e-9):>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(
+    filename: str,
+    copies: int = 1,
+    repeat: int = 3,
+) -> List[Tuple[str, float, float]]:
+    path = pathlib.Path(filename)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if copies > 1:
+            file = load_file(path)
+            serialized = enlarge(get_serializer(type(file))(file), copies)
+            path = pathlib.Path(tmpdir) / "enlarged.json"
+            path.write_text(dumps_json(serialized))
+        logger.info(
+            "Benchmarking %s (%.1f MB)", path, path.stat().st_size / 1e6
+        )
+        results = run_benchmarks(path, repeat=repeat)
+
+    print(format_results(results))
+    return results
@@ -3,21 +3,44 @@ Serialization helpers for apischema.
 """
 # Largely based on issue discussions regarding tagged unions.
 
+import contextlib
+import copy
+import dataclasses
+import gc
+import hashlib
+import json
+import re
+import threading
 from collections import defaultdict
 from collections.abc import Callable, Iterator
 from types import new_class
-from typing import (Any, Dict, Generic, List, Tuple, TypeVar, get_origin,
-                    get_type_hints)
+from typing import (IO, Any, ClassVar, Dict, Generic, List, Optional, Sequence,
+                    Tuple, Type, TypeVar, Union, get_origin, get_type_hints)
 
-from apischema import deserializer, serializer, type_name
+import yaml
+from apischema import (deserialization_method, deserializer, serialization_method,
+                       serialize, serializer, type_name)
+from apischema.cache import cache
 from apischema.conversions import Conversion
 from apischema.metadata import conversion
 from apischema.objects import object_deserialization
-from apischema.tagged_unions import Tagged, TaggedUnion, get_tagged
+from apischema.tagged_unions import Tagged, TaggedUnion
+from apischema.types import Undefined
 from apischema.utils import to_pascal_case
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+#: The YAML loader for configuration files, LibYAML-based where available.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# Exponents of floats as formatted by the json module, if preceded by a digit
+_float_exponent = re.compile(r"e[-+]\d")
+
 _alternative_constructors: Dict[type, List[Callable]] = defaultdict(list)
 Func = TypeVar("Func", bound=Callable)
+T = TypeVar("T")
 
 
 def alternative_constructor(func: Func) -> Func:
@@ -47,6 +70,37 @@ def _get_generic_name_factory(cls: type, *args: type):
 generic_name = type_name(_get_generic_name_factory)
 
 
+def _make_tagged_union_init(tags: Sequence[str]) -> Callable[..., None]:
+    """
+    Make a ``TaggedUnion.__init__`` replacement for the given tags.
+
+    The base implementation sets each tag individually; these are set at once
+    from a template instead, as a tagged union object is made for every
+    tagged union value (de)serialized.
+    """
+    tag_set = frozenset(tags)
+    undefined = dict.fromkeys(tags, Undefined)
+
+    def __init__(self, **kwargs):
+        if len(kwargs) != 1:
+            raise ValueError("TaggedUnion constructor expects only one field")
+        ((tag, value),) = kwargs.items()
+        if tag not in tag_set:
+            raise TypeError(f"{type(self)} has no tag {tag}")
+        self.__dict__.update(undefined)
+        self.__dict__[tag] = value
+
+    return __init__
+
+
+def _get_tagged_value(tagged_union: TaggedUnion) -> Any:
+    """Get the value of the one tag set on ``tagged_union``."""
+    for value in vars(tagged_union).values():
+        if value is not Undefined:
+            return value
+    raise ValueError(f"No tag set on {tagged_union}")
+
+
 def as_tagged_union(cls: Cls) -> Cls:
     """
     Tagged union decorator, to be used on base class.
@@ -87,7 +141,10 @@ def as_tagged_union(cls: Cls) -> Cls:
             sub.__name__: Tagged[with_params(sub)]
             for sub in get_all_subclasses(cls)
         }
-        namespace = {"__annotations__": annotations}
+        namespace = {
+            "__annotations__": annotations,
+            "__init__": _make_tagged_union_init(list(annotations)),
+        }
         tagged_union = new_class(
             cls.__name__, tagged_union_bases, exec_body=lambda ns: ns.update(namespace)
         )
@@ -123,12 +180,13 @@ def as_tagged_union(cls: Cls) -> Cls:
                 # Add constructor tagged field with its conversion
                 annotations[alias] = Tagged[with_params(sub)]
                 namespace[alias] = Tagged(conversion(deserialization=deserialization))
+        namespace["__init__"] = _make_tagged_union_init(list(annotations))
         # Create the deserialization tagged union class
         tagged_union = new_class(
             cls.__name__, tagged_union_bases, exec_body=lambda ns: ns.update(namespace)
         )
         return Conversion(
-            lambda obj: get_tagged(obj)[1],
+            _get_tagged_value,
             source=with_params(tagged_union),
             target=with_params(cls),
         )
@@ -136,3 +194,285 @@ def as_tagged_union(cls: Cls) -> Cls:
     deserializer(lazy=deserialization, target=cls)
     serializer(lazy=serialization, source=cls)
     return cls
+
+
+@contextlib.contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Pause cyclic garbage collection for the duration of the block.
+
+    Building large trees of objects (e.g., when loading a big configuration
+    file) otherwise triggers repeated full collections, which grow with the
+    number of objects alive and can dominate the time taken.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+@cache
+def get_deserializer(cls: Type[T]) -> Callable[[Any], T]:
+    """
+    Get the compiled apischema deserialization method for ``cls``.
+
+    Cached until apischema conversions change (e.g., when a tagged union gains
+    a subclass).
+    """
+    return deserialization_method(cls)
+
+
+@cache
+def get_serializer(
+    cls: Type[T], exclude_defaults: bool = False
+) -> Callable[[T], Any]:
+    """
+    Get the compiled apischema serialization method for ``cls``.
+
+    Cached until apischema conversions change.
+    """
+    return serialization_method(cls, exclude_defaults=exclude_defaults)
+
+
+def load_json(fp: IO) -> Any:
+    """
+    Load JSON from a file, using orjson where available.
+
+    Documents orjson does not accept (e.g., those with ``NaN``) are loaded by
+    the json module instead.
+    """
+    text = fp.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def _has_float_exponent(text: str) -> bool:
+    """Whether JSON text may include a float in exponent notation."""
+    return any(
+        match.start() > 0 and text[match.start() - 1].isdigit()
+        for match in _float_exponent.finditer(text)
+    )
+
+
+def dumps_json(data: Any) -> str:
+    """
+    Dump data to a JSON string with an indent of 2, exactly as ``json.dumps``
+    would, using orjson where available.
+
+    orjson writes non-finite floats as ``null``, formats float exponents
+    differently, writes some characters unescaped and accepts types the json
+    module does not.  Such data is dumped by the json module instead.
+    """
+    if orjson is not None:
+        try:
+            # Fast check (without indent, by way of the C encoder) that the
+            # json module would dump the data as-is
+            compact = json.dumps(data, allow_nan=False)
+            text = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        except (TypeError, ValueError):
+            pass
+        else:
+            if (
+                text.isascii()
+                and "\x7f" not in text
+                and not _has_float_exponent(compact)
+            ):
+                return text
+    return json.dumps(data, indent=2)
+
+
+def load_yaml(fp: Union[IO, str]) -> Any:
+    """Safely load YAML, using the LibYAML-based loader where available."""
+    return yaml.load(fp, Loader=YamlLoader)
+
+
+# The instance attribute holding the serialized children of a group whose
+# children have not been deserialized yet
+_PENDING_CHILDREN = "_pending_children"
+_lazy_classes: Dict[str, Type["LazyChildren"]] = {}
+_lazy_lock = threading.Lock()
+
+
+class LazyChildren:
+    """
+    Mixin for group dataclasses whose children may be deserialized on first
+    access, rather than along with the group itself.
+
+    Subclasses name the field holding the children in ``_lazy_field``.  Groups
+    deserialized by way of `deserialize_lazily` hold the serialized form of
+    their children until that field is first accessed; otherwise, they behave
+    as usual.
+    """
+    #: The name of the field holding the children of the group.
+    _lazy_field: ClassVar[str]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Tags of the tagged unions are class names
+        _lazy_classes[cls.__name__] = cls
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called if the attribute was not found the usual way
+        state = self.__dict__
+        if name != self._lazy_field or _PENDING_CHILDREN not in state:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        with _lazy_lock:
+            if name not in state:
+                state[name] = deserialize_lazily(
+                    _get_children_type(type(self)), state[_PENDING_CHILDREN]
+                )
+                del state[_PENDING_CHILDREN]
+        return state[name]
+
+
+@cache
+def _get_children_type(cls: Type[LazyChildren]) -> Any:
+    """The type of the children field of a group class."""
+    return get_type_hints(cls)[cls._lazy_field]
+
+
+def _defer_children(
+    lazy_cls: Type[LazyChildren], fields: Any
+) -> Tuple[Any, Optional[Any]]:
+    """
+    Split the serialized children off of the serialized fields of a group.
+
+    Returns
+    -------
+    fields : Any
+        The fields, without the children, if any.
+    children : Any or None
+        The serialized children, or None if there were none to defer.
+    """
+    if not isinstance(fields, dict) or lazy_cls._lazy_field not in fields:
+        return fields, None
+    fields = dict(fields)
+    return fields, fields.pop(lazy_cls._lazy_field)
+
+
+@cache
+def _get_lazy_fields(cls: type) -> List[Tuple[str, Type[LazyChildren]]]:
+    """The names and types of the fields of ``cls`` that hold lazy groups."""
+    if not dataclasses.is_dataclass(cls):
+        return []
+    hints = get_type_hints(cls)
+    return [
+        (fld.name, hints[fld.name])
+        for fld in dataclasses.fields(cls)
+        if isinstance(hints[fld.name], type)
+        and issubclass(hints[fld.name], LazyChildren)
+    ]
+
+
+def deserialize_lazily(cls: Type[T], data: Any) -> T:
+    """
+    Deserialize ``data`` to ``cls``, deferring the children of the groups
+    found at the top level of ``data``.
+
+    Groups (`LazyChildren` subclasses) are found where ``cls`` is a group, in
+    the fields of a dataclass ``cls`` (e.g., the root of a file), or in a list
+    of tagged union values (e.g., the children of a group).  The children of
+    each are only deserialized - by way of this function, one level at a
+    time - when first accessed.  Errors in deferred children are raised on
+    access, accordingly.
+
+    Parameters
+    ----------
+    cls : type
+        The type to deserialize to.
+    data : Any
+        The serialized data.  This is not modified.
+
+    Returns
+    -------
+    T
+        The deserialized object.
+    """
+    # Where to find each group in the deserialized object, and its children
+    deferred: List[Tuple[Any, Any]] = []
+    if isinstance(data, dict) and isinstance(cls, type):
+        if issubclass(cls, LazyChildren):
+            data, children = _defer_children(cls, data)
+            if children is not None:
+                deferred.append(((), children))
+        else:
+            data = dict(data)
+            for name, lazy_cls in _get_lazy_fields(cls):
+                if name not in data:
+                    continue
+                data[name], children = _defer_children(lazy_cls, data[name])
+                if children is not None:
+                    deferred.append(((name, ), children))
+    elif isinstance(data, list):
+        data = list(data)
+        for idx, item in enumerate(data):
+            if not isinstance(item, dict) or len(item) != 1:
+                continue
+            ((tag, fields),) = item.items()
+            lazy_cls = _lazy_classes.get(tag)
+            if lazy_cls is None:
+                continue
+            fields, children = _defer_children(lazy_cls, fields)
+            if children is not None:
+                data[idx] = {tag: fields}
+                deferred.append(((idx, ), children))
+
+    with gc_paused():
+        obj = get_deserializer(cls)(data)
+
+    for path, children in deferred:
+        group = obj
+        for key in path:
+            group = group[key] if isinstance(key, int) else getattr(group, key)
+        state = group.__dict__
+        state.pop(group._lazy_field, None)
+        state[_PENDING_CHILDREN] = children
+    return obj
+
+
+def get_structural_hash(obj: Any, exclude: Sequence[str] = ()) -> str:
+    """
+    Get a hash of the serialized form of a dataclass instance.
+
+    Two instances with the same settings have the same hash, so this can be
+    used to detect edits made since the hash was taken.
+
+    Parameters
+    ----------
+    obj : Any
+        The dataclass instance.
+    exclude : Sequence[str], optional
+        Names of fields to leave out of the hash, e.g. the children of a group
+        when only the settings of the group itself are of interest.  These
+        fields must have default values.
+
+    Returns
+    -------
+    str
+        The hex digest of the hash.
+    """
+    if exclude:
+        obj = copy.copy(obj)
+        for fld in dataclasses.fields(obj):
+            if fld.name not in exclude:
+                continue
+            if fld.default_factory is not dataclasses.MISSING:
+                setattr(obj, fld.name, fld.default_factory())
+            else:
+                setattr(obj, fld.name, fld.default)
+
+    serialized = serialize(type(obj), obj)
+    for name in exclude:
+        serialized.pop(name, None)
+
+    encoded = json.dumps(serialized, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()
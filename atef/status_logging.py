@@ -3,9 +3,6 @@ import tempfile
 from typing import Dict, Optional
 from uuid import UUID
 
-from qtpy.QtCore import QObject
-from qtpy.QtCore import Signal as QSignal
-
 TempfileCache = Dict[UUID, tempfile._TemporaryFileWrapper]
 
 STATUS_OUTPUT_TEMPFILE_CACHE: Optional[TempfileCache] = None
@@ -58,26 +55,10 @@ def cleanup_status_logger(uuid: UUID):
     temp_logging_file.close()
 
 
-class QtLoggingStream(QObject):
-    """QObject handler to emit logging messages to the Qt main thread"""
-    new_message = QSignal(str)
-
-    def write(self, message: str):
-        self.new_message.emit(message)
-
-    def flush(self):
-        ...
-
-
-class QtLogHandler(logging.Handler):
-    """
-    Logging handler that writes to Qt Stream object
-    """
-    def __init__(self, stream: QtLoggingStream, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.setFormatter(_SIMPLE_FORMATTER)
-        self.stream = stream
-
-    def emit(self, record: logging.LogRecord):
-        msg = self.format(record)
-        self.stream.write(msg)
+def __getattr__(name: str):
+    # The Qt logging classes live with the status log widgets, so that
+    # headless checkouts do not import Qt
+    if name in ("QtLoggingStream", "QtLogHandler"):
+        from atef.widgets.config import status_log_viewer
+        return getattr(status_log_viewer, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
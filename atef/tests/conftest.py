@@ -4,7 +4,7 @@ import json
 import pathlib
 import tempfile
 from functools import partial
-from typing import Any, Dict, List, Optional, get_args
+from typing import Any, Dict, List, Optional, Tuple, get_args
 
 import happi
 import ophyd
@@ -85,39 +85,86 @@ class MockEpicsArch:
 
     default_value : ArchivedValue, optional
         If provided, PVs not in the database will be assigned this value.
+
+    history : Dict[str, List[ArchivedValue]], optional
+        Dictionary of pv name to time-ordered ArchivedValues.  Takes
+        precedence over ``database``.
     """
 
     database: Dict[str, ArchivedValue]
     default_value: Optional[ArchivedValue]
+    history: Dict[str, List[ArchivedValue]]
+    #: The PV names and timestamp of each get_snapshot call.
+    snapshot_requests: List[Tuple[Tuple[str, ...], datetime.datetime]]
+    #: The PV (or operator) of each get_raw call.
+    raw_requests: List[str]
 
     def __init__(
         self,
         database: Dict[str, ArchivedValue],
         default_value: Optional[ArchivedValue] = None,
+        history: Optional[Dict[str, List[ArchivedValue]]] = None,
     ):
         self.database = database
         self.default_value = default_value
+        self.history = history or {}
+        self.snapshot_requests = []
+        self.raw_requests = []
+        # Stands in for archapp.EpicsArchive._data as well
+        self._data = self
+
+    def get_value(
+        self, pv: str, at: datetime.datetime
+    ) -> Optional[ArchivedValue]:
+        if pv in self.history:
+            values = [
+                value for value in self.history[pv] if value.timestamp <= at
+            ]
+            return values[-1] if values else None
+        return self.database.get(pv, self.default_value)
 
     def get_snapshot(
         self, *pvnames: str, at: datetime.datetime
     ) -> Dict[str, Dict[str, Any]]:
+        self.snapshot_requests.append((pvnames, at))
         result = {}
         for pv in pvnames:
-            value = self.database.get(pv, self.default_value)
+            value = self.get_value(pv, at)
             if value is not None:
                 result[pv] = value.to_archapp()
 
         return result
 
+    def get_raw(
+        self,
+        pv: str,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        chunk: bool = False,
+    ) -> Dict[str, Any]:
+        self.raw_requests.append(pv)
+        if pv.endswith(")"):
+            # Binning operator; the data is returned as-is
+            pv = pv[pv.index("(") + 1:-1]
+        points = [
+            value.to_archapp() for value in self.history.get(pv, [])
+            if start <= value.timestamp <= end
+        ]
+        if not points:
+            return {}
+        return {"meta": {"name": pv}, "data": points}
+
     @contextlib.contextmanager
     def use(self):
         helper = ArchiverHelper.instance()
         orig = helper.appliances
         helper.appliances = [self]
+        helper.clear_cache()
         try:
             yield
         finally:
             helper.appliances = orig
+            helper.clear_cache()
 
 
 @pytest.fixture(scope='session', autouse=True)
@@ -140,6 +187,15 @@ def ophyd_setup_teardown():
     ophyd_cleanup()
 
 
+@pytest.fixture(scope='session', autouse=True)
+def ui_cache(tmp_path_factory):
+    """Compile designer forms into a temporary cache, not the user's"""
+    with pytest.MonkeyPatch.context() as mpatch:
+        cache_path = tmp_path_factory.mktemp('ui_cache')
+        mpatch.setenv('ATEF_UI_CACHE', str(cache_path))
+        yield cache_path
+
+
 @pytest.fixture(scope='function', autouse=True)
 def non_interactive_qt_application(monkeypatch):
     monkeypatch.setattr(QtWidgets.QApplication, 'exec_', lambda x: 1)
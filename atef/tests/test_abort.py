@@ -1,4 +1,4 @@
-from asyncio import Task
+from concurrent.futures import Future
 from functools import partial
 from typing import Callable
 
@@ -14,7 +14,7 @@ from atef.widgets.config.window import DualTree
 
 
 def assert_task_running(tree: DualTree, is_running: bool = True):
-    assert (isinstance(tree.running_task, Task)
+    assert (isinstance(tree.running_task, Future)
             and tree.running_task.done() != is_running)
 
 
@@ -0,0 +1,111 @@
+import datetime
+import pathlib
+
+import pytest
+
+from ..archive_device import ArchivedValue, ArchiverHelper
+from ..archive_server import DATA_PATH, SNAPSHOT_PATH, LocalArchiver
+from ..scripts.archive_benchmark_main import main as benchmark_main
+
+START = datetime.datetime(2023, 5, 1)
+
+
+def sample(pvname: str, value: float, seconds: float) -> ArchivedValue:
+    return ArchivedValue(
+        pvname=pvname,
+        value=value,
+        timestamp=START + datetime.timedelta(seconds=seconds),
+        status=0,
+        severity=0,
+    )
+
+
+@pytest.fixture
+def local_archiver():
+    archiver = LocalArchiver()
+    archiver.add_values(
+        [sample("PV:A", float(idx), 10 * idx) for idx in range(10)],
+        meta={"EGU": "mm"},
+    )
+    archiver.add_values([sample("PV:B", 5.0, 0)])
+    with archiver:
+        yield archiver
+
+
+def test_local_archiver_snapshot(local_archiver: LocalArchiver):
+    appliance = local_archiver.get_appliance()
+    at = START + datetime.timedelta(seconds=25)
+    event = appliance.get_snapshot("PV:A", "PV:B", "PV:C", at=at)
+    assert set(event) == {"PV:A", "PV:B"}
+    value = ArchivedValue.from_archapp("PV:A", appliance, **event["PV:A"])
+    assert value.value == 2.0
+    assert value.timestamp == START + datetime.timedelta(seconds=20)
+    assert local_archiver.get_request_count(SNAPSHOT_PATH) == 1
+
+
+def test_local_archiver_data(local_archiver: LocalArchiver):
+    appliance = local_archiver.get_appliance()
+    data = appliance._data.get_raw(
+        "PV:A",
+        START + datetime.timedelta(seconds=15),
+        START + datetime.timedelta(seconds=40),
+    )
+    assert data["meta"] == {"name": "PV:A", "EGU": "mm"}
+    # Led by the value in effect at the start
+    assert [point["val"] for point in data["data"]] == [1.0, 2.0, 3.0, 4.0]
+
+    binned = appliance._data.get_raw(
+        "mean_20(PV:A)", START, START + datetime.timedelta(seconds=59)
+    )
+    assert [point["val"] for point in binned["data"]] == [0.5, 2.5, 4.5]
+    # Bins are aligned to the epoch, not the start, and stamped mid-bin
+    binned = appliance._data.get_raw(
+        "lastFill_20(PV:A)",
+        START + datetime.timedelta(seconds=15),
+        START + datetime.timedelta(seconds=40),
+    )
+    assert [
+        (point["secs"] - START.timestamp(), point["val"])
+        for point in binned["data"]
+    ] == [(10, 1.0), (30, 3.0), (50, 4.0)]
+
+    assert appliance._data.get_raw("PV:C", START, START) == {}
+    assert appliance.search("PV:*", do_print=False) == ["PV:A", "PV:B"]
+    assert local_archiver.get_request_count(DATA_PATH) == 4
+
+
+def test_local_archiver_helper(local_archiver: LocalArchiver):
+    helper = ArchiverHelper.instance()
+    at = START + datetime.timedelta(seconds=35)
+    with local_archiver.use():
+        data = helper.get_pvs_at_time("PV:A", "PV:B", dt=at)
+        assert data["PV:A"].value == 3.0
+        assert data["PV:B"].value == 5.0
+        history = helper.get_pv_history(
+            "PV:A", START, START + datetime.timedelta(seconds=90)
+        )
+        assert [value.value for value in history] == [float(v) for v in range(10)]
+
+        helper.statistics.cache_hits = helper.statistics.cache_misses = 0
+        helper.get_pvs_at_time("PV:A", dt=START + datetime.timedelta(seconds=45))
+        assert helper.statistics.hit_rate == 1.0
+
+
+def test_local_archiver_recording(
+    local_archiver: LocalArchiver, tmp_path: pathlib.Path
+):
+    local_archiver.save(tmp_path / "recording.json")
+    loaded = LocalArchiver()
+    loaded.load(tmp_path / "recording.json")
+    assert loaded.pvs == local_archiver.pvs
+    assert loaded.get_time_range() == (
+        START, START + datetime.timedelta(seconds=90)
+    )
+
+
+def test_archive_benchmark_smoke():
+    results = benchmark_main(num_pvs=5, duration=0.1, period=1.0, num_timestamps=3)
+    by_name = {result.name: result for result in results}
+    assert by_name["snapshot (cold)"].count == 15
+    assert by_name["snapshot (warm)"].requests == 0
+    assert by_name["snapshot (warm)"].hit_rate == 1.0
@@ -1,11 +1,30 @@
+import dataclasses
 import datetime
+import pathlib
+import threading
+import urllib.error
+from typing import Any
 
+import happi
+import ophyd
 import pcdsdevices
 import pcdsdevices.attenuator
 import pcdsdevices.tests.conftest
 import pytest
+from ophyd import Component as Cpt
+from ophyd import Device, EpicsSignal, EpicsSignalRO
+from ophyd import FormattedComponent as FCpt
 
-from ..archive_device import ArchivedValue, make_archived_device
+from ..archive_checkout import (bisect_archived_file, get_prepared_pvnames,
+                                prepare_archived_file, sweep_archived_file)
+from ..archive_device import (ArchivedValue, ArchivedValueStore, ArchiverHelper,
+                              get_expected_pvnames, load_archived_device,
+                              make_archived_device)
+from ..archive_server import DATA_PATH, SNAPSHOT_PATH, LocalArchiver
+from ..check import Equals
+from ..config_model.passive import (ConfigurationFile, ConfigurationGroup,
+                                    DeviceConfiguration, PVConfiguration)
+from ..enums import Severity
 from . import conftest
 
 # skip these devices, subclassing is too involved to be automated
@@ -84,3 +103,399 @@ def test_at1l0():
             print(f"{attr} = {value}")
 
         print("Get", at1l0.get())
+
+
+class LazyAxis(Device):
+    readback = Cpt(EpicsSignalRO, ":RBV", lazy=True)
+    setpoint = Cpt(EpicsSignal, ":RBV", write_pv=":SET")
+
+
+class TwoAxes(Device):
+    first = Cpt(LazyAxis, ":A")
+    second = Cpt(LazyAxis, ":B", lazy=True)
+    formatted = FCpt(EpicsSignalRO, "{self.prefix}:FMT")
+
+
+def test_archived_device_single_query():
+    cls = make_archived_device(TwoAxes)
+    # Formatted components are left to instantiation
+    assert get_expected_pvnames(cls, "P") == [
+        "P:A:RBV", "P:A:SET", "P:B:RBV", "P:B:SET",
+    ]
+
+    dt = datetime.datetime(2023, 5, 1)
+    archiver = conftest.MockEpicsArch({}, default_value=archived_value("P", 1))
+    with archiver.use():
+        device = cls("P", name="device", archive_timestamp=dt)
+        assert archiver.snapshot_requests == [
+            (("P:A:RBV", "P:A:SET", "P:B:RBV", "P:B:SET", "P:FMT"), dt)
+        ]
+        # Lazy components are found in the cache
+        assert device.second.readback.get() == 1
+        assert len(archiver.snapshot_requests) == 1
+
+        # Components referencing the same PV share its archived data
+        first = device.first
+        assert first.readback._read_pv is not first.setpoint._read_pv
+        assert first.readback._read_pv._state is first.setpoint._read_pv._state
+        assert len(archiver.snapshot_requests) == 1
+
+
+def archived_value(pvname: str, value: Any) -> ArchivedValue:
+    return ArchivedValue(
+        pvname=pvname,
+        value=value,
+        timestamp=datetime.datetime(2023, 5, 1),
+        status=0,
+        severity=0,
+    )
+
+
+def test_archived_value_store_lookup():
+    store = ArchivedValueStore(pvname="pv", appliance=None)
+    first = archived_value("pv", 1)
+    second = dataclasses.replace(first, value=2, timestamp=datetime.datetime(2023, 5, 2))
+    # The archiver responded with ``first`` as the value one hour later
+    assert store.add(first, first.timestamp + datetime.timedelta(hours=1)) == 1
+    assert store.get(first.timestamp) == first
+    assert store.get(first.timestamp + datetime.timedelta(minutes=30)) == first
+    assert store.get(first.timestamp + datetime.timedelta(hours=2)) is None
+    assert store.get(first.timestamp - datetime.timedelta(hours=1)) is None
+    # Re-adding a known sample does not duplicate it
+    assert store.add(first, first.timestamp) == 0
+    assert len(store) == 1
+
+    assert store.add_history([second, first], datetime.datetime(2023, 5, 3)) == 1
+    assert store.get(datetime.datetime(2023, 5, 1, 12)) == first
+    assert store.get(second.timestamp) == second
+    assert store.get(datetime.datetime(2023, 5, 2, 12)) == second
+    assert store.get(datetime.datetime(2023, 5, 4)) is None
+
+
+def test_archiver_cache_eviction(monkeypatch):
+    helper = ArchiverHelper.instance()
+    monkeypatch.setattr(ArchiverHelper, "max_cached_values", 3)
+    helper.clear_cache()
+    try:
+        start = datetime.datetime(2023, 5, 1)
+        for pvname in ("a", "b", "c"):
+            helper.add_to_cache(pvname, archived_value(pvname, 0), start)
+        # Using "a" makes "b" the least recently used
+        assert helper.get_cached_value("a", start) is not None
+        helper.add_to_cache("d", archived_value("d", 0), start)
+        assert list(helper.cache) == ["c", "a", "d"]
+
+        # A single PV over the limit keeps its newest values
+        values = [
+            dataclasses.replace(
+                archived_value("e", idx),
+                timestamp=start + datetime.timedelta(seconds=idx),
+            )
+            for idx in range(5)
+        ]
+        helper.add_history_to_cache("e", values, values[-1].timestamp)
+        assert list(helper.cache) == ["e"]
+        assert helper.cache["e"].values == values[-3:]
+    finally:
+        helper.clear_cache()
+
+
+class FailingEpicsArch(conftest.MockEpicsArch):
+    """An appliance which fails requests at ``fail_at``."""
+    def __init__(self, *args, fail_at: datetime.datetime, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_at = fail_at
+
+    def get_snapshot(self, *pvnames, at):
+        if at == self.fail_at:
+            raise urllib.error.URLError("appliance unavailable")
+        return super().get_snapshot(*pvnames, at=at)
+
+
+@pytest.fixture
+def two_archivers(monkeypatch):
+    helper = ArchiverHelper.instance()
+    first = FailingEpicsArch(
+        {"A": archived_value("A", 1)}, fail_at=datetime.datetime(2023, 5, 4)
+    )
+    second = conftest.MockEpicsArch({"B": archived_value("B", 2)})
+    monkeypatch.setattr(helper, "appliances", [first, second])
+    helper.clear_cache()
+    yield first, second
+    helper.clear_cache()
+
+
+def test_get_pvs_at_times(two_archivers):
+    first, second = two_archivers
+    helper = ArchiverHelper.instance()
+    dt1 = datetime.datetime(2023, 5, 2)
+    dt2 = datetime.datetime(2023, 5, 3)
+    failing = datetime.datetime(2023, 5, 4)
+    errors = {}
+    data = helper.get_pvs_at_times(
+        {dt1: ["A", "B", "C"], dt2: ["A"], failing: ["A"]}, errors=errors
+    )
+    assert list(errors) == [failing]
+    assert set(data) == {dt1, dt2}
+    assert data[dt1]["A"].value == data[dt2]["A"].value == 1
+    assert data[dt1]["B"].value == 2
+    assert data[dt1]["C"].severity == 3
+    # One query per timestamp, searching the second only for what's left
+    assert sorted(first.snapshot_requests) == [
+        (("A",), dt2), (("A", "B", "C"), dt1),
+    ]
+    assert second.snapshot_requests == [(("B", "C"), dt1)]
+
+    # Known PVs go straight to their appliance
+    dt3 = datetime.datetime(2023, 5, 5)
+    helper.get_pvs_at_times({dt3: ["A", "B"]})
+    assert first.snapshot_requests[-1] == (("A",), dt3)
+    assert second.snapshot_requests[-1] == (("B",), dt3)
+
+    # "A" at ``failing`` is now known from the cache; "C" is not
+    with pytest.raises(urllib.error.URLError):
+        helper.get_pvs_at_times({failing: ["A", "C"]})
+
+
+def test_queue_pv_batches(two_archivers, monkeypatch):
+    first, _ = two_archivers
+    helper = ArchiverHelper.instance()
+    monkeypatch.setattr(ArchiverHelper, "batch_delay", 0.1)
+    dt1 = datetime.datetime(2023, 5, 2)
+    dt2 = datetime.datetime(2023, 5, 3)
+    received = []
+    done = threading.Event()
+
+    def callback(value: ArchivedValue):
+        received.append(value)
+        if len(received) == 6:
+            done.set()
+
+    for dt in (dt1, dt2):
+        for pvname in ("A", "A", "B"):
+            helper.queue_pv(pvname, dt, callback)
+
+    assert done.wait(timeout=5.0)
+    assert sorted(value.pvname for value in received) == ["A"] * 4 + ["B"] * 2
+    # Requests queued together are coalesced into one query per timestamp
+    assert sorted(first.snapshot_requests) == [
+        (("A", "B"), dt1), (("A", "B"), dt2),
+    ]
+
+
+@pytest.fixture
+def archived_motor_client(tmp_path: pathlib.Path) -> happi.Client:
+    db_path = tmp_path / "db.json"
+    db_path.write_text("{}")
+    client = happi.Client(database=happi.backends.json_db.JSONBackend(db_path))
+    client.add_item(
+        happi.OphydItem(
+            name="arch_motor",
+            device_class="ophyd.EpicsMotor",
+            prefix="ARCH:MTR",
+            args=[],
+            kwargs={"name": "{{name}}", "prefix": "{{prefix}}"},
+        )
+    )
+    return client
+
+
+def test_load_archived_device(archived_motor_client: happi.Client):
+    """Pass if happi fills in the arguments, leaving its device cache alone"""
+    # Not the time of test_archived_checkout, which would see cached misses
+    dt = datetime.datetime(2023, 4, 1, 12)
+    item = archived_motor_client["arch_motor"].item
+    live = happi.loader.from_container(item, use_cache=False)
+    try:
+        device = load_archived_device(item, dt)
+        assert happi.loader.cache["arch_motor"] is live
+    finally:
+        happi.loader.cache.pop("arch_motor", None)
+
+    assert isinstance(device, ophyd.EpicsMotor)
+    assert device.archive_timestamp == dt
+    assert (device.name, device.prefix) == (live.name, live.prefix)
+    assert device.user_readback.pvname == live.user_readback.pvname
+    assert device.md is item
+
+    device = load_archived_device(item, dt)
+    assert "arch_motor" not in happi.loader.cache
+
+
+@pytest.mark.asyncio
+async def test_archived_checkout(archived_motor_client: happi.Client):
+    dt = datetime.datetime(2023, 5, 1, 12)
+    file = ConfigurationFile(
+        root=ConfigurationGroup(
+            configs=[
+                PVConfiguration(
+                    by_pv={
+                        "ARCH:PV1": [Equals(value=1)],
+                        "ARCH:PV2": [Equals(value=1)],
+                    },
+                ),
+                DeviceConfiguration(
+                    devices=["arch_motor"],
+                    by_attr={"user_readback": [Equals(value=1)]},
+                ),
+            ]
+        )
+    )
+    archiver = conftest.MockEpicsArch(
+        {
+            "ARCH:PV1": archived_value("ARCH:PV1", 1),
+            "ARCH:PV2": archived_value("ARCH:PV2", 2),
+            "ARCH:MTR.RBV": archived_value("ARCH:MTR.RBV", 1),
+        },
+        default_value=archived_value("default", 0),
+    )
+    with archiver.use():
+        prepared = prepare_archived_file(file, dt, client=archived_motor_client)
+        # Every PV of the checkout is requested at once
+        ((pvnames, at),) = archiver.snapshot_requests
+        assert at == dt
+        assert {"ARCH:PV1", "ARCH:PV2", "ARCH:MTR.RBV"} < set(pvnames)
+        assert sorted(pvnames) == get_prepared_pvnames(prepared)
+
+        await prepared.compare()
+
+    assert len(archiver.snapshot_requests) == 1
+    results = {
+        comparison.identifier: comparison.result.severity
+        for comparison in prepared.walk_comparisons()
+    }
+    assert results == {
+        "ARCH:PV1": Severity.success,
+        "ARCH:PV2": Severity.error,
+        "arch_motor.user_readback": Severity.success,
+    }
+
+
+@pytest.mark.parametrize("stamp_offset", [0, 30, 59])
+def test_binned_history_bin_end(stamp_offset: int):
+    """Pass if binned values apply from the end of their bin, however stamped"""
+    # Bins are aligned to multiples of the bin size since the epoch
+    bin_start = datetime.datetime.fromtimestamp(1_700_000_040)
+    archiver = conftest.MockEpicsArch(
+        {},
+        history={
+            "ARCH:BINNED": [
+                ArchivedValue(
+                    pvname="ARCH:BINNED",
+                    value=idx,
+                    timestamp=(
+                        bin_start
+                        + datetime.timedelta(seconds=60 * idx + stamp_offset)
+                    ),
+                    status=0,
+                    severity=0,
+                )
+                for idx in range(3)
+            ]
+        },
+    )
+    with archiver.use():
+        history = ArchiverHelper.instance().get_pv_history(
+            "ARCH:BINNED",
+            bin_start,
+            bin_start + datetime.timedelta(minutes=5),
+            bin_size=60,
+        )
+
+    assert archiver.raw_requests == ["lastFill_60(ARCH:BINNED)"]
+    assert [value.timestamp for value in history] == [
+        bin_start + datetime.timedelta(minutes=idx) for idx in (1, 2, 3)
+    ]
+
+
+@pytest.fixture
+def sweep_archiver() -> conftest.MockEpicsArch:
+    t0 = datetime.datetime(2023, 6, 1)
+    history = [
+        (0, 1),
+        (10, 1),
+        (30, 5),
+        (50, 1),
+    ]
+    return conftest.MockEpicsArch(
+        {},
+        history={
+            "ARCH:SWEEP": [
+                ArchivedValue(
+                    pvname="ARCH:SWEEP",
+                    value=value,
+                    timestamp=t0 + datetime.timedelta(minutes=minutes),
+                    status=0,
+                    severity=0,
+                )
+                for minutes, value in history
+            ]
+        },
+    )
+
+
+def sweep_config() -> ConfigurationFile:
+    return ConfigurationFile(
+        root=ConfigurationGroup(
+            configs=[PVConfiguration(by_pv={"ARCH:SWEEP": [Equals(value=1)]})]
+        )
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("binned", [True, False])
+async def test_sweep_archived_file(
+    sweep_archiver: conftest.MockEpicsArch, binned: bool
+):
+    t0 = datetime.datetime(2023, 6, 1)
+    # The mock archiver ignores binning operators, so bin for real
+    local_archiver = LocalArchiver()
+    local_archiver.add_values(list(sweep_archiver.history["ARCH:SWEEP"]))
+    with local_archiver, local_archiver.use():
+        (timeline,) = await sweep_archived_file(
+            sweep_config(),
+            start=t0 + datetime.timedelta(minutes=1),
+            end=t0 + datetime.timedelta(minutes=60),
+            step=datetime.timedelta(minutes=5),
+            binned=binned,
+        )
+
+    # One history query, rather than a snapshot per time
+    assert local_archiver.get_request_count(DATA_PATH) == 1
+    assert local_archiver.get_request_count(SNAPSHOT_PATH) == 1
+    assert timeline.identifier == "ARCH:SWEEP"
+    assert len(timeline.timestamps) == 12
+    failed = [
+        timestamp for timestamp, severity
+        in zip(timeline.timestamps, timeline.severities)
+        if severity == Severity.error
+    ]
+    # Binned changes (at 30 and 50 minutes) apply from the end of their
+    # 5-minute bin, rather than when sampled
+    failing_minutes = (36, 41, 46, 51) if binned else (31, 36, 41, 46)
+    assert failed == [
+        t0 + datetime.timedelta(minutes=minutes) for minutes in failing_minutes
+    ]
+    assert timeline.first_failure() == failed[0]
+    assert not timeline.passed
+
+
+@pytest.mark.asyncio
+async def test_bisect_archived_file(sweep_archiver: conftest.MockEpicsArch):
+    t0 = datetime.datetime(2023, 6, 1)
+    with sweep_archiver.use():
+        first_failure, failing = await bisect_archived_file(
+            sweep_config(),
+            start=t0 + datetime.timedelta(minutes=2),
+            end=t0 + datetime.timedelta(minutes=40),
+            resolution=datetime.timedelta(seconds=10),
+        )
+
+    assert [comparison.identifier for comparison in failing] == ["ARCH:SWEEP"]
+    assert (
+        t0 + datetime.timedelta(minutes=30)
+        <= first_failure
+        < t0 + datetime.timedelta(minutes=30, seconds=10)
+    )
+    # log2(38 min / 10 s) ~ 8 probes, plus the start and end
+    assert len(sweep_archiver.snapshot_requests) <= 11
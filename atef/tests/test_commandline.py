@@ -1,3 +1,5 @@
+import datetime
+import subprocess
 import sys
 
 import happi
@@ -7,7 +9,8 @@ import atef.bin.main as atef_main
 from atef.bin import check_main as bin_check
 
 from .. import util
-from .conftest import CONFIG_PATH
+from ..archive_device import ArchivedValue
+from .conftest import CONFIG_PATH, MockEpicsArch
 from .test_comparison_device import at2l0, mock_signal_cache  # noqa: F401
 
 
@@ -24,6 +27,60 @@ def test_help_module(monkeypatch, subcommand):
         atef_main.main()
 
 
+# Packages that must not be imported just to build the command line parser
+HEAVY_PACKAGES = {
+    'PyQt5', 'PySide2', 'qtpy', 'pydm', 'reportlab', 'bluesky', 'databroker',
+    'ophyd', 'happi', 'asyncio',
+}
+
+
+@pytest.mark.parametrize('argv, allowed', [
+    (['--help'], set()),
+    (['check', '--help'], set()),
+    (['scripts', '--help'], set()),
+    (['config', '--help'], {'PyQt5', 'PySide2', 'qtpy'}),
+])
+def test_import_budget(argv, allowed):
+    """Pass if only the selected subcommand and its needs are imported"""
+    code = '\n'.join((
+        'import sys',
+        'import atef.bin.main',
+        f'sys.argv = ["atef", *{argv!r}]',
+        'try:',
+        '    atef.bin.main.main()',
+        'except SystemExit:',
+        '    pass',
+        'print(",".join(sorted(set(mod.split(".")[0] for mod in sys.modules))))',
+    ))
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True
+    )
+    imported = set(result.stdout.strip().splitlines()[-1].split(','))
+    assert imported & HEAVY_PACKAGES <= allowed
+
+
+@pytest.mark.parametrize('module', [
+    'atef.config_model',
+    'atef.config_model.passive',
+    'atef.bin.check_main',
+])
+def test_headless_imports(module):
+    """Pass if passive checkouts can run without plan, report or Qt packages"""
+    code = '\n'.join((
+        'import sys',
+        f'import {module}',
+        'print(",".join(sorted(set(mod.split(".")[0] for mod in sys.modules))))',
+    ))
+    result = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True
+    )
+    imported = set(result.stdout.strip().splitlines()[-1].split(','))
+    assert not imported & {
+        'PyQt5', 'PySide2', 'qtpy', 'reportlab', 'bluesky',
+        'bluesky_queueserver', 'databroker', 'pandas',
+    }
+
+
 @pytest.mark.asyncio
 async def test_check_pv_smoke(mock_signal_cache):  # noqa: F811
     await bin_check.main(
@@ -32,6 +89,25 @@ async def test_check_pv_smoke(mock_signal_cache):  # noqa: F811
     )
 
 
+@pytest.mark.asyncio
+async def test_check_pv_archived_smoke():
+    default_value = ArchivedValue(
+        pvname="pvname",
+        value=1,
+        timestamp=datetime.datetime(2023, 1, 1),
+        status=0,
+        severity=0,
+    )
+    archiver = MockEpicsArch({}, default_value)
+    with archiver.use():
+        await bin_check.main(
+            filename=str(CONFIG_PATH / "pv_based.yml"),
+            archive_time=datetime.datetime(2023, 1, 1, 12),
+            cleanup=False,
+        )
+    assert len(archiver.snapshot_requests) == 1
+
+
 @pytest.mark.asyncio
 async def test_check_device_smoke(monkeypatch, at2l0):  # noqa: F811
     def get_happi_device_by_name(name, client=None):
@@ -46,3 +122,12 @@ async def test_check_device_smoke(monkeypatch, at2l0):  # noqa: F811
 async def test_check_ping_localhost_smoke():  # noqa: F811
     await bin_check.main(filename=str(CONFIG_PATH / "ping_localhost.json"),
                          cleanup=False)
+
+
+@pytest.mark.asyncio
+async def test_check_pv_governed_smoke(mock_signal_cache):  # noqa: F811
+    await bin_check.main(
+        filename=str(CONFIG_PATH / "pv_based.yml"), signal_cache=mock_signal_cache,
+        cleanup=False, parallel=True, max_reads=2, max_read_rate=1000.0,
+        max_reads_per_host=1, max_read_rate_per_host=1000.0,
+    )
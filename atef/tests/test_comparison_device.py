@@ -1,19 +1,25 @@
+import asyncio
+import io
 from typing import Dict, List, Optional, Tuple
 
 import apischema
 import ophyd
 import ophyd.sim
 import pytest
+import rich.console
 
 from .. import cache, check, reduce, util
+from ..bin import check_main
 from ..check import Comparison, Severity
 from ..config_model.passive import (ConfigurationFile, ConfigurationGroup,
                                     DeviceConfiguration,
                                     PreparedDeviceConfiguration, PreparedFile,
-                                    PreparedPVConfiguration, PVConfiguration,
+                                    PreparedPVConfiguration,
+                                    PreparedSignalComparison, PVConfiguration,
                                     get_result_from_comparison)
+from ..enums import GroupResultMode
 from ..exceptions import PreparedComparisonException
-from ..result import Result
+from ..result import Result, incomplete_result, skipped_result
 
 
 async def check_device(
@@ -482,3 +488,228 @@ def test_bad_device_in_file(monkeypatch):
     assert len(prepared.root.configs) == 1
     assert isinstance(prepared.root.configs[0], PreparedDeviceConfiguration)
     assert prepared.root.configs[0].devices == [my_device]
+
+
+class ShortCircuitDevice(ophyd.Device):
+    value = ophyd.Component(ophyd.Signal, value=1)
+
+
+@pytest.fixture
+def short_circuit_file(monkeypatch) -> ConfigurationFile:
+    devices = {}
+
+    def get_by_name(name: str, *, client=None):
+        return devices.setdefault(name, ShortCircuitDevice(name=name))
+
+    monkeypatch.setattr(util, "get_happi_device_by_name", get_by_name)
+
+    file = ConfigurationFile()
+    file.root.short_circuit = True
+    file.root.configs = [
+        DeviceConfiguration(
+            name="quick",
+            devices=["dev1"],
+            by_attr={"value": [check.Equals(value=0), check.Equals(value=1)]},
+        ),
+        ConfigurationGroup(
+            name="slow",
+            configs=[
+                DeviceConfiguration(
+                    devices=["dev2"],
+                    by_attr={
+                        "value": [check.Equals(value=1, reduce_period=5.0)],
+                    },
+                ),
+            ],
+        ),
+    ]
+    return file
+
+
+@pytest.mark.asyncio
+async def test_short_circuit_all(short_circuit_file: ConfigurationFile):
+    prepared = PreparedFile.from_config(short_circuit_file, client=object())
+    tasks = await prepared.fill_cache()
+    result = await asyncio.wait_for(prepared.compare(), timeout=2.0)
+    assert result.severity == Severity.error
+
+    quick, slow = prepared.root.configs
+    failed, skipped_comparison = quick.comparisons
+    assert failed.result.severity == Severity.error
+    assert skipped_comparison.result == skipped_result()
+    assert slow.combined_result == skipped_result()
+    (slow_comparison,) = slow.walk_comparisons()
+    assert slow_comparison.result == skipped_result()
+
+    # The reduce_period acquisition was cancelled rather than waited for
+    await asyncio.sleep(0)
+    assert slow_comparison.cache_fill_task.cancelled()
+    assert prepared.root.result.severity == Severity.error
+    for task in tasks:
+        assert task.done()
+
+
+@pytest.mark.asyncio
+async def test_short_circuit_summary(short_circuit_file: ConfigurationFile):
+    """Pass if skipped items are told apart from incomplete ones"""
+    assert skipped_result().status == "skipped"
+    assert incomplete_result().status == "warning"
+    assert skipped_result() != incomplete_result()
+
+    prepared = PreparedFile.from_config(short_circuit_file, client=object())
+    await prepared.fill_cache()
+    await asyncio.wait_for(prepared.compare(), timeout=2.0)
+
+    console = rich.console.Console(file=io.StringIO(), width=200)
+    console.print(check_main.group_to_rich_tree(prepared.root))
+    summary = console.file.getvalue()
+    assert "Error: quick" in summary
+    assert "Skipped: slow" in summary
+    assert "group result already determined" in summary
+    assert "Warning" not in summary
+
+
+@pytest.mark.asyncio
+async def test_short_circuit_any(short_circuit_file: ConfigurationFile):
+    short_circuit_file.root.mode = GroupResultMode.any_
+    short_circuit_file.root.configs.reverse()
+    slow_group = short_circuit_file.root.configs[0]
+    slow_group.configs[0].by_attr["value"][0].reduce_period = None
+
+    prepared = PreparedFile.from_config(short_circuit_file, client=object())
+    await prepared.fill_cache()
+    result = await asyncio.wait_for(prepared.compare(), timeout=2.0)
+    assert result.severity == Severity.success
+
+    slow, quick = prepared.root.configs
+    assert slow.combined_result.severity == Severity.success
+    assert quick.combined_result == skipped_result()
+    assert all(
+        comparison.result == skipped_result()
+        for comparison in quick.comparisons
+    )
+    assert prepared.root.result.severity == Severity.success
+
+
+@pytest.mark.asyncio
+async def test_no_short_circuit(short_circuit_file: ConfigurationFile):
+    short_circuit_file.root.short_circuit = False
+    slow_group = short_circuit_file.root.configs[1]
+    slow_group.configs[0].by_attr["value"][0].reduce_period = 0.1
+
+    prepared = PreparedFile.from_config(short_circuit_file, client=object())
+    await prepared.fill_cache()
+    result = await prepared.compare()
+    assert result.severity == Severity.error
+    assert all(
+        comparison.result != skipped_result()
+        for comparison in prepared.walk_comparisons()
+    )
+
+
+@pytest.mark.asyncio
+async def test_cache_shared_acquisition_not_cancelled():
+    data_cache = cache.DataCache()
+    signal = ophyd.Signal(value=3, name="shared")
+    first = asyncio.create_task(
+        data_cache.get_signal_data(signal, reduce_period=0.2)
+    )
+    second = asyncio.create_task(
+        data_cache.get_signal_data(signal, reduce_period=0.2)
+    )
+    await asyncio.sleep(0.05)
+    first.cancel()
+    assert await second == 3
+    assert first.cancelled()
+
+    # Cancelling the only waiter drops the pending acquisition
+    lone = asyncio.create_task(
+        data_cache.get_signal_data(signal, reduce_period=0.2, string=True)
+    )
+    await asyncio.sleep(0.05)
+    lone.cancel()
+    await asyncio.sleep(0)
+    assert len(data_cache.signal_data[signal]) == 1
+
+
+@pytest.fixture
+def mixed_period_file(monkeypatch) -> ConfigurationFile:
+    devices = {}
+
+    def get_by_name(name: str, *, client=None):
+        return devices.setdefault(name, ShortCircuitDevice(name=name))
+
+    monkeypatch.setattr(util, "get_happi_device_by_name", get_by_name)
+
+    file = ConfigurationFile()
+    file.root.configs = [
+        DeviceConfiguration(
+            devices=[f"dev{idx}"],
+            by_attr={"value": [check.Equals(value=1, reduce_period=period)]},
+        )
+        for idx, period in enumerate([None, 0.1, None, 0.3, 0.2, None])
+    ]
+    return file
+
+
+@pytest.mark.asyncio
+async def test_fill_cache_longest_first(
+    monkeypatch, mixed_period_file: ConfigurationFile
+):
+    started = []
+    get_data_async = PreparedSignalComparison.get_data_async
+
+    async def record_get_data_async(self):
+        started.append(self.comparison.reduce_period)
+        return await get_data_async(self)
+
+    monkeypatch.setattr(
+        PreparedSignalComparison, "get_data_async", record_get_data_async
+    )
+    prepared = PreparedFile.from_config(mixed_period_file, client=object())
+    tasks = await prepared.fill_cache(max_concurrency=1)
+    await asyncio.gather(*tasks)
+    assert started == [0.3, 0.2, 0.1, None, None, None]
+
+
+@pytest.mark.asyncio
+async def test_fill_cache_overlaps_windows(mixed_period_file: ConfigurationFile):
+    prepared = PreparedFile.from_config(mixed_period_file, client=object())
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    tasks = await prepared.fill_cache()
+    await asyncio.gather(*tasks)
+    result = await prepared.compare()
+    assert result.severity == Severity.success
+    # Roughly the longest window rather than the sum of them
+    assert loop.time() - t0 < 0.55
+
+
+@pytest.mark.asyncio
+async def test_fill_cache_subscription_budget(
+    monkeypatch, mixed_period_file: ConfigurationFile
+):
+    running = {"windows": 0, "max_windows": 0, "quick_during_window": 0}
+    get_data_async = PreparedSignalComparison.get_data_async
+
+    async def record_get_data_async(self):
+        if self.comparison.reduce_period:
+            running["windows"] += 1
+            running["max_windows"] = max(running["windows"], running["max_windows"])
+            try:
+                return await get_data_async(self)
+            finally:
+                running["windows"] -= 1
+        if running["windows"]:
+            running["quick_during_window"] += 1
+        return await get_data_async(self)
+
+    monkeypatch.setattr(
+        PreparedSignalComparison, "get_data_async", record_get_data_async
+    )
+    prepared = PreparedFile.from_config(mixed_period_file, client=object())
+    tasks = await prepared.fill_cache(max_concurrency=2, max_subscriptions=1)
+    await asyncio.gather(*tasks)
+    assert running["max_windows"] == 1
+    # Quick reads are not held up behind the serialized windows
+    assert running["quick_during_window"] == 3
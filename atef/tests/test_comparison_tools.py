@@ -1,3 +1,5 @@
+import asyncio
+import socket
 import sys
 from dataclasses import dataclass
 from typing import Any, ClassVar, Dict, List, Optional, Tuple
@@ -87,6 +89,28 @@ config_and_severity = pytest.mark.parametrize(
 )
 
 
+@pytest.mark.parametrize(
+    "conf",
+    [
+        pytest.param(
+            ToolConfiguration(
+                tool=tools.PortCheck(
+                    targets=["127.0.0.1:5064", "[::1]:5075"],
+                    timeout=0.5,
+                ),
+                by_attr={
+                    "num_unreachable": [check.Equals(value=0)],
+                },
+            ),
+            id="port_check",
+        ),
+    ]
+)
+def test_port_check_serializable(conf: ToolConfiguration):
+    serialized = apischema.serialize(conf)
+    assert apischema.deserialize(ToolConfiguration, serialized) == conf
+
+
 @config_and_severity
 def test_serializable(conf: ToolConfiguration, severity: Severity):
     serialized = apischema.serialize(conf)
@@ -112,6 +136,10 @@ async def test_result_severity(
         (tools.Ping(), "max_time.abc", False),
         (tools.Ping(), "times.hostname", True),
         (tools.Ping(), "badkey", False),
+        (tools.PortCheck(), "max_time", True),
+        (tools.PortCheck(), "times.localhost:5064", True),
+        (tools.PortCheck(), "num_reachable.abc", False),
+        (tools.PortCheck(), "alive", False),
     ]
 )
 def test_result_keys(
@@ -215,3 +243,212 @@ def test_ping_regex(
 ):
     result = tools.PingResult.from_output("", output)
     assert abs(result.max_time - expected) < 1e-6
+
+
+@pytest.mark.asyncio
+async def test_ping_max_concurrency(monkeypatch: pytest.MonkeyPatch):
+    running = 0
+    max_running = 0
+
+    async def ping_subprocess(self, host: str) -> tools.PingResult:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(running, max_running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return tools.PingResult.from_times(host, [0.001])
+
+    monkeypatch.setattr(tools.Ping, "ping_subprocess", ping_subprocess)
+    tool = tools.Ping(hosts=[f"host{idx}" for idx in range(20)], max_concurrency=3)
+    result = await tool.run()
+    assert max_running == 3
+    assert result.num_alive == 20
+    assert result.alive == tool.hosts
+
+
+@pytest.mark.asyncio
+async def test_ping_cache_ttl(monkeypatch: pytest.MonkeyPatch):
+    calls = []
+
+    async def ping_subprocess(self, host: str) -> tools.PingResult:
+        calls.append(host)
+        return tools.PingResult.from_times(host, [0.001])
+
+    monkeypatch.setattr(tools.Ping, "ping_subprocess", ping_subprocess)
+    monkeypatch.setattr(tools.Ping, "_host_cache", {})
+
+    await tools.Ping(hosts=["a", "b"], cache_ttl=0.0).run()
+    await tools.Ping(hosts=["a", "b"], cache_ttl=0.0).run()
+    assert len(calls) == 4
+
+    calls.clear()
+    await tools.Ping(hosts=["a", "b"], cache_ttl=60.0).run()
+    await tools.Ping(hosts=["a", "b", "c"], cache_ttl=60.0).run()
+    assert calls == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_ping_in_process_fallback(monkeypatch: pytest.MonkeyPatch):
+    async def ping_socket(self, host: str) -> tools.PingResult:
+        raise PermissionError("not permitted")
+
+    async def ping_subprocess(self, host: str) -> tools.PingResult:
+        return tools.PingResult.from_times(host, [0.002])
+
+    monkeypatch.setattr(tools.Ping, "ping_socket", ping_socket)
+    monkeypatch.setattr(tools.Ping, "ping_subprocess", ping_subprocess)
+    monkeypatch.setattr(tools.Ping, "_socket_permitted", None)
+
+    result = await tools.Ping(hosts=["a"], in_process=True).run()
+    assert result.alive == ["a"]
+    assert tools.Ping._socket_permitted is False
+
+
+def test_ping_cache_eviction(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(tools.Ping, "_host_cache", {})
+    monkeypatch.setattr(tools.Ping, "_host_cache_size", 3)
+    now = 100.0
+    monkeypatch.setattr(tools.time, "monotonic", lambda: now)
+
+    short = tools.Ping(cache_ttl=1.0)
+    long = tools.Ping(cache_ttl=60.0)
+    short._add_cached("a", tools.PingResult.from_times("a", [0.001]))
+    long._add_cached("b", tools.PingResult.from_times("b", [0.001]))
+    now = 102.0
+    # Expired results are evicted on the next write
+    long._add_cached("c", tools.PingResult.from_times("c", [0.001]))
+    assert [host for host, _ in tools.Ping._host_cache] == ["b", "c"]
+
+    # Beyond the size limit, the oldest are evicted
+    for host in "def":
+        long._add_cached(host, tools.PingResult.from_times(host, [0.001]))
+    assert [host for host, _ in tools.Ping._host_cache] == ["d", "e", "f"]
+    assert long._get_cached("f") is not None
+    assert long._get_cached("b") is None
+
+
+def _icmp_sockets_permitted() -> bool:
+    try:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except OSError:
+        return False
+    sock.close()
+    return True
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(
+    not _icmp_sockets_permitted(), reason="ICMP datagram sockets not permitted"
+)
+async def test_ping_socket_localhost(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(tools.Ping, "_socket_permitted", None)
+    tool = tools.Ping(hosts=["127.0.0.1"], count=2, in_process=True)
+    host_result = await tool.ping_socket("127.0.0.1")
+    assert host_result.result.severity == Severity.success
+    assert host_result.alive == ["127.0.0.1"]
+    assert list(host_result.times) == ["127.0.0.1"]
+    assert 0 < host_result.min_time <= host_result.max_time < 1.0
+
+    result = await tool.run()
+    assert result.alive == ["127.0.0.1"]
+    assert result.num_alive == 1
+    assert result.unresponsive == []
+    assert tools.Ping._socket_permitted is True
+
+
+@pytest.mark.asyncio
+async def test_ping_socket_fallback(monkeypatch: pytest.MonkeyPatch):
+    """Pass if a denied ICMP socket falls back to the 'ping' program"""
+    def denied_socket(*args, **kwargs):
+        raise PermissionError("not permitted")
+
+    calls = []
+
+    async def ping_subprocess(self, host: str) -> tools.PingResult:
+        calls.append(host)
+        return tools.PingResult.from_times(host, [0.002])
+
+    monkeypatch.setattr(tools.socket, "socket", denied_socket)
+    monkeypatch.setattr(tools.Ping, "ping_subprocess", ping_subprocess)
+    monkeypatch.setattr(tools.Ping, "_socket_permitted", None)
+
+    tool = tools.Ping(hosts=["a", "b"], in_process=True, max_concurrency=1)
+    result = await tool.run()
+    assert calls == ["a", "b"]
+    assert result.alive == ["a", "b"]
+    assert result.max_time == 0.002
+    assert tools.Ping._socket_permitted is False
+
+
+def test_icmp_echo_packet():
+    request = tools._make_icmp_echo_request(1234, 7, b"payload")
+    assert tools._icmp_checksum(request) == 0
+    # Requests are not replies:
+    assert tools._parse_icmp_echo_reply(request) is None
+    reply = b"\x00" + request[1:]
+    assert tools._parse_icmp_echo_reply(reply) == 7
+    # With a minimal IPv4 header, as on some platforms:
+    ip_header = b"\x45" + b"\x00" * 19
+    assert tools._parse_icmp_echo_reply(ip_header + reply) == 7
+
+
+@pytest.fixture
+def tcp_listener():
+    # Connections complete in the kernel's backlog without accept()
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(32)
+        port = sock.getsockname()[1]
+        yield f"127.0.0.1:{port}"
+
+
+@pytest.fixture
+def closed_port() -> str:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"127.0.0.1:{port}"
+
+
+@pytest.mark.asyncio
+async def test_port_check(tcp_listener: str, closed_port: str):
+    tool = tools.PortCheck(targets=[tcp_listener, closed_port], timeout=1.0)
+    result = await tool.run()
+    assert result.reachable == [tcp_listener]
+    assert result.unreachable == [closed_port]
+    assert result.num_reachable == 1
+    assert result.num_unreachable == 1
+    assert result.result.severity == Severity.error
+    assert 0.0 <= result.times[tcp_listener] < 1.0
+    assert result.times[closed_port] == tools.PortCheck._unreachable_time
+    assert tools.get_result_value_by_key(result, "unreachable.0") == closed_port
+
+
+@pytest.mark.asyncio
+async def test_port_check_comparison(tcp_listener: str):
+    overall, results = await check_tool(
+        tools.PortCheck(targets=[tcp_listener] * 10, max_concurrency=2),
+        by_attr={
+            "num_unreachable": [check.Equals(value=0)],
+            "max_time": [check.Less(value=1.0)],
+        },
+    )
+    assert overall == Severity.success, results
+
+
+@pytest.mark.parametrize(
+    "target, host, port",
+    [
+        ("localhost:5064", "localhost", 5064),
+        ("10.0.0.1:80", "10.0.0.1", 80),
+        ("[::1]:5075", "::1", 5075),
+    ],
+)
+def test_split_host_port(target: str, host: str, port: int):
+    assert tools.split_host_port(target) == (host, port)
+
+
+@pytest.mark.parametrize("target", ["localhost", ":5064", "host:abc", "host:0"])
+def test_split_host_port_invalid(target: str):
+    with pytest.raises(ValueError):
+        tools.split_host_port(target)
@@ -1,15 +1,23 @@
+import io
+import json
 import pathlib
 
+import apischema
 import pytest
 
-from atef.config_model.passive import (ConfigurationFile, DeviceConfiguration,
-                                       PreparedFile,
+from atef.check import Equals
+from atef.config_model.passive import (ConfigurationFile, ConfigurationGroup,
+                                       DeviceConfiguration, PreparedFile,
                                        PreparedTemplateConfiguration,
                                        PVConfiguration, TemplateConfiguration)
 from atef.enums import Severity
+from atef.scripts.config_benchmark_main import main as config_benchmark_main
+from atef.serialization import deserialize_lazily, dumps_json, load_json
 from atef.type_hints import AnyDataclass
 from atef.widgets.config.utils import get_relevant_pvs
 
+from .conftest import load_config
+
 
 @pytest.mark.asyncio
 async def test_prepared_config(passive_config_path: pathlib.Path):
@@ -19,6 +27,51 @@ async def test_prepared_config(passive_config_path: pathlib.Path):
     await prepared_file.compare()
 
 
+def test_update_prepared_file(mock_ophyd_cache):
+    unchanged = PVConfiguration(
+        name='unchanged', by_pv={'PV:1': [Equals(value=1)]}
+    )
+    edited = PVConfiguration(
+        name='edited', by_pv={'PV:2': [Equals(value=2)]}
+    )
+    subgroup = ConfigurationGroup(name='subgroup', configs=[edited])
+    file = ConfigurationFile(
+        root=ConfigurationGroup(configs=[unchanged, subgroup])
+    )
+    prepared_file = PreparedFile.from_config(file)
+    prepared_root = prepared_file.root
+    prepared_unchanged, prepared_subgroup = prepared_root.configs
+
+    # nothing edited, nothing to do
+    assert prepared_file.update_from_config() == []
+
+    # edit a comparison and add a configuration
+    edited.by_pv['PV:2'][0].value = 3
+    added = PVConfiguration(name='added', by_pv={'PV:3': [Equals(value=3)]})
+    file.root.configs.append(added)
+    updated = prepared_file.update_from_config()
+    assert [prep.config for prep in updated] == [edited, added]
+
+    # untouched parts of the tree are kept
+    assert prepared_file.root is prepared_root
+    assert prepared_root.configs[0] is prepared_unchanged
+    assert prepared_root.configs[1] is prepared_subgroup
+    assert prepared_root.configs[2].config is added
+    assert prepared_subgroup.configs[0].config is edited
+    assert prepared_subgroup.configs[0].comparisons[0].comparison.value == 3
+
+    # removed configurations are dropped
+    file.root.configs.remove(subgroup)
+    assert prepared_file.update_from_config() == []
+    assert [prep.config for prep in prepared_root.configs] == [unchanged, added]
+
+    # editing the group itself prepares the whole group again
+    file.root.values['new_value'] = 1
+    updated = prepared_file.update_from_config()
+    assert updated == [prepared_file.root]
+    assert prepared_file.root is not prepared_root
+
+
 def test_yaml_equal_json(
     tmp_path: pathlib.Path,
     all_loaded_config: AnyDataclass
@@ -36,6 +89,72 @@ def test_yaml_equal_json(
     assert all_loaded_config == yaml_config
 
 
+def test_fast_serialization(all_config_path: pathlib.Path):
+    """Compiled (de)serializers and fast JSON give the reference results"""
+    reference = load_config(all_config_path)
+    loaded = type(reference).from_filename(all_config_path)
+    assert loaded == reference
+    assert loaded.to_json() == apischema.serialize(
+        type(reference), reference, exclude_defaults=True
+    )
+
+    serialized = apischema.serialize(type(reference), reference)
+    assert dumps_json(serialized) == json.dumps(serialized, indent=2)
+
+
+def test_lazy_load(all_config_path: pathlib.Path):
+    """Lazily loaded files match those loaded up front"""
+    reference = load_config(all_config_path)
+    loaded = type(reference).from_filename(all_config_path, lazy=True)
+    # Serializing loads all children
+    assert loaded.to_json() == reference.to_json()
+
+    loaded = type(reference).from_filename(all_config_path, lazy=True)
+    assert "_pending_children" in vars(loaded.root)
+    assert loaded == reference
+    assert "_pending_children" not in vars(loaded.root)
+
+
+def test_lazy_load_deferred_errors():
+    serialized = {
+        "version": 0,
+        "root": {
+            "name": "root",
+            "configs": [
+                {"ConfigurationGroup": {"name": "good"}},
+                {"ConfigurationGroup": {"configs": [{"NoSuchConfig": {}}]}},
+            ],
+        },
+    }
+    with pytest.raises(apischema.ValidationError):
+        apischema.deserialize(ConfigurationFile, serialized)
+
+    file = deserialize_lazily(ConfigurationFile, serialized)
+    assert file.root.name == "root"
+    good, bad = file.root.configs
+    assert good.configs == []
+    with pytest.raises(apischema.ValidationError):
+        bad.configs
+    # The serialized form is left as-is
+    assert serialized["root"]["configs"][1]["ConfigurationGroup"]["configs"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        pytest.param({"value": float("nan")}, id="nan"),
+        pytest.param({"name": "caf\u00e9"}, id="non_ascii"),
+        pytest.param({1: "a"}, id="int_key"),
+        pytest.param([2 ** 70], id="big_int"),
+        pytest.param([1e-07, 1e16, 0.1 + 0.2], id="float_exponent"),
+        pytest.param({"name": "\x7f"}, id="delete"),
+    ]
+)
+def test_dumps_json_fallback(data):
+    assert dumps_json(data) == json.dumps(data, indent=2)
+    assert load_json(io.StringIO(dumps_json(data))) is not None
+
+
 def test_gather_pvs(
     pv_configuration: PVConfiguration,
     device_configuration: DeviceConfiguration
@@ -66,3 +185,10 @@ async def test_template_configuration(template_configuration: TemplateConfigurat
 
     result = await ptc.compare()
     assert result.severity == Severity.success
+
+
+def test_config_benchmark_smoke(passive_config_path: pathlib.Path):
+    results = config_benchmark_main(str(passive_config_path), copies=2, repeat=1)
+    assert [name for name, _, _ in results] == [
+        "load", "load (lazy)", "serialize", "dump"
+    ]
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+import ophyd
+import pytest
+
+from ..cache import DataCache
+from ..governor import (AccessBudget, AccessGovernor, TokenBucket,
+                        get_signal_host)
+
+
+async def run_reads(
+    governor: AccessGovernor,
+    pvnames: list,
+    host: Optional[str] = None,
+    duration: float = 0.01,
+) -> int:
+    """Run limited reads of ``pvnames`` and return the max concurrency seen."""
+    running = 0
+    max_running = 0
+
+    async def read(pvname: str):
+        nonlocal running, max_running
+        async with governor.limit(pvname=pvname, host=host):
+            running += 1
+            max_running = max(running, max_running)
+            await asyncio.sleep(duration)
+            running -= 1
+
+    await asyncio.gather(*(read(pvname) for pvname in pvnames))
+    return max_running
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency():
+    governor = AccessGovernor(global_budget=AccessBudget(max_concurrency=3))
+    max_running = await run_reads(governor, [f"PV:{idx}" for idx in range(12)])
+    assert max_running == 3
+
+    stats = governor.statistics
+    assert stats.requests == 12
+    assert stats.active == 0
+    assert stats.queued == 0
+    # The first three reads start without waiting
+    assert stats.max_queued == 9
+    assert stats.max_wait_time > 0.0
+    assert stats.mean_wait_time > 0.0
+
+
+@pytest.mark.asyncio
+async def test_prefix_budget_longest_match():
+    governor = AccessGovernor(
+        prefix_budgets={
+            "IOC:": AccessBudget(max_concurrency=4),
+            "IOC:SLOW:": AccessBudget(max_concurrency=1),
+        },
+    )
+    assert await run_reads(governor, [f"IOC:SLOW:{idx}" for idx in range(5)]) == 1
+    assert await run_reads(governor, [f"IOC:FAST:{idx}" for idx in range(8)]) == 4
+    assert await run_reads(governor, [f"OTHER:{idx}" for idx in range(8)]) == 8
+
+
+@pytest.mark.asyncio
+async def test_host_budget():
+    governor = AccessGovernor(
+        host_budgets={"ioc-fragile:5064": AccessBudget(max_concurrency=1)},
+        default_host_budget=AccessBudget(max_concurrency=2),
+    )
+    pvnames = [f"PV:{idx}" for idx in range(6)]
+    assert await run_reads(governor, pvnames, host="ioc-fragile:5064") == 1
+    assert await run_reads(governor, pvnames, host="ioc-other:5064") == 2
+    assert await run_reads(governor, pvnames, host=None) == 6
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_rate():
+    bucket = TokenBucket(rate=100.0, capacity=2)
+    t0 = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    # Two from the initial burst, then four at 100 Hz
+    assert time.monotonic() - t0 >= 0.035
+
+
+@pytest.mark.asyncio
+async def test_cache_uses_governor():
+    governor = AccessGovernor(global_budget=AccessBudget(max_concurrency=1))
+    cache = DataCache(governor=governor)
+    signals = [ophyd.Signal(value=idx, name=f"sig{idx}") for idx in range(4)]
+    values = await asyncio.gather(
+        *(cache.get_signal_data(sig) for sig in signals),
+        # Cached or batched requests don't count as new reads:
+        *(cache.get_signal_data(sig) for sig in signals),
+    )
+    assert values == [0, 1, 2, 3] * 2
+    assert governor.statistics.requests == 4
+
+
+class LateHostSignal(ophyd.Signal):
+    """A signal whose host is only known once connected, as with EPICS."""
+    def __init__(self, *args, host: str, tracker: dict, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._host = host
+        self._tracker = tracker
+        self._read_pv = SimpleNamespace(host=None)
+
+    def wait_for_connection(self, timeout=None):
+        self._read_pv.host = self._host
+
+    def get(self, **kwargs):
+        tracker = self._tracker
+        with tracker["lock"]:
+            tracker["running"] += 1
+            tracker["max_running"] = max(tracker["max_running"], tracker["running"])
+        time.sleep(0.02)
+        with tracker["lock"]:
+            tracker["running"] -= 1
+        return super().get(**kwargs)
+
+
+@pytest.mark.asyncio
+async def test_host_budget_unknown_before_read():
+    tracker = {"lock": threading.Lock(), "running": 0, "max_running": 0}
+    signals = [
+        LateHostSignal(name=f"sig{idx}", host="ioc-fragile:5064", tracker=tracker)
+        for idx in range(4)
+    ]
+    # The host is not known until the signal connects, prior to its one read
+    assert all(get_signal_host(sig) is None for sig in signals)
+
+    governor = AccessGovernor(
+        host_budgets={"ioc-fragile:5064": AccessBudget(max_concurrency=1)},
+    )
+    cache = DataCache(governor=governor)
+    await asyncio.gather(*(cache.get_signal_data(sig) for sig in signals))
+    assert tracker["max_running"] == 1
+    assert governor.statistics.requests == 4
+
+    # Without host budgets, no connection is made ahead of the read
+    tracker["max_running"] = 0
+    signals = [
+        LateHostSignal(name=f"sig{idx}", host="ioc-fragile:5064", tracker=tracker)
+        for idx in range(4)
+    ]
+    cache = DataCache(governor=AccessGovernor())
+    await asyncio.gather(*(cache.get_signal_data(sig) for sig in signals))
+    assert tracker["max_running"] > 1
+    assert all(get_signal_host(sig) is None for sig in signals)
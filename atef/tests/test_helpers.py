@@ -1,9 +1,16 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Sequence, Union
 
 import pytest
 
-from atef.qt_helpers import QDataclassBridge, QDataclassList, QDataclassValue
+from atef.enums import Severity
+from atef.qt_helpers import (AsyncioWorker, QDataclassBridge, QDataclassList,
+                             QDataclassValue)
+from atef.result import Result, notify_result
 from atef.type_hints import AnyDataclass
 
 
@@ -63,3 +70,67 @@ def test_qt_bridge_types(
 
     # weird way of checking the expected type of the signal: 2changed_value(QString)
     assert changed_value_type in bridge_field.changed_value.signal.lower()
+
+
+@pytest.fixture
+def asyncio_worker():
+    worker = AsyncioWorker()
+    yield worker
+    worker.stop()
+
+
+def test_asyncio_worker_results(qtbot, asyncio_worker: AsyncioWorker):
+    results = []
+    asyncio_worker.result_ready.connect(
+        lambda item, result: results.append((item, result))
+    )
+
+    async def run():
+        for i in range(3):
+            await asyncio.sleep(0)
+            notify_result(i, Result())
+        return "done"
+
+    with qtbot.waitSignal(asyncio_worker.task_finished, timeout=5000):
+        task = asyncio_worker.submit(run())
+
+    assert isinstance(task, concurrent.futures.Future)
+    assert task.result() == "done"
+    qtbot.waitUntil(lambda: len(results) == 3, timeout=5000)
+    assert [item for item, _ in results] == [0, 1, 2]
+    assert all(result.severity == Severity.success for _, result in results)
+
+
+def test_asyncio_worker_cancel(qtbot, asyncio_worker: AsyncioWorker):
+    with qtbot.waitSignal(asyncio_worker.task_finished, timeout=5000):
+        task = asyncio_worker.submit(asyncio.sleep(100))
+        asyncio_worker.cancel(task)
+
+    assert task.cancelled()
+    assert not asyncio_worker.tasks
+
+
+def test_asyncio_worker_submit_blocked_loop(qtbot, asyncio_worker: AsyncioWorker):
+    # A coroutine blocking the loop must not block submission
+    release = threading.Event()
+
+    async def block():
+        release.wait(timeout=10)
+
+    asyncio_worker.submit(block())
+    t0 = time.monotonic()
+    task = asyncio_worker.submit(asyncio.sleep(0, result="done"))
+    assert time.monotonic() - t0 < 1
+    assert not task.done()
+
+    release.set()
+    assert task.result(timeout=5) == "done"
+
+
+def test_asyncio_worker_submit_in_loop(qtbot, asyncio_worker: AsyncioWorker):
+    # Submitting from within the worker loop must not deadlock
+    async def outer():
+        return asyncio_worker.submit(asyncio.sleep(0, result="inner"))
+
+    inner = asyncio_worker.submit(outer()).result(timeout=5)
+    assert inner.result(timeout=5) == "inner"
@@ -1,11 +1,16 @@
+import threading
+import time
+
 import happi
+import ophyd
 import pytest
 from pytestqt.qtbot import QtBot
 from qtpy import QtWidgets
 
 from atef.widgets.config.data_active import ActionRowWidget
 from atef.widgets.ophyd import (OphydAttributeData, OphydAttributeDataSummary,
-                                PolledDeviceModel)
+                                OphydDeviceTableView, PolledDeviceModel,
+                                can_monitor, get_device_poller)
 
 
 def test_ophyd_attribute_data(happi_client: happi.Client):
@@ -50,15 +55,116 @@ def test_action_target_set(
 def test_polling_thread(qtbot: QtBot, happi_client: happi.Client):
     dev = happi_client.search()[0].get()
     model = PolledDeviceModel(dev)
-    thread = model._poll_thread
-    qtbot.wait_until(lambda: model._poll_thread.running)
-    # assert model._poll_thread.running
+    job = model._poll_job
+    qtbot.wait_until(lambda: job.running)
 
     old_value = dev.position
     dev.set(old_value + 4)
 
     # raise if this is not emitted within 5s timeout
-    qtbot.wait_signal(model._poll_thread.data_changed)
-    # stop and clean up thread
+    qtbot.wait_signal(get_device_poller().data_changed)
+    # stop and clean up job
+    model.stop()
+    qtbot.wait_until(lambda: job.finished.is_set())
+
+
+class ComputedSignal(ophyd.Signal):
+    def get(self, **kwargs):
+        return 1
+
+
+class MonitoredDevice(ophyd.Device):
+    soft = ophyd.Component(ophyd.Signal, value=0)
+    computed = ophyd.Component(ComputedSignal)
+
+
+def test_monitoring_thread(qtbot: QtBot):
+    dev = MonitoredDevice(name="dev")
+    assert can_monitor(dev.soft)
+    assert not can_monitor(dev.computed)
+
+    model = PolledDeviceModel(dev, poll_rate=0.0)
+    job = model._poll_job
+    qtbot.wait_until(lambda: "soft" in job._monitored)
+    assert "computed" not in job._monitored
+    qtbot.wait_until(lambda: model.rowCount() == 2)
+
+    # monitored changes are delivered in batches, without polling
+    with qtbot.wait_signal(
+        get_device_poller().data_changed,
+        check_params_cb=lambda changed_job, attrs: changed_job is job,
+    ) as blocker:
+        dev.soft.put(5)
+    assert blocker.args == [job, ["soft"]]
+    assert model._data["soft"].readback == 5
+    assert not job.finished.is_set()
+
     model.stop()
-    qtbot.wait_until(lambda: thread.isFinished())
+    qtbot.wait_until(lambda: job.finished.is_set())
+    assert not job._subscriptions
+
+
+@pytest.mark.parametrize("poll_rate", [0.0, 1.0])
+def test_thread_stopped_on_start(qtbot: QtBot, poll_rate: float):
+    """Pass if jobs stopped right after starting still finish"""
+    models = [
+        PolledDeviceModel(MonitoredDevice(name=f"dev{idx}"), poll_rate=poll_rate)
+        for idx in range(10)
+    ]
+    jobs = [model._poll_job for model in models]
+    for model in models:
+        model.stop()
+    for job in jobs:
+        assert job.finished.wait(5)
+    assert not set(jobs) & set(get_device_poller().jobs)
+
+
+class BlockingSignal(ophyd.Signal):
+    release = threading.Event()
+    reading = threading.Event()
+
+    def get(self, **kwargs):
+        self.reading.set()
+        self.release.wait(timeout=10)
+        return 1
+
+
+class BlockingDevice(ophyd.Device):
+    blocking = ophyd.Component(BlockingSignal)
+
+
+def test_clear_does_not_wait(qtbot: QtBot):
+    """Pass if clearing a view does not wait on a read in progress"""
+    BlockingSignal.release.clear()
+    BlockingSignal.reading.clear()
+    view = OphydDeviceTableView(device=BlockingDevice(name="blocking_dev"))
+    job = view.current_model._poll_job
+    try:
+        assert BlockingSignal.reading.wait(5)
+        t0 = time.monotonic()
+        view.clear()
+        assert time.monotonic() - t0 < 1
+        assert not job.finished.is_set()
+    finally:
+        BlockingSignal.release.set()
+
+    assert job.finished.wait(5)
+    assert job not in get_device_poller().jobs
+
+
+def test_views_share_poller(qtbot: QtBot):
+    """Pass if device views are all serviced by a single thread"""
+    n_threads = threading.active_count()
+    views = [
+        OphydDeviceTableView(device=MonitoredDevice(name=f"shared{idx}"))
+        for idx in range(5)
+    ]
+    jobs = [view.current_model._poll_job for view in views]
+    qtbot.wait_until(lambda: all("soft" in job._monitored for job in jobs))
+    assert set(jobs) <= set(get_device_poller().jobs)
+    assert threading.active_count() <= n_threads + 1
+
+    for view in views:
+        view.clear()
+    for job in jobs:
+        assert job.finished.wait(5)
@@ -4,7 +4,9 @@ from typing import Any, Callable
 import pytest
 from pytestqt.qtbot import QtBot
 from qtpy import QtCore, QtWidgets
+from qtpy.QtCore import Qt
 
+from atef.check import Equals
 from atef.config_model import load_file
 from atef.config_model.active import TemplateStep
 from atef.config_model.passive import ConfigurationFile, TemplateConfiguration
@@ -15,6 +17,7 @@ from atef.widgets.config.find_replace import (ApplyOptionPage,
                                               SelectTemplatePage)
 from atef.widgets.config.page import (ComparisonPage, ConfigurationGroupPage,
                                       TemplateConfigurationPage)
+from atef.widgets.config.paged_table import PagedTableWidget
 from atef.widgets.config.utils import ConfigTreeModel
 
 
@@ -190,6 +193,39 @@ def test_change_comparison(
         comp_page = full_tree.current_widget
 
 
+def test_paged_table(qtbot: QtBot):
+    comparisons = [Equals(name=f'comp {i}') for i in range(1000)]
+    table = PagedTableWidget(item_list=comparisons, page_size=10, widget_cls=None)
+    qtbot.addWidget(table)
+    proxy = table.proxy_model
+
+    assert proxy.total_pages == 100
+    assert proxy.rowCount() == 10
+    table.set_page(42)
+    assert proxy.index(0, 0).data(Qt.ToolTipRole) == 'comp 410'
+
+    # only the filter change requires recomputing the matching rows
+    table.search_edit.setText('comp 99')
+    assert proxy.filtered_rows() == [99] + list(range(990, 1000))
+    assert proxy.total_pages == 2
+
+    table.show_row_for_data(comparisons[999])
+    assert proxy.curr_page == 2
+    assert proxy.rowCount() == 1
+    assert proxy.index(0, 0).data(Qt.ToolTipRole) == 'comp 999'
+
+    # rows hidden by the search leave the page unchanged
+    table.show_row_for_data(comparisons[0])
+    assert proxy.curr_page == 2
+
+    # removing the last row on a page moves to the new last page
+    table.remove_data(comparisons[999])
+    assert proxy.total_pages == 1
+    assert proxy.curr_page == 1
+    assert proxy.rowCount() == 10
+    assert table.row_count() == 999
+
+
 def test_template_page(
     qtbot: QtBot,
     template_configuration: TemplateConfiguration,
@@ -226,3 +226,25 @@ async def test_prepared_step_timestamps():
     assert prep_desc_step.start_timestamp is not None
     assert prep_desc_step.end_timestamp is not None
     assert prep_desc_step.start_timestamp <= prep_desc_step.end_timestamp
+
+
+def test_update_prepared_procedure():
+    unchanged = DescriptionStep(name='unchanged')
+    edited = DescriptionStep(name='edited')
+    subgroup = ProcedureGroup(name='subgroup', steps=[edited])
+    file = ProcedureFile(root=ProcedureGroup(steps=[unchanged, subgroup]))
+    prepared_file = PreparedProcedureFile.from_origin(file)
+    prepared_root = prepared_file.root
+    prepared_unchanged, prepared_subgroup = prepared_root.steps
+    prepared_unchanged.verify_result = pass_result
+
+    assert prepared_file.update_from_origin() == []
+
+    edited.description = 'new description'
+    updated = prepared_file.update_from_origin()
+    assert [prep.origin for prep in updated] == [edited]
+    assert prepared_file.root is prepared_root
+    assert prepared_root.steps == [prepared_unchanged, prepared_subgroup]
+    assert prepared_subgroup.steps[0] is updated[0]
+    # results of untouched steps are kept
+    assert prepared_unchanged.verify_result is pass_result
@@ -6,7 +6,9 @@ from atef.config_model.active import PreparedProcedureFile, ProcedureFile
 from atef.config_model.passive import ConfigurationFile, PreparedFile
 from atef.tests.conftest import (active_checkout_configs,
                                  passive_checkout_configs)
-from atef.walk import walk_config_file, walk_procedure_file
+from atef.walk import (get_prepared_map, get_prepared_step,
+                       get_relevant_configs_comps, walk_config_file,
+                       walk_procedure_file)
 
 
 def passive_walk_params():
@@ -66,6 +68,30 @@ def test_active_walks(filepath, num_items, num_steps):
     assert len(list(file.walk_steps())) == num_steps
 
 
+@pytest.mark.parametrize(
+    'filepath',
+    passive_checkout_configs() + active_checkout_configs(),
+)
+def test_prepared_map(filepath):
+    if filepath in passive_checkout_configs():
+        file = ConfigurationFile.from_filename(filepath)
+        prep_file = PreparedFile.from_config(file)
+        gather_fn = get_relevant_configs_comps
+    else:
+        file = ProcedureFile.from_filename(filepath)
+        prep_file = PreparedProcedureFile.from_origin(file)
+        gather_fn = get_prepared_step
+
+    def walk_originals(data):
+        for child in getattr(data, 'children', lambda: [])():
+            yield child
+            yield from walk_originals(child)
+
+    prepared_map = get_prepared_map(prep_file)
+    for orig in walk_originals(file):
+        assert prepared_map.get(id(orig), []) == gather_fn(prep_file, orig)
+
+
 # Other ideas for tests:
 # - test gathered prepared comparisons match un-prepared (get_relevant_configs_comps)
 #   - requires walk_comparisons on un-prepared classes, unification of ordering
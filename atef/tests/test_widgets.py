@@ -1,3 +1,4 @@
+import datetime
 import logging
 import os
 import pathlib
@@ -9,14 +10,27 @@ import yaml
 from pytestqt.qtbot import QtBot
 from qtpy import QtCore, QtWidgets
 
+from atef.archive_server import DATA_PATH, LocalArchiver
+from atef.enums import Severity
+from atef.result import Result, skipped_result
+from atef.widgets.archive_viewer import (ArchiverViewerWidget,
+                                         clear_archived_pv_info_cache,
+                                         get_archived_pv_infos,
+                                         get_processing_command)
+from atef.widgets.config.result_summary import ResultsSummaryWidget
 from atef.widgets.config.utils import MultiInputDialog
+from atef.widgets import core
+from atef.widgets.core import (UI_SOURCE_PATH, DesignerDisplay,
+                               _import_ui_form, compile_ui_form, load_ui_form)
 from atef.widgets.happi import HappiDeviceComponentWidget
 from atef.widgets.ophyd import OphydDeviceTableWidget
 
 from ..config_model.active import (DescriptionStep, DisplayOptions,
                                    ProcedureGroup, PydmDisplayStep,
                                    TyphosDisplayStep)
-from ..widgets.config.window import Window
+from ..config_model.passive import PreparedFile, PreparedSignalComparison
+from ..widgets.config.window import DualTree, Window
+from .conftest import load_config
 
 logger = logging.getLogger(__name__)
 
@@ -244,6 +258,123 @@ def test_edit_run_toggle(qtbot: QtBot, config: os.PathLike, monkeypatch):
     assert window.tab_widget.widget(0).mode == 'run'
 
 
+@pytest.mark.parametrize('config', [0, 1, 2], indirect=True)
+def test_prepare_on_run_mode(qtbot: QtBot, config: os.PathLike, monkeypatch):
+    """Pass if the checkout is only prepared once run mode is requested"""
+    monkeypatch.setattr(QtWidgets.QMessageBox, 'exec', lambda *a, **k: True)
+    window = Window(show_welcome=False)
+    window.open_file(filename=str(config))
+    qtbot.addWidget(window)
+    tree = window.tab_widget.widget(0)
+    assert tree.prepared_file is None
+    assert all(item.prepared_data is None for item in tree._item_list)
+
+    tree.switch_mode(True)
+    assert tree.mode == 'run'
+    assert tree.prepared_file is not None
+    assert tree.prepared_file.file is tree.orig_file
+    assert any(item.prepared_data for item in tree._item_list)
+
+    # unchanged configuration does not require preparing again
+    prepared_file = tree.prepared_file
+    tree.switch_mode(False)
+    tree.switch_mode(True)
+    assert tree.prepared_file is prepared_file
+
+    # edits are prepared in place and linked into the existing tree
+    root_item = tree.root_item.child(0)
+    tree.switch_mode(False)
+    tree.orig_file.root.description = 'edited'
+    tree.switch_mode(True)
+    assert tree.prepared_file is prepared_file
+    assert tree.root_item.child(0) is root_item
+    assert root_item.prepared_data[0] is prepared_file.root
+
+
+def test_lazy_tree(qtbot: QtBot, test_configs: list[pathlib.Path], monkeypatch):
+    """Pass if large trees are populated on demand"""
+    monkeypatch.setattr(DualTree, 'expand_all_limit', 0)
+    window = Window(show_welcome=False)
+    window.open_file(filename=str(test_configs[0]))
+    qtbot.addWidget(window)
+    tree = window.get_current_tree()
+    model = tree.model
+
+    # lfe demo > at2l0 > blade states > blades out
+    top_item = tree.root_item.child(0)
+    group_item = top_item.child(0)
+    config_item = group_item.child(0)
+    comparison_item = config_item.child(0)
+    assert model.is_fetched(top_item)
+    assert not model.is_fetched(group_item)
+    assert model.hasChildren(model.index_from_item(group_item))
+    assert model.canFetchMore(model.index_from_item(group_item))
+
+    tree.select_by_item(comparison_item)
+    assert model.is_fetched(group_item)
+    assert model.is_fetched(config_item)
+    assert tree.current_item is comparison_item
+
+
+def test_results_summary_updates(qtbot: QtBot, test_configs: list[pathlib.Path]):
+    """Pass if result changes are applied in place, keeping filters/selection"""
+    prepared_file = PreparedFile.from_config(load_config(test_configs[1]))
+    widget = ResultsSummaryWidget(file=prepared_file)
+    qtbot.addWidget(widget)
+    model, proxy = widget.model, widget.proxy_model
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+
+    # success is hidden by default
+    assert widget.warning_check.isChecked()
+    assert not widget.success_check.isChecked()
+    shown = proxy.rowCount()
+    comparisons = [
+        source for source in model.sources()
+        if isinstance(source, PreparedSignalComparison)
+    ]
+    assert len(comparisons) >= 2
+    widget.results_table.selectRow(0)
+    selected = widget.get_selected_origins()
+    assert selected
+
+    with qtbot.waitSignal(model.results_changed, timeout=1000):
+        for comparison in comparisons[:2]:
+            comparison.result = Result(severity=Severity.success)
+            model.result_changed(comparison, comparison.result)
+        # unknown items are ignored
+        model.result_changed(object())
+
+    assert proxy.rowCount() == shown - 2
+    assert not resets
+
+    widget.name_edit.setText('.')
+    widget.refresh_results()
+    assert widget.name_edit.text() == '.'
+    assert widget.get_selected_origins() == selected
+    assert not resets
+
+
+def test_results_summary_skipped(qtbot: QtBot, test_configs: list[pathlib.Path]):
+    """Pass if skipped results are shown as such, with warnings"""
+    prepared_file = PreparedFile.from_config(load_config(test_configs[1]))
+    comparison = next(
+        comparison for comparison in prepared_file.walk_comparisons()
+        if isinstance(comparison, PreparedSignalComparison)
+    )
+    comparison.result = skipped_result()
+    widget = ResultsSummaryWidget(file=prepared_file)
+    qtbot.addWidget(widget)
+
+    statuses = [
+        widget.proxy_model.index(row, 0).data()
+        for row in range(widget.proxy_model.rowCount())
+    ]
+    assert "[-] skipped" in statuses
+    widget.warning_check.setChecked(False)
+    assert "skipped" not in widget.get_plain_text()
+
+
 @pytest.mark.parametrize('config', [0, 1, 2], indirect=True)
 def test_open_all_pages(qtbot: QtBot, config: os.PathLike):
     """Pass if all pages in the test configs can be opened by selecting the treeview"""
@@ -341,6 +472,195 @@ def test_device_table(qtbot: QtBot, happi_client: happi.Client):
     qtbot.addWidget(otable)
 
 
+def test_ui_form_cache(tmp_path: pathlib.Path):
+    """Pass if forms are compiled once, and again only when edited"""
+    ui_path = tmp_path / 'paged_table.ui'
+    ui_path.write_bytes((UI_SOURCE_PATH / 'paged_table.ui').read_bytes())
+    cache_path = tmp_path / 'cache'
+
+    py_path = compile_ui_form(ui_path, cache_path)
+    assert py_path.exists()
+    mtime = py_path.stat().st_mtime_ns
+    assert compile_ui_form(ui_path, cache_path) == py_path
+    assert py_path.stat().st_mtime_ns == mtime
+
+    ui_path.write_text(ui_path.read_text().replace('Form', 'Form2'))
+    assert compile_ui_form(ui_path, cache_path) != py_path
+    assert len(list(cache_path.glob('*.py'))) == 2
+
+
+def test_ui_form_cache_verified(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Pass if corrupt forms are not executed, and version changes recompile"""
+    ui_path = tmp_path / 'paged_table.ui'
+    ui_path.write_bytes((UI_SOURCE_PATH / 'paged_table.ui').read_bytes())
+    cache_path = tmp_path / 'cache'
+
+    py_path = compile_ui_form(ui_path, cache_path)
+    contents = py_path.read_text()
+    assert _import_ui_form(py_path).__name__.startswith('Ui_')
+
+    # A partly written entry is neither executed nor reused
+    py_path.write_text(contents[:len(contents) // 2])
+    with pytest.raises(ValueError):
+        _import_ui_form(py_path)
+    assert compile_ui_form(ui_path, cache_path) == py_path
+    assert py_path.read_text() == contents
+
+    # As is an entry whose code does not match its checksum
+    py_path.write_text(contents + 'raise RuntimeError("tampered")\n')
+    with pytest.raises(ValueError):
+        _import_ui_form(py_path)
+
+    monkeypatch.setattr(core, '__version__', '0.0.0-other')
+    assert compile_ui_form(ui_path, cache_path) != py_path
+
+
+def test_lazy_ui_form(qtbot: QtBot):
+    """Pass if forms are loaded on first instantiation"""
+    class LazyDisplay(DesignerDisplay, QtWidgets.QWidget):
+        filename = 'paged_table.ui'
+        page_spinbox: QtWidgets.QSpinBox
+
+    assert LazyDisplay.ui_form is None
+    widget = LazyDisplay()
+    qtbot.addWidget(widget)
+    assert LazyDisplay.ui_form is load_ui_form('paged_table.ui')
+    assert LazyDisplay.ui_form.__module__.startswith('atef._ui_forms')
+    assert isinstance(widget.page_spinbox, QtWidgets.QSpinBox)
+
+
+@pytest.fixture
+def viewer_archiver():
+    now = datetime.datetime.now()
+    archiver = LocalArchiver()
+    archiver.add_synthetic(
+        ["PV:MANY"], now - datetime.timedelta(hours=1), now, period=60.0,
+        meta={"EGU": "mm"},
+    )
+    archiver.add_synthetic(
+        ["PV:FEW"], now - datetime.timedelta(minutes=1), now, period=60.0
+    )
+    clear_archived_pv_info_cache()
+    with archiver:
+        yield archiver
+    clear_archived_pv_info_cache()
+
+
+def test_archived_pv_probe(viewer_archiver: LocalArchiver):
+    """Pass if PVs are probed concurrently, once, without fetching data"""
+    appliance = viewer_archiver.get_appliance()
+    infos = get_archived_pv_infos(appliance, ["PV:MANY", "PV:FEW", "PV:NONE"])
+    assert infos["PV:MANY"].archived
+    assert infos["PV:MANY"].num_samples >= 60
+    assert infos["PV:MANY"].meta["EGU"] == "mm"
+    assert infos["PV:FEW"].num_samples < 3
+    assert not infos["PV:NONE"].archived
+    assert viewer_archiver.get_request_count(DATA_PATH) == 3
+
+    # Cached for any widget using the same appliance
+    assert get_archived_pv_infos(viewer_archiver.get_appliance(), ["PV:MANY"]) == {
+        "PV:MANY": infos["PV:MANY"]
+    }
+    assert viewer_archiver.get_request_count(DATA_PATH) == 3
+
+
+def test_archive_viewer_add_signals(
+    qtbot: QtBot, viewer_archiver: LocalArchiver, monkeypatch
+):
+    monkeypatch.setenv("PYDM_ARCHIVER_URL", "http://127.0.0.1:17668")
+    viewer = ArchiverViewerWidget()
+    qtbot.addWidget(viewer)
+    viewer.archapp = viewer_archiver.get_appliance()
+    viewer.add_signals(
+        [("PV:MANY", "dev.many"), ("PV:FEW", None), ("PV:MANY", None)],
+        update_curves=False,
+    )
+    assert sorted(row[0] for row in viewer.model.pvs) == ["PV:FEW", "PV:MANY"]
+    assert viewer_archiver.get_request_count(DATA_PATH) == 2
+
+
+@pytest.mark.parametrize(
+    "span, bins, sample_rate, expected",
+    [
+        (100.0, 500, 1.0, ""),
+        (1000.0, 500, 1.0, "optimized_500"),
+        (1000.0, 500, 0.1, ""),
+        (3600.0, 200, 10.0, "optimized_200"),
+    ]
+)
+def test_processing_command(
+    span: float, bins: int, sample_rate: float, expected: str
+):
+    assert get_processing_command(span, bins, sample_rate) == expected
+
+
+def test_archive_viewer_curves(
+    qtbot: QtBot, viewer_archiver: LocalArchiver, monkeypatch
+):
+    """Pass if curves are updated in place, requesting reduced data as needed"""
+    monkeypatch.setenv("PYDM_ARCHIVER_URL", "http://127.0.0.1:17668")
+    viewer = ArchiverViewerWidget()
+    qtbot.addWidget(viewer)
+    viewer.archapp = viewer_archiver.get_appliance()
+    viewer.add_signals([("PV:MANY", None)])
+    many = viewer._curves["PV:MANY"]
+    viewer.add_signals([("PV:FEW", None)])
+    assert viewer._curves["PV:MANY"] is many
+    assert len(viewer.time_plot._curves) == 2
+    assert viewer.time_plot.sample_rates["PV:MANY"] > 0
+
+    commands = []
+    many.archive_data_request_signal.connect(
+        lambda min_x, max_x, command: commands.append(command)
+    )
+    now = datetime.datetime.now().timestamp()
+    bins = viewer.time_plot.get_bins()
+    assert viewer.time_plot.request_curve_data(many, now - 60, now)
+    assert viewer.time_plot.request_curve_data(many, now - 86400 * bins, now)
+    assert commands == ["", f"optimized_{bins}"]
+
+    few_row = [row[0] for row in viewer.model.pvs].index("PV:FEW")
+    viewer.model.removeRow(few_row)
+    assert list(viewer._curves) == ["PV:MANY"]
+    assert viewer.time_plot._curves == [many]
+
+    viewer.clear_curves()
+    assert not viewer._curves
+    assert not viewer.time_plot._curves
+
+
+def test_archive_viewer_pending_requests(
+    qtbot: QtBot, viewer_archiver: LocalArchiver, monkeypatch
+):
+    """Pass if single-curve requests are counted until their data arrives"""
+    monkeypatch.setenv("PYDM_ARCHIVER_URL", "http://127.0.0.1:17668")
+    viewer = ArchiverViewerWidget()
+    qtbot.addWidget(viewer)
+    viewer.archapp = viewer_archiver.get_appliance()
+    viewer.add_signals([("PV:MANY", None), ("PV:FEW", None)])
+    plot = viewer.time_plot
+    # Respond to requests by hand
+    for curve in plot._curves:
+        curve.archive_data_received_signal.disconnect(plot.archive_data_received)
+    plot._pending_archive_responses = 0
+
+    started, finished = [], []
+    plot.archive_request_started.connect(lambda: started.append(True))
+    plot.archive_request_finished.connect(lambda: finished.append(True))
+    now = datetime.datetime.now().timestamp()
+    for curve in plot._curves:
+        assert plot.request_curve_data(curve, now - 60, now)
+    assert plot._pending_archive_responses == 2
+    assert len(started) == 1
+
+    plot.archive_data_received()
+    assert not finished
+    plot.archive_data_received()
+    assert len(finished) == 1
+
+
 def test_multiinput_dialog(qtbot: QtBot):
     info = {
         "str": "",
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import os
 import re
 import shutil
+import socket
+import struct
 import sys
+import time
 import typing
 from dataclasses import dataclass, field
-from typing import Any, ClassVar, Dict, List, Mapping, Sequence, TypeVar, Union
+from typing import (Any, ClassVar, Dict, List, Mapping, Optional, Sequence,
+                    Tuple, TypeVar, Union)
 
 from . import serialization
 from .check import Severity
@@ -15,6 +21,8 @@ from .result import Result
 
 T = TypeVar("T", bound="Tool")
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class ToolResult:
@@ -88,18 +96,40 @@ class PingResult(ToolResult):
         self.num_alive = len(self.alive)
 
     @classmethod
-    def from_output(
-        cls, host: str, output: str, unresponsive_time: float = 100.0
+    def parse_times(cls, output: str) -> List[float]:
+        """
+        Parse round-trip times (in seconds) from ``ping`` program output.
+
+        This may be called on the full output or on individual lines as they
+        are read.
+
+        Parameters
+        ----------
+        output : str
+            The decoded output (or a portion of it) of the subprocess call.
+
+        Returns
+        -------
+        list of float
+        """
+        # NOTE: lazily ignoring non-millisecond-level results here; 1 second+
+        # is the same as non-responsive if you ask me...
+        return [float(ms) / 1000.0 for ms in cls._time_re.findall(output)]
+
+    @classmethod
+    def from_times(
+        cls, host: str, times: Sequence[float], unresponsive_time: float = 100.0
     ) -> PingResult:
         """
-        Fill a PingResult from the results of the ping program.
+        Fill a PingResult from the round-trip times measured for ``host``.
 
         Parameters
         ----------
         host : str
-            The hostname that ``ping`` was called with.
-        output : str
-            The decoded output of the subprocess call.
+            The hostname that was pinged.
+        times : Sequence[float]
+            Round-trip times in seconds.  An empty sequence indicates the host
+            was unresponsive.
         unresponsive_time : float, optional
             Time to use for unresponsive or errored hosts.
 
@@ -107,10 +137,6 @@ class PingResult(ToolResult):
         -------
         PingResult
         """
-        # NOTE: lazily ignoring non-millisecond-level results here; 1 second+
-        # is the same as non-responsive if you ask me...
-        times = [float(ms) / 1000.0 for ms in PingResult._time_re.findall(output)]
-
         if not times:
             return cls(
                 result=Result(severity=Severity.error),
@@ -130,6 +156,165 @@ class PingResult(ToolResult):
             times={host: sum(times) / len(times)},
         )
 
+    @classmethod
+    def from_output(
+        cls, host: str, output: str, unresponsive_time: float = 100.0
+    ) -> PingResult:
+        """
+        Fill a PingResult from the results of the ping program.
+
+        Parameters
+        ----------
+        host : str
+            The hostname that ``ping`` was called with.
+        output : str
+            The decoded output of the subprocess call.
+        unresponsive_time : float, optional
+            Time to use for unresponsive or errored hosts.
+
+        Returns
+        -------
+        PingResult
+        """
+        return cls.from_times(
+            host, cls.parse_times(output), unresponsive_time=unresponsive_time
+        )
+
+
+@dataclass
+class PortCheckResult(ToolResult):
+    """
+    The result dictionary of the 'port check' tool.
+    """
+    #: Target(s) that accepted a connection
+    reachable: List[str] = field(default_factory=list)
+    #: Number of targets that accepted a connection.
+    num_reachable: int = 0
+
+    #: Target(s) that refused or did not answer in time
+    unreachable: List[str] = field(default_factory=list)
+    #: Number of targets that were unreachable.
+    num_unreachable: int = 0
+
+    #: Target to connection time taken.
+    times: Dict[str, float] = field(default_factory=dict)
+    #: Minimum time in seconds from ``times``.
+    min_time: float = 0.0
+    #: Maximum time in seconds from ``times``.
+    max_time: float = 0.0
+
+    def add_target_result(
+        self,
+        target: str,
+        result: Union[float, Exception],
+        *,
+        failure_time: float = 100.0
+    ) -> None:
+        """
+        Add a new per-target result to this aggregate one.
+
+        Parameters
+        ----------
+        target : str
+            The ``host:port`` target.
+        result : Union[float, Exception]
+            The time taken to connect.  Caught exceptions will be interpreted
+            as a connection failure for the given target.
+        failure_time : float, optional
+            The time to use when failures happen.
+        """
+        if isinstance(result, Exception):
+            self.result = Result(
+                severity=Severity.error,
+                reason=f"Unable to connect to {target}",
+            )
+            self.unreachable.append(target)
+            self.times[target] = failure_time
+        else:
+            self.reachable.append(target)
+            self.times[target] = result
+
+        times = self.times.values()
+        self.min_time = min(times) if times else 0.0
+        self.max_time = max(times) if times else failure_time
+
+        self.num_unreachable = len(self.unreachable)
+        self.num_reachable = len(self.reachable)
+
+
+def split_host_port(target: str) -> Tuple[str, int]:
+    """
+    Split a ``host:port`` target into its host and port.
+
+    IPv6 addresses should be bracketed, as in ``[::1]:5064``.
+
+    Parameters
+    ----------
+    target : str
+        The target string.
+
+    Raises
+    ------
+    ValueError
+        If the target does not include a valid port.
+
+    Returns
+    -------
+    host : str
+    port : int
+    """
+    host, sep, port = target.strip().rpartition(":")
+    if not sep or not host:
+        raise ValueError(f"Target {target!r} is not of the form host:port")
+    if host.startswith("[") and host.endswith("]"):
+        host = host[1:-1]
+    try:
+        port_number = int(port)
+    except ValueError:
+        raise ValueError(f"Target {target!r} has an invalid port") from None
+    if not 0 < port_number < 65536:
+        raise ValueError(f"Target {target!r} has an out-of-range port")
+    return host, port_number
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """RFC 1071 internet checksum of ``data``."""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _make_icmp_echo_request(ident: int, seq: int, payload: bytes) -> bytes:
+    """Build an ICMP echo request packet."""
+    header = struct.pack("!BBHHH", 8, 0, 0, ident, seq)
+    checksum = _icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", 8, 0, checksum, ident, seq) + payload
+
+
+def _parse_icmp_echo_reply(data: bytes) -> Optional[int]:
+    """
+    Get the sequence number from an ICMP echo reply packet.
+
+    Some platforms include the IPv4 header with datagram ICMP sockets, so it
+    is skipped if present.
+
+    Returns
+    -------
+    int or None
+        The sequence number, or None if ``data`` is not an echo reply.
+    """
+    if data and data[0] >> 4 == 4:
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < 8:
+        return None
+    icmp_type, _, _, _, seq = struct.unpack("!BBHHH", data[:8])
+    if icmp_type != 0:
+        return None
+    return seq
+
 
 def get_result_value_by_key(result: ToolResult, key: str) -> Any:
     """
@@ -252,13 +437,64 @@ class Ping(Tool):
     count: int = 3
     #: The assumed output encoding of the 'ping' command.
     encoding: str = "utf-8"
+    #: The maximum number of hosts to ping at the same time.
+    max_concurrency: int = 16
+    #: Ping in-process with ICMP datagram sockets where the operating system
+    #: permits it, falling back to the 'ping' command otherwise.
+    in_process: bool = False
+    #: Reuse per-host results younger than this many seconds.  0 disables.
+    cache_ttl: float = 0.0
 
     #: Time to report when unresponsive [sec]
     _unresponsive_time: ClassVar[float] = 100.0
+    #: Time to wait for each in-process echo reply [sec]
+    _echo_timeout: ClassVar[float] = 1.0
+    #: Whether ICMP datagram sockets are permitted (None if not yet known).
+    _socket_permitted: ClassVar[Optional[bool]] = None
+    #: (host, count) to (monotonic timestamp, TTL, result) of recent pings,
+    #: oldest first.
+    _host_cache: ClassVar[
+        Dict[Tuple[str, int], Tuple[float, float, PingResult]]
+    ] = {}
+    #: The maximum number of results in the host cache.
+    _host_cache_size: ClassVar[int] = 1024
+
+    @property
+    def _count(self) -> int:
+        """The number of ping attempts, ensuring we don't ping forever."""
+        return max(self.count, 1)
+
+    def _get_cached(self, host: str) -> Optional[PingResult]:
+        """Get a cached result for ``host``, if one is recent enough."""
+        if self.cache_ttl <= 0:
+            return None
+        try:
+            timestamp, _, result = self._host_cache[(host, self._count)]
+        except KeyError:
+            return None
+        if time.monotonic() - timestamp > self.cache_ttl:
+            return None
+        return result
 
-    async def ping(self, host: str) -> PingResult:
+    def _add_cached(self, host: str, result: PingResult) -> None:
+        """Cache the result for ``host``, evicting expired or old results."""
+        now = time.monotonic()
+        cache = self._host_cache
+        for key, (timestamp, ttl, _) in list(cache.items()):
+            if now - timestamp > ttl:
+                del cache[key]
+        key = (host, self._count)
+        # Re-insert, such that the cache remains ordered oldest first
+        cache.pop(key, None)
+        while len(cache) >= max(self._host_cache_size, 1):
+            del cache[next(iter(cache))]
+        cache[key] = (now, self.cache_ttl, result)
+
+    async def ping_subprocess(self, host: str) -> PingResult:
         """
-        Ping the given host.
+        Ping the given host using the 'ping' program.
+
+        Output is parsed line-by-line as it arrives.
 
         Parameters
         ----------
@@ -269,14 +505,10 @@ class Ping(Tool):
         -------
         PingResult
         """
-
-        # Ensure we don't ping forever:
-        count = min(self.count, 1)
-
         if sys.platform == "win32":
-            args = ("/n", str(count))
+            args = ("/n", str(self._count))
         else:
-            args = ("-c", str(count))
+            args = ("-c", str(self._count))
 
         ping = shutil.which("ping")
 
@@ -294,14 +526,123 @@ class Ping(Tool):
             stderr=asyncio.subprocess.DEVNULL,
         )
         assert proc.stdout is not None
-        output = await proc.stdout.read()
-        await proc.wait()
-        return PingResult.from_output(host, output.decode(self.encoding))
+        times = []
+        try:
+            async for line in proc.stdout:
+                times.extend(PingResult.parse_times(line.decode(self.encoding)))
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        return PingResult.from_times(
+            host, times, unresponsive_time=self._unresponsive_time
+        )
+
+    async def ping_socket(self, host: str) -> PingResult:
+        """
+        Ping the given host in-process using an ICMP datagram socket.
+
+        Parameters
+        ----------
+        host : str
+            The host to ping.
+
+        Raises
+        ------
+        PermissionError
+            If the operating system does not permit unprivileged ICMP sockets.
+
+        Returns
+        -------
+        PingResult
+        """
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        times = []
+        try:
+            sock.setblocking(False)
+            addr_info = await loop.getaddrinfo(
+                host, None, family=socket.AF_INET, type=socket.SOCK_DGRAM
+            )
+            address = addr_info[0][4][0]
+            # The kernel replaces the identifier with the socket's own.
+            ident = os.getpid() & 0xFFFF
+            for seq in range(self._count):
+                packet = _make_icmp_echo_request(ident, seq, b"atef-ping")
+                start = time.monotonic()
+                sock.sendto(packet, (address, 0))
+                try:
+                    await asyncio.wait_for(
+                        self._wait_for_echo(loop, sock, seq),
+                        timeout=self._echo_timeout,
+                    )
+                except asyncio.TimeoutError:
+                    continue
+                times.append(time.monotonic() - start)
+        finally:
+            sock.close()
+        return PingResult.from_times(
+            host, times, unresponsive_time=self._unresponsive_time
+        )
+
+    @staticmethod
+    async def _wait_for_echo(
+        loop: asyncio.AbstractEventLoop, sock: socket.socket, seq: int
+    ) -> None:
+        """Wait for the echo reply with sequence number ``seq``."""
+        while True:
+            data = await loop.sock_recv(sock, 1024)
+            if _parse_icmp_echo_reply(data) == seq:
+                return
+
+    async def ping(self, host: str) -> PingResult:
+        """
+        Ping the given host.
+
+        Uses a recent cached result if ``cache_ttl`` allows it, in-process
+        ICMP if requested and permitted, or the 'ping' program.
+
+        Parameters
+        ----------
+        host : str
+            The host to ping.
+
+        Returns
+        -------
+        PingResult
+        """
+        result = self._get_cached(host)
+        if result is not None:
+            return result
+
+        result = None
+        if self.in_process and Ping._socket_permitted is not False:
+            try:
+                result = await self.ping_socket(host)
+            except PermissionError:
+                logger.debug(
+                    "ICMP datagram sockets not permitted; falling back to "
+                    "the 'ping' program",
+                    exc_info=True,
+                )
+                Ping._socket_permitted = False
+            else:
+                Ping._socket_permitted = True
+
+        if result is None:
+            result = await self.ping_subprocess(host)
+
+        if self.cache_ttl > 0:
+            self._add_cached(host, result)
+        return result
 
     async def run(self) -> PingResult:
         """
         Run the "Ping" tool with the current settings.
 
+        At most ``max_concurrency`` hosts are pinged at the same time.
+
         Returns
         -------
         PingResult
@@ -312,25 +653,126 @@ class Ping(Tool):
             return result
 
         ping_by_host: Dict[str, Union[Exception, PingResult]] = {}
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
 
         async def _ping(host: str) -> None:
-            try:
-                ping_by_host[host] = await self.ping(host)
-            except Exception as ex:
-                ping_by_host[host] = ex
+            async with semaphore:
+                try:
+                    ping_by_host[host] = await self.ping(host)
+                except Exception as ex:
+                    ping_by_host[host] = ex
 
         tasks = [asyncio.create_task(_ping(host)) for host in self.hosts]
 
         try:
             await asyncio.wait(tasks)
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             for task in tasks:
                 task.cancel()
             raise
 
-        for host, host_result in ping_by_host.items():
-            result.add_host_result(
-                host, host_result, failure_time=self._unresponsive_time
-            )
+        for host in self.hosts:
+            if host in ping_by_host:
+                result.add_host_result(
+                    host, ping_by_host.pop(host), failure_time=self._unresponsive_time
+                )
+
+        return result
+
+
+@dataclass
+class PortCheck(Tool):
+    """
+    Tool for checking that one or more TCP ports accept connections.
+
+    This is a lightweight alternative to ``Ping`` that can also verify a
+    service (such as an IOC's Channel Access server port) is listening.
+    """
+    #: The targets to connect to, as ``host:port``.
+    targets: List[str] = field(default_factory=list)
+    #: Time to wait for each connection [sec]
+    timeout: float = 1.0
+    #: The maximum number of connections to attempt at the same time.
+    max_concurrency: int = 64
+
+    #: Time to report when unreachable [sec]
+    _unreachable_time: ClassVar[float] = 100.0
+
+    async def connect(self, target: str) -> float:
+        """
+        Open and close a TCP connection to the given target.
+
+        Parameters
+        ----------
+        target : str
+            The ``host:port`` target.
+
+        Raises
+        ------
+        OSError
+            If the connection was refused or failed.
+        asyncio.TimeoutError
+            If the connection was not established within ``timeout``.
+
+        Returns
+        -------
+        float
+            The time taken to connect, in seconds.
+        """
+        host, port = split_host_port(target)
+        start = time.monotonic()
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout=self.timeout
+        )
+        elapsed = time.monotonic() - start
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            # The peer hanging up on us first doesn't matter here
+            ...
+        return elapsed
+
+    async def run(self) -> PortCheckResult:
+        """
+        Run the "PortCheck" tool with the current settings.
+
+        At most ``max_concurrency`` connections are attempted at the same time.
+
+        Returns
+        -------
+        PortCheckResult
+        """
+        result = PortCheckResult(result=Result())
+
+        if not self.targets:
+            return result
+
+        by_target: Dict[str, Union[Exception, float]] = {}
+        semaphore = asyncio.Semaphore(max(self.max_concurrency, 1))
+
+        async def _connect(target: str) -> None:
+            async with semaphore:
+                try:
+                    by_target[target] = await self.connect(target)
+                except Exception as ex:
+                    by_target[target] = ex
+
+        tasks = [asyncio.create_task(_connect(target)) for target in self.targets]
+
+        try:
+            await asyncio.wait(tasks)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            for task in tasks:
+                task.cancel()
+            raise
+
+        for target in self.targets:
+            if target in by_target:
+                result.add_target_result(
+                    target,
+                    by_target.pop(target),
+                    failure_time=self._unreachable_time,
+                )
 
         return result
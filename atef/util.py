@@ -1,5 +1,6 @@
 import asyncio
 import concurrent.futures
+import datetime
 import functools
 import logging
 import pathlib
@@ -48,6 +49,7 @@ def get_happi_device_by_name(
     name: str,
     *,
     client: Optional[happi.Client] = None,
+    archive_timestamp: Optional[datetime.datetime] = None,
 ) -> ophyd.Device:
     """
     Get an instantiated device from the happi database by name.
@@ -60,6 +62,10 @@ def get_happi_device_by_name(
     client : happi.Client, optional
         The happi Client instance, if available.  Defaults to instantiating
         a temporary client with the environment configuration.
+
+    archive_timestamp : datetime.datetime, optional
+        If provided, instantiate an archived variant of the device that reads
+        archiver appliance data at this time.
     """
     if client is None:
         client = get_happi_client()
@@ -84,6 +90,9 @@ def get_happi_device_by_name(
         raise ex
 
     try:
+        if archive_timestamp is not None:
+            from .archive_device import load_archived_device
+            return load_archived_device(search_result.item, archive_timestamp)
         return search_result.get()
     except Exception as ex:
         logger.debug(
@@ -6,7 +6,8 @@ note that if a configuration fails to prepare, they will be skipped
 """
 from __future__ import annotations
 
-from typing import Generator, List, Tuple, Union
+from collections import defaultdict
+from typing import Dict, Generator, List, Tuple, Union
 
 from atef.check import Comparison
 from atef.config_model.active import (AnyPreparedProcedure,
@@ -175,3 +176,46 @@ def get_relevant_configs_comps(
             matched_c.append(comp)
 
     return matched_c
+
+
+def get_prepared_map(
+    prepared_file: Union[PreparedFile, PreparedProcedureFile],
+) -> Dict[int, List[Union[PreparedConfiguration, PreparedProcedureStep,
+                          PreparedComparison]]]:
+    """
+    Map each original configuration, step or comparison onto its prepared
+    counterparts in a single pass through ``prepared_file``.
+
+    Equivalent to calling ``get_relevant_configs_comps`` (passive) or
+    ``get_prepared_step`` (active) for every original dataclass, without
+    walking the file each time.
+
+    Parameters
+    ----------
+    prepared_file : Union[PreparedFile, PreparedProcedureFile]
+        the file containing the prepared dataclasses
+
+    Returns
+    -------
+    Dict[int, List[Union[PreparedConfiguration, PreparedProcedureStep,
+                         PreparedComparison]]]
+        the prepared dataclasses, keyed by the id of the original dataclass
+    """
+    prepared_map = defaultdict(list)
+    if isinstance(prepared_file, PreparedFile):
+        for config in prepared_file.walk_groups():
+            prepared_map[id(config.config)].append(config)
+
+        for comp in prepared_file.walk_comparisons():
+            prepared_map[id(comp.comparison)].append(comp)
+    elif isinstance(prepared_file, PreparedProcedureFile):
+        for pstep in walk_steps(prepared_file.root):
+            if getattr(pstep, 'origin', None) is not None:
+                prepared_map[id(pstep.origin)].append(pstep)
+            if hasattr(pstep, 'walk_comparisons'):
+                for comp in pstep.walk_comparisons():
+                    prepared_map[id(comp.comparison)].append(comp)
+    else:
+        raise TypeError(f'Unsupported prepared file type: {type(prepared_file)}')
+
+    return dict(prepared_map)
@@ -4,17 +4,29 @@ Widget classes designed for PV archiver interaction
 
 from __future__ import annotations
 
+import concurrent.futures
+import dataclasses
 import datetime
-import functools
 import itertools
+import json
 import logging
 import os
 import re
+import threading
+import time
 import urllib
-from typing import Any, ClassVar, Dict, List, Optional
+import urllib.error
+import urllib.request
+from typing import (Any, ClassVar, Dict, Iterable, List, Optional, Sequence,
+                    Tuple)
 
+from archapp.data import make_url
 from archapp.interactive import EpicsArchive
-from pydm.widgets.archiver_time_plot import PyDMArchiverTimePlot
+from archapp.url import url_quote
+from pydm.utilities import remove_protocol
+from pydm.widgets.archiver_time_plot import (MIN_TIME_SPAN,
+                                             ArchivePlotCurveItem,
+                                             PyDMArchiverTimePlot)
 from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtCore import Qt
 from qtpy.QtWidgets import QStyle, QWidget
@@ -34,6 +46,133 @@ color_cycle = itertools.cycle(
     [QtGui.QColor('red'), QtGui.QColor('blue'),
      QtGui.QColor('green'), QtGui.QColor('white')]
 )
+# The time span probed for archived data, and the samples expected in it
+PROBE_SPAN = datetime.timedelta(days=2)
+PROBE_MIN_SAMPLES = 3
+PROBE_TIMEOUT = 5.0
+PROBE_MAX_WORKERS = 8
+
+# Probe results by (appliance url, pv), shared by all viewers
+_pv_info_cache: Dict[Tuple[str, str], ArchivedPVInfo] = {}
+_pv_info_lock = threading.Lock()
+
+
+@dataclasses.dataclass(frozen=True)
+class ArchivedPVInfo:
+    """
+    Whether a PV is archived, and its metadata, as probed from an appliance.
+    """
+    #: The PV name.
+    pvname: str
+    #: True if the appliance knows of the PV.
+    archived: bool
+    #: The number of samples in the probed time span.
+    num_samples: int = 0
+    #: Metadata from the appliance (e.g., EGU and PREC).
+    meta: Dict[str, Any] = dataclasses.field(default_factory=dict)
+
+
+def probe_archived_pv(
+    appliance: EpicsArchive,
+    pv: str,
+    timeout: float = PROBE_TIMEOUT,
+) -> Optional[ArchivedPVInfo]:
+    """
+    Probe ``appliance`` for the metadata and number of recent samples of
+    ``pv``.
+
+    The samples are counted by the appliance (the ``ncount`` operator over
+    ``PROBE_SPAN``), such that only a few bins are transferred rather than the
+    data itself.  Unlike ``archapp``, this does not rely on ``SIGALRM`` for
+    timeouts, so probes may run in threads.
+
+    Returns
+    -------
+    ArchivedPVInfo or None
+        None if the appliance could not be reached.
+    """
+    end = datetime.datetime.now()
+    start = end - PROBE_SPAN
+    span = int(PROBE_SPAN.total_seconds())
+    url = url_quote(
+        make_url(appliance._data.base_url, f'ncount_{span}({pv})', start, end)
+    )
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            data = json.load(response)
+    except urllib.error.HTTPError as ex:
+        if 400 <= ex.code < 500:
+            return ArchivedPVInfo(pvname=pv, archived=False)
+        logger.debug('Unable to probe %s: %s', pv, ex)
+        return None
+    except (OSError, ValueError) as ex:
+        logger.debug('Unable to probe %s: %s', pv, ex)
+        return None
+
+    if isinstance(data, list):
+        data = data[0] if data else {}
+    if not data:
+        return ArchivedPVInfo(pvname=pv, archived=False)
+    meta = dict(data.get('meta', {}))
+    meta.pop('name', None)
+    return ArchivedPVInfo(
+        pvname=pv,
+        archived=True,
+        num_samples=sum(int(point['val']) for point in data.get('data', [])),
+        meta=meta,
+    )
+
+
+def get_archived_pv_infos(
+    appliance: EpicsArchive,
+    pvs: Iterable[str],
+) -> Dict[str, Optional[ArchivedPVInfo]]:
+    """
+    Get information on many PVs, probing uncached PVs concurrently.
+
+    Results are cached for the process, apart from failed probes.
+
+    Returns
+    -------
+    dict[str, ArchivedPVInfo or None]
+        Information by PV name, None where the appliance could not be
+        reached.
+    """
+    base_url = appliance._data.base_url
+    infos = {}
+    to_probe = []
+    with _pv_info_lock:
+        for pv in dict.fromkeys(pvs):
+            info = _pv_info_cache.get((base_url, pv), None)
+            if info is None:
+                to_probe.append(pv)
+            infos[pv] = info
+
+    if len(to_probe) == 1:
+        probed = {to_probe[0]: probe_archived_pv(appliance, to_probe[0])}
+    elif to_probe:
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(PROBE_MAX_WORKERS, len(to_probe))
+        ) as executor:
+            probed = dict(zip(
+                to_probe,
+                executor.map(lambda pv: probe_archived_pv(appliance, pv), to_probe)
+            ))
+    else:
+        probed = {}
+
+    with _pv_info_lock:
+        for pv, info in probed.items():
+            if info is not None:
+                _pv_info_cache[(base_url, pv)] = info
+    infos.update(probed)
+    return infos
+
+
+def clear_archived_pv_info_cache() -> None:
+    """Forget all probed PV information."""
+    with _pv_info_lock:
+        _pv_info_cache.clear()
 
 
 def get_archive_viewer() -> ArchiverViewerWidget:
@@ -103,13 +242,174 @@ class ArchiverError(Exception):
     ...
 
 
+def get_processing_command(
+    span: float,
+    bins: int,
+    sample_rate: float = 1.0,
+) -> str:
+    """
+    Choose the archiver appliance operator for a plot request.
+
+    Parameters
+    ----------
+    span : float
+        The time span requested, in seconds.
+    bins : int
+        The number of points the plot can usefully show.
+    sample_rate : float, optional
+        The expected number of samples per second.
+
+    Returns
+    -------
+    str
+        '' for raw data, if the expected samples fit in ``bins``.  Otherwise
+        ``optimized_{bins}``: the mean, standard deviation, minimum and
+        maximum of each of ``bins`` bins across the span.
+    """
+    if span * sample_rate <= bins:
+        return ''
+    return f'optimized_{bins}'
+
+
+class ArchiverTimePlot(PyDMArchiverTimePlot):
+    """
+    Archiver time plot that has the appliance reduce data to suit the plot.
+
+    Each curve's data is requested raw if its expected samples fit in the plot
+    width, and otherwise as a mean and min/max envelope per bin (see
+    ``get_processing_command``).  After zooming or panning, data is requested
+    again once the view settles, if the data on hand does not cover it at the
+    plot's resolution.
+    """
+    #: Plot pixels per bin of reduced data.
+    pixels_per_bin: ClassVar[int] = 2
+    #: The least number of bins to request.
+    min_bins: ClassVar[int] = 100
+
+    #: Expected samples per second by PV name.  1 Hz if unknown.
+    sample_rates: Dict[str, float]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sample_rates = {}
+        # Stay on the view requested, rather than the newest data
+        self._show_all = False
+        # (min_x, max_x, reduced) of the last request
+        self._requested_range: Optional[Tuple[float, float, bool]] = None
+        self._settle_timer = QtCore.QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.timeout.connect(self._view_settled)
+        self.plotItem.sigXRangeChanged.connect(self._view_changed)
+
+    def get_bins(self) -> int:
+        """The number of bins to request, from the plot width"""
+        width = int(self.plotItem.getViewBox().width())
+        return max(width // self.pixels_per_bin, self.min_bins)
+
+    def get_curve_processing_command(
+        self,
+        curve: ArchivePlotCurveItem,
+        min_x: float,
+        max_x: float
+    ) -> str:
+        """The appliance operator for requesting ``curve`` data"""
+        rate = self.sample_rates.get(remove_protocol(curve.address), 1.0)
+        return get_processing_command(max_x - min_x, self.get_bins(), rate)
+
+    def request_curve_data(
+        self,
+        curve: ArchivePlotCurveItem,
+        min_x: Optional[float] = None,
+        max_x: Optional[float] = None
+    ) -> bool:
+        """
+        Request archived data for a single curve, by default for the visible
+        time span.  Returns True if a request was sent.
+
+        Each request sent is counted as pending until its response arrives
+        (see ``archive_data_received``), with ``archive_request_started``
+        emitted when the first is sent.
+        """
+        if not (curve.use_archive_data and curve.isVisible()):
+            return False
+        if min_x is None or max_x is None:
+            view_min, view_max = self.plotItem.getAxis('bottom').range
+            if view_min == 0:
+                # Not yet rendered; the initial request includes the curve
+                return False
+            min_x = view_min if min_x is None else min_x
+            max_x = min(view_max, time.time()) if max_x is None else max_x
+        if not self._cache_data:
+            max_x = min(max_x, self._max_x)
+        if max_x - min_x <= MIN_TIME_SPAN:
+            return False
+
+        command = self.get_curve_processing_command(curve, min_x, max_x)
+        self._pending_archive_responses += 1
+        if self._pending_archive_responses == 1:
+            self.archive_request_started.emit()
+        curve.archive_data_request_signal.emit(min_x, max_x - 1, command)
+        reduced = bool(command)
+        if self._requested_range is not None:
+            reduced = reduced or self._requested_range[2]
+        self._requested_range = (min_x, max_x, reduced)
+        return True
+
+    def requestDataFromArchiver(
+        self,
+        min_x: Optional[float] = None,
+        max_x: Optional[float] = None
+    ) -> None:
+        """
+        Request archived data for all visible curves, reduced by the
+        appliance to suit the plot.  See
+        ``PyDMArchiverTimePlot.requestDataFromArchiver``.
+        """
+        if min_x is None:
+            min_x = self._min_x
+        self._requested_range = None
+        requests_sent = 0
+        for curve in self._curves:
+            curve_max_x = curve.min_x() if max_x is None else max_x
+            if self.request_curve_data(curve, min_x, curve_max_x):
+                requests_sent += 1
+
+        if not requests_sent:
+            self._archive_request_queued = False
+
+    def _view_changed(self, *args) -> None:
+        self._settle_timer.start(self.request_cooldown)
+
+    def _needs_request(self, min_x: float, max_x: float) -> bool:
+        """Whether the data on hand does not suit the view from min_x to max_x"""
+        if self._requested_range is None:
+            return True
+        req_min, req_max, reduced = self._requested_range
+        span = max_x - min_x
+        margin = 0.1 * span
+        if min_x < req_min - margin or min(max_x, time.time()) > req_max + margin:
+            # Panned or zoomed out beyond the data on hand
+            return True
+        # Zoomed in on reduced data, which is now too coarse
+        return reduced and (req_max - req_min) >= 2 * span
+
+    def _view_settled(self) -> None:
+        """Request data for the settled view, if needed"""
+        if not self._curves or self.auto_scroll_timer.isActive():
+            return
+        min_x, max_x = self.plotItem.getViewBox().viewRange()[0]
+        if min_x <= 0 or not self._needs_request(min_x, max_x):
+            return
+        self.requestDataFromArchiver(min_x, min(max_x, time.time()))
+
+
 class ArchiverViewerWidget(DesignerDisplay, QWidget):
     """
     Archiver time plot viewer
     """
     filename: ClassVar[str] = 'archive_viewer_widget.ui'
 
-    time_plot: PyDMArchiverTimePlot
+    time_plot: ArchiverTimePlot
     button_month: QtWidgets.QPushButton
     button_week: QtWidgets.QPushButton
     button_day: QtWidgets.QPushButton
@@ -171,6 +471,8 @@ class ArchiverViewerWidget(DesignerDisplay, QWidget):
         # set up table view for PV info
         self.model = PVModel(parent=self)
         self.curve_list.setModel(self.model)
+        self._curves = {}
+        self.model.rowsRemoved.connect(self.update_curves)
         horiz_header = self.curve_list.horizontalHeader()
         horiz_header.setSectionResizeMode(horiz_header.ResizeToContents)
 
@@ -249,26 +551,49 @@ class ArchiverViewerWidget(DesignerDisplay, QWidget):
         self.input_field.returnPressed.connect(_add_item)
 
     def update_curves(self):
-        """Clears the timeplot and adds any PV's present in the PVModel"""
+        """
+        Updates the timeplot to match the PVModel: removes curves of PV's no
+        longer present, restyles the others and adds curves for new PV's.
+        Only new curves request archived data.
+        """
         # grab all the list items
         pv_data = self.curve_list.model().pvs
 
-        # Re-add curves
-        self.time_plot.clearCurves()
-        for pv in pv_data:
-
-            data = self.get_pv_data_snippet(pv[0])
-
-            self.time_plot.addYChannel(
-                y_channel=f'ca://{pv[0]}',
-                name=f'{pv[0]} ({data["meta"].get("EGU", "")})',
-                symbol=pv[1]['symbol'],
-                color=pv[1]['color'],
-                lineStyle=pv[1]['lineStyle'],
-                lineWidth=pv[1]['lineWidth'],
+        for pv in set(self._curves) - {pv[0] for pv in pv_data}:
+            curve = self._curves.pop(pv)
+            curve.remove_error_bar()
+            self.time_plot.removeYChannel(curve)
+
+        infos = self.get_pv_infos([pv[0] for pv in pv_data])
+        span = PROBE_SPAN.total_seconds()
+        for pv, style in pv_data:
+            curve = self._curves.get(pv)
+            if curve is not None:
+                curve.color = style['color']
+                curve.symbol = style['symbol']
+                curve.lineStyle = style['lineStyle']
+                curve.lineWidth = style['lineWidth']
+                continue
+
+            info = infos.get(pv)
+            units = ""
+            if info is not None:
+                units = info.meta.get("EGU", "")
+                if info.num_samples:
+                    self.time_plot.sample_rates[pv] = info.num_samples / span
+
+            curve = self.time_plot.addYChannel(
+                y_channel=f'ca://{pv}',
+                name=f'{pv} ({units})',
+                symbol=style['symbol'],
+                color=style['color'],
+                lineStyle=style['lineStyle'],
+                lineWidth=style['lineWidth'],
                 useArchiveData=True,
                 yAxisName='yAxis'
             )
+            self._curves[pv] = curve
+            self.time_plot.request_curve_data(curve)
 
         try:
             self.time_plot.setLabel('yAxis', text='')
@@ -294,8 +619,7 @@ class ArchiverViewerWidget(DesignerDisplay, QWidget):
     ) -> None:
         """
         Adds a PV to the ArchiverViewerWidget's PVModel
-        Ensures PV's have at least 3 data points in the archiver before
-        adding a PV to the model
+        Warns if PV's have fewer than 3 data points in the archiver
 
         Updates the time plot widget and clears the input field if
         successful
@@ -308,43 +632,60 @@ class ArchiverViewerWidget(DesignerDisplay, QWidget):
             the ophyd attribute name corresponding to the ``pv``,
             by default None
         """
-        # check if data exists
-        data = self.get_pv_data_snippet(pv)
-        if data and len(data['data']) < 3:
-            logger.warning(
-                'Fewer than 3 datapoints from last two days found in '
-                f'archiver app for pv ({pv})'
-            )
+        self.add_signals([(pv, dev_attr)], update_curves=update_curves)
 
-        success = self.model.add_signal(pv, dev_attr=dev_attr)
+    def add_signals(
+        self,
+        signals: Sequence[Tuple[str, Optional[str]]],
+        update_curves: bool = True
+    ) -> None:
+        """
+        Adds many PVs to the ArchiverViewerWidget's PVModel, checking the
+        archiver for them all at once.  See ``add_signal``.
+
+        Parameters
+        ----------
+        signals : Sequence[Tuple[str, Optional[str]]]
+            (pv, dev_attr) pairs to be added
+        """
+        infos = self.get_pv_infos([pv for pv, _ in signals])
+        success = False
+        for pv, dev_attr in signals:
+            info = infos.get(pv)
+            if info is not None and not info.archived:
+                logger.warning(f'pv ({pv}) not found in archiver app')
+            elif info is not None and info.num_samples < PROBE_MIN_SAMPLES:
+                logger.warning(
+                    f'Fewer than {PROBE_MIN_SAMPLES} datapoints from last '
+                    f'{PROBE_SPAN.days} days found in archiver app for pv ({pv})'
+                )
+
+            success = self.model.add_signal(pv, dev_attr=dev_attr) or success
 
         if success and update_curves:
             self.update_curves()
             self.input_field.clear()
 
-    @functools.lru_cache()
-    def get_pv_data_snippet(self, pv: str) -> Dict[str, Any]:
+    def get_pv_info(self, pv: str) -> Optional[ArchivedPVInfo]:
         """
-        Queries archapp.EpicsArchive for a small amount of data for use
-        in verifying the PV
+        Get the (cached) archiver information for a PV, used in verifying the
+        PV and labeling its curve
 
         Parameters
         ----------
         pv : str
-            the pv to get data for
+            the pv to get information for
 
         Returns
         -------
-        Dict[str, Any]
-            data dictionary, with keys ['data', 'meta']
+        Optional[ArchivedPVInfo]
+            the PV information, or None if the archiver could not be reached
         """
-        # use get_raw for json metadata
-        # also sidesteps an issue where some PV's aren't found using
-        # the normal EpicsArchive.get()
-        today = datetime.datetime.today()
-        prev = today - datetime.timedelta(days=2)
-        data = self.archapp._data.get_raw(pv, prev, today)
-        return data
+        return self.get_pv_infos([pv])[pv]
+
+    def get_pv_infos(self, pvs: Iterable[str]) -> Dict[str, Optional[ArchivedPVInfo]]:
+        """Get the (cached) archiver information for many PVs at once"""
+        return get_archived_pv_infos(self.archapp, pvs)
 
 
 class PVModel(QtCore.QAbstractTableModel):
@@ -260,8 +260,7 @@ class NameDescTagsWidget(DesignerDisplay, NameMixin, DataWidget):
                 self.action_button.hide()
                 return
             widget = get_archive_viewer()
-            for pv, dev_attr in pv_list:
-                widget.add_signal(pv, dev_attr=dev_attr, update_curves=False)
+            widget.add_signals(pv_list, update_curves=False)
             widget.update_curves()
             widget.show()
 
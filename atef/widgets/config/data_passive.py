@@ -21,7 +21,7 @@ from atef.config_model.passive import (Configuration, ConfigurationGroup,
 from atef.enums import Severity
 from atef.qt_helpers import QDataclassList
 from atef.reduce import ReduceMethod
-from atef.tools import Ping
+from atef.tools import Ping, PortCheck
 from atef.widgets.config.data_base import DataWidget, SimpleRowWidget
 from atef.widgets.config.utils import (BulkListWidget, ComponentListWidget,
                                        DeviceListWidget, setup_line_edit_data,
@@ -35,6 +35,7 @@ class ConfigurationGroupWidget(DesignerDisplay, DataWidget):
     The fields handled here are:
     - values: dict[str, Any]
     - mode: GroupResultMode
+    - short_circuit: bool
     The configs field will be modified by the ConfigurationGroupRowWidget,
     which is intended to be used many times, once each to handle each
     sub-Configuration instance.
@@ -46,6 +47,7 @@ class ConfigurationGroupWidget(DesignerDisplay, DataWidget):
     add_value_button: QPushButton
     del_value_button: QPushButton
     mode_combo: QComboBox
+    short_circuit_check: QCheckBox
 
     adding_new_row: bool
 
@@ -63,6 +65,12 @@ class ConfigurationGroupWidget(DesignerDisplay, DataWidget):
         self.mode_combo.activated.connect(self.update_mode_bridge)
         # Set the initial combobox state
         self.update_mode_combo(self.bridge.mode.get())
+        # Short-circuit checkbox
+        self.bridge.short_circuit.changed_value.connect(
+            self.short_circuit_check.setChecked
+        )
+        self.short_circuit_check.clicked.connect(self.bridge.short_circuit.put)
+        self.short_circuit_check.setChecked(self.bridge.short_circuit.get())
         self.add_value_button.clicked.connect(self.add_value_to_table)
         self.adding_new_row = False
         for name, value in self.bridge.values.get().items():
@@ -447,6 +455,53 @@ class PingWidget(DesignerDisplay, DataWidget):
         self.bridge.count.put(self.count_spinbox.value())
 
 
+class PortCheckWidget(DesignerDisplay, DataWidget):
+    """
+    Widget that modifies the fields in the PortCheck tool.
+    These fields are:
+    - targets: List[str] = field(default_factory=list)
+    - timeout: float = 1.0
+    - max_concurrency: int = 64
+    This will include a list widget on the left for the
+    targets and a basic form on the right for the other
+    fields.
+    """
+    filename = "port_check_widget.ui"
+
+    targets_frame: QFrame
+    settings_frame: QFrame
+    timeout_edit: QLineEdit
+    concurrency_spinbox: QSpinBox
+
+    targets_widget: BulkListWidget
+
+    def __init__(self, data: PortCheck, **kwargs):
+        super().__init__(data=data, **kwargs)
+        # Add the list widget
+        self.targets_widget = BulkListWidget(
+            data_list=self.bridge.targets,
+        )
+        self.targets_frame.layout().addWidget(self.targets_widget)
+        # Set up the static fields
+        setup_line_edit_data(
+            self.timeout_edit,
+            self.bridge.timeout,
+            float,
+            str,
+        )
+        self.concurrency_spinbox.setValue(self.bridge.max_concurrency.get())
+        self.concurrency_spinbox.editingFinished.connect(self.concurrency_edited)
+        self.bridge.max_concurrency.changed_value.connect(
+            self.concurrency_spinbox.setValue
+        )
+
+    def concurrency_edited(self) -> None:
+        """
+        If the user edits the concurrency limit, update the dataclass.
+        """
+        self.bridge.max_concurrency.put(self.concurrency_spinbox.value())
+
+
 class ConfigurationGroupRowWidget(DesignerDisplay, SimpleRowWidget):
     """
     A row summary of a ``Configuration`` instance of a ``ConfigurationGroup``.
@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import copy
-import json
 import logging
 import os
 import re
@@ -13,7 +12,7 @@ from typing import (TYPE_CHECKING, Any, ClassVar, Dict, Iterable, List,
 
 import happi
 import qtawesome as qta
-from apischema import ValidationError, serialize
+from apischema import ValidationError
 from pcdsutils.qt.callbacks import WeakPartialMethodSlot
 from qtpy import QtCore, QtWidgets
 from qtpy.QtCore import Property as QProperty
@@ -31,6 +30,7 @@ from atef.find_replace import (FindReplaceAction, MatchFunction,
                                get_default_match_fn, get_default_replace_fn,
                                get_item_from_path, patch_client_cache,
                                simplify_path, walk_find_match)
+from atef.serialization import dumps_json, gc_paused, get_serializer
 from atef.type_hints import AnyPath
 from atef.util import get_happi_client
 from atef.widgets.config.run_base import create_tree_from_file
@@ -195,10 +195,11 @@ class FindReplaceWidget(DesignerDisplay, QtWidgets.QWidget):
             return
 
         # get serialized
-        serialized = serialize(type(self.orig_file), self.orig_file)
+        with gc_paused():
+            serialized = get_serializer(type(self.orig_file))(self.orig_file)
         try:
             with open(self.output_fp, 'w') as fd:
-                json.dump(serialized, fd, indent=2)
+                fd.write(dumps_json(serialized))
                 # Ends file on newline as per pre-commit
                 fd.write('\n')
         except OSError:
@@ -1271,10 +1272,11 @@ class FillTemplatePage(DesignerDisplay, QtWidgets.QWidget):
             filename += '.json'
 
         # get serialized
-        serialized = serialize(type(self.orig_file), self.orig_file)
+        with gc_paused():
+            serialized = get_serializer(type(self.orig_file))(self.orig_file)
         try:
             with open(filename, 'w') as fd:
-                json.dump(serialized, fd, indent=2)
+                fd.write(dumps_json(serialized))
                 # Ends file on newline as per pre-commit
                 fd.write('\n')
         except OSError:
@@ -48,7 +48,8 @@ from atef.config_model.passive import (Configuration, ConfigurationFile,
                                        PreparedTemplateConfiguration,
                                        PVConfiguration, TemplateConfiguration,
                                        ToolConfiguration)
-from atef.tools import Ping, PingResult, Tool, ToolResult
+from atef.tools import (Ping, PingResult, PortCheck, PortCheckResult, Tool,
+                        ToolResult)
 from atef.type_hints import AnyDataclass
 from atef.widgets.config.data_active import (CheckRowWidget,
                                              GeneralProcedureWidget,
@@ -71,8 +72,8 @@ from .data_passive import (AnyComparisonWidget, AnyValueWidget,
                            EqualsWidget, GeneralComparisonWidget,
                            GreaterOrEqualWidget, GreaterWidget,
                            LessOrEqualWidget, LessWidget, NotEqualsWidget,
-                           PingWidget, PVConfigurationWidget, RangeWidget,
-                           ValueSetWidget)
+                           PingWidget, PortCheckWidget, PVConfigurationWidget,
+                           RangeWidget, ValueSetWidget)
 from .utils import (MultiModeValueEdit, TableWidgetWithAddRow, TreeItem,
                     cast_dataclass, describe_comparison_context,
                     describe_step_context, gather_relevant_identifiers,
@@ -1195,7 +1196,7 @@ class ToolConfigurationPage(DesignerDisplay, PageWidget):
     """
     Page that handles all components of a ToolConfiguration.
 
-    Currently this is just the "Ping" tool but other tools
+    Currently this is the "Ping" and "PortCheck" tools but other tools
     can be added.
     """
     filename = 'tool_configuration_page.ui'
@@ -1210,6 +1211,7 @@ class ToolConfigurationPage(DesignerDisplay, PageWidget):
     # Defines the valid tools, their result structs, and edit widgets
     tool_map: ClassVar[Dict[Type[Tool], Tuple[Type[ToolResult], Type[DataWidget]]]] = {
         Ping: (PingResult, PingWidget),
+        PortCheck: (PortCheckResult, PortCheckWidget),
     }
     tool_names: Dict[str, Type[Tool]]
 
@@ -1235,7 +1237,8 @@ class ToolConfigurationPage(DesignerDisplay, PageWidget):
             for tool in self.tool_map:
                 self.tool_select_combo.addItem(tool.__name__)
                 self.tool_names[tool.__name__] = tool
-            self.tool_select_combo.activated.connect(self.new_tool_selected)
+            self.tool_select_combo.setCurrentText(type(self.data.tool).__name__)
+            self.tool_select_combo.textActivated.connect(self.new_tool_selected)
 
         self.comparisons_table.set_page(1)
         self.setup_name_desc_tags_link()
@@ -1409,7 +1412,7 @@ class ToolConfigurationPage(DesignerDisplay, PageWidget):
         if isinstance(self.data.tool, tool_type):
             return
         new_tool = tool_type()
-        self.new_tool_widget(new_tool)
+        self.new_tool(new_tool)
 
 
 class TemplateConfigurationPage(DesignerDisplay, PageWidget):
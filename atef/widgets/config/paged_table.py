@@ -1,3 +1,4 @@
+import bisect
 import logging
 import math
 from typing import Any, Callable, List, Optional
@@ -20,7 +21,10 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
     by text to filter those rows further.
 
     Major components include:
-    - source model: contains all data, sort-filter-proxy model, and table view.
+    - source model: contains all data
+    - paged proxy model: holds only the rows of the current page that match
+      the search text
+    - table view: creates row widgets for the rows on the current page
 
     PagedTableWidget is designed to custom row widgets for each item saved to
     the source model.  These widgets are expected to take the stored data as an
@@ -93,7 +97,6 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
         self.set_title(title)
         self.table_view.horizontalHeader().setStretchLastSection(True)
         self.table_view.verticalHeader().hide()
-        self.proxy_model.sort(-1)
 
         if item_list:
             for item in item_list:
@@ -108,6 +111,7 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
         self.prev_button.clicked.connect(self.prev_page)
         self.next_button.clicked.connect(self.next_page)
         self.search_edit.textChanged.connect(self.update_table)
+        self.proxy_model.modelReset.connect(self.setup_page_rows)
         self.update_table()
 
     def set_title(self, title: Optional[str] = None) -> None:
@@ -126,13 +130,16 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
 
     def update_table(self) -> None:
         """
-        Update the proxy model with filter information, re-filter the related
-        rows, and enable the delegates for visible rows
+        Update the proxy model with filter information, apply any pending
+        changes to the shown rows, and enable the delegates for visible rows
         """
-        # Update search
-        self.proxy_model.search_regexp.setPattern(self.search_edit.text())
-        self.proxy_model.invalidateFilter()
-        # post-model refresh setup
+        self.proxy_model.set_search_pattern(self.search_edit.text())
+        if self.proxy_model.update_pending:
+            self.proxy_model.update_page()
+        self.setup_page_rows()
+
+    def setup_page_rows(self) -> None:
+        """Open the delegates for the rows on the current page"""
         for i in range(self.proxy_model.rowCount()):
             index = self.proxy_model.index(i, 0)
             # Delegates normally only open editor if requested.  Request all
@@ -143,9 +150,10 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
             if widget:
                 self.table_view.setRowHeight(i, widget.sizeHint().height())
         # reset total pages
-        self.page_count_label.setText(f'/ {self.proxy_model.total_pages}')
-        self.page_spinbox.setMaximum(self.proxy_model.total_pages)
-        if self.proxy_model.total_pages > 0:
+        total_pages = self.proxy_model.total_pages
+        self.page_count_label.setText(f'/ {total_pages}')
+        self.page_spinbox.setMaximum(total_pages)
+        if total_pages > 0:
             self.page_spinbox.setMinimum(1)
 
     def show_page(self, page_no: int):
@@ -157,16 +165,7 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
         page_no : int
             page number to show
         """
-        # set page 0 to clear history effects
-        # I don't like how this is, but apparently filterAcceptsRow gets called
-        # first on the rows that were already showing.  Because the proxy model
-        # accepts the first (page_size) valid rows, this breaks the sorting
-        # So, we need to clear this history
-        self.proxy_model.curr_page = 0
-        self.proxy_model.invalidateFilter()  # This shouldn't take long, not drawing
-
-        # set proper page for filter model
-        self.proxy_model.curr_page = page_no
+        self.proxy_model.set_page(page_no)
         self.update_table()
 
     def set_page(self, page_no: int) -> None:
@@ -186,7 +185,7 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
     def show_row_for_data(self, data: Any, role: int = USER_DATA_ROLE) -> None:
         """
         Modify the page to show the row containing ``data``.  If data is hidden
-        by the filters
+        by the filters, stay on the current page
 
         Parameters
         ----------
@@ -195,23 +194,16 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
         role : int, optional
             data-role to look in, by default USER_DATA_ROLE
         """
-        orig_page = self.proxy_model.curr_page
+        page_no = None
+        index = self.find_data_index(data, role)
+        if index is not None:
+            page_no = self.proxy_model.page_of_source_row(index.row())
 
-        for page_num in range(self.proxy_model.total_pages):
-            # reset filter without enabling persistent delegates
-            self.proxy_model.curr_page = 0
-            self.proxy_model.invalidateFilter()
-            # set proper page for filter model
-            self.proxy_model.curr_page = page_num + 1
-            self.proxy_model.invalidateFilter()
+        if page_no is None:
+            # current filters hide ``data``, return to original page
+            page_no = self.proxy_model.curr_page
 
-            for row in range(self.proxy_model.rowCount()):
-                if self.proxy_model.index(row, 0).data(role) is data:
-                    self.set_page(page_num + 1)
-                    return
-
-        # current filters hide ``data``, return to original page
-        self.set_page(orig_page)
+        self.set_page(page_no)
 
     def refresh(self) -> None:
         """Refresh the widget.  (re-applies filters, returning to current page)"""
@@ -357,106 +349,237 @@ class PagedTableWidget(DesignerDisplay, QtWidgets.QWidget):
         self.refresh()
 
 
-class PagedProxyModel(QtCore.QSortFilterProxyModel):
+class PagedProxyModel(QtCore.QAbstractProxyModel):
     """
-    A QSortFilterProxyModel that filters based on search text and the set page
-    size.  Page size determines the number of rows per page.
+    A proxy model showing a single page of the source rows that match the
+    search text.  Page size determines the number of rows per page.
+
+    The searchable text of each source row (``Qt.ToolTipRole``) is cached,
+    and the matching rows are only recomputed when the search text or the
+    source model changes.  Turning a page slices the matching rows, so the
+    proxy (and its view) only ever hold the rows of the current page.
     """
     def __init__(self, *args, page_size=3, max_page_size=50, **kwargs):
         super().__init__(*args, **kwargs)
-        self.page_size = page_size
         self.max_page_size = max_page_size
+        self.page_size = page_size
         self.curr_page = 1
         self.search_regexp = QtCore.QRegularExpression()
 
-        self.total_pages = 0
-
-        self.total_displayed = 0
-        self.total_allowed = 0
-        self.min_count = self.curr_page * self.page_size
-        self.max_count = self.min_count + self.page_size
-
-    def invalidateFilter(self) -> None:
-        """Reset count variables and set the count range for the current page"""
-        self.page_size = min(self.page_size, self.max_page_size)
-        self.total_pages = 0
-
-        self.total_displayed = 0
-        self.total_allowed = 0
-
-        self.min_count = (self.curr_page - 1) * self.page_size
-        self.max_count = self.min_count + self.page_size
-
-        return super().invalidateFilter()
-
-    def process_row(
+        # Searchable text for each source row, None for rows without data
+        self._search_text: Optional[List[Optional[str]]] = None
+        # Source rows matching the search, in order
+        self._filtered_rows: Optional[List[int]] = None
+        # Source rows on the current page, tracking source model changes
+        self._page_indexes: List[QtCore.QPersistentModelIndex] = []
+
+        # Coalesces updates after bursts of source model changes
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.update_page)
+
+    @property
+    def page_size(self) -> int:
+        """The number of rows per page, limited by ``max_page_size``"""
+        return self._page_size
+
+    @page_size.setter
+    def page_size(self, page_size: int) -> None:
+        self._page_size = max(1, min(page_size, self.max_page_size))
+
+    @property
+    def total_pages(self) -> int:
+        """The number of pages holding rows that match the search"""
+        return math.ceil(len(self.filtered_rows()) / self.page_size)
+
+    @property
+    def update_pending(self) -> bool:
+        """True if the current page is out of date with the source model"""
+        return self._update_timer.isActive()
+
+    def setSourceModel(self, source_model: QtCore.QAbstractItemModel) -> None:
+        """Set the source model, and follow its changes"""
+        super().setSourceModel(source_model)
+        # structural changes may invalidate the shown rows, update immediately
+        source_model.rowsRemoved.connect(self._source_rows_removed)
+        source_model.rowsMoved.connect(self._source_rows_removed)
+        source_model.modelReset.connect(self._source_rows_removed)
+        source_model.layoutChanged.connect(self._source_rows_removed)
+        # insertions come in bursts, and shown rows remain valid
+        source_model.rowsInserted.connect(self._source_rows_inserted)
+        source_model.dataChanged.connect(self._source_data_changed)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop all cached information and update the current page"""
+        self._search_text = None
+        self._filtered_rows = None
+        self.update_page()
+
+    def _source_rows_removed(self, *args, **kwargs) -> None:
+        self.invalidate()
+
+    def _source_rows_inserted(self, *args, **kwargs) -> None:
+        self._search_text = None
+        self._filtered_rows = None
+        self._update_timer.start(0)
+
+    def _source_data_changed(
         self,
-        accepted: bool,
-        allowed: bool,
-        reason: Optional[str] = None
-    ) -> bool:
-        """
-        Process the row, and remember how many rows passed.
-        Rows can be valid but not shown, reducing the page count.
-
-        Parameters
-        ----------
-        accepted : bool
-            row is accepted, will be displayed
-        allowed : bool
-            row has passed filter criteria, but is not necessarily displayed
-        reason : Optional[str], optional
-            reason for the decision, for logging purposes, by default None
+        top_left: QModelIndex,
+        bottom_right: QModelIndex,
+        *args,
+        **kwargs
+    ) -> None:
+        if self._search_text is not None:
+            for row in range(top_left.row(), bottom_right.row() + 1):
+                self._search_text[row] = self._get_row_text(row)
+        self._filtered_rows = None
+        self._update_timer.start(0)
+
+    def _get_row_text(self, row: int) -> Optional[str]:
+        """The searchable text for ``row``, or None if it holds no data"""
+        index = self.sourceModel().index(row, 0)
+        if not index.data(USER_DATA_ROLE):
+            return None
+        return index.data(Qt.ToolTipRole) or ''
+
+    def filtered_rows(self) -> List[int]:
+        """The source rows matching the search, recomputed only as needed"""
+        if self._filtered_rows is not None:
+            return self._filtered_rows
 
-        Returns
-        -------
-        bool
-            ``accepted``, whether or not the row will be displayed
-        """
-        if accepted and not allowed:
-            self.total_displayed += 1
+        source = self.sourceModel()
+        if source is None:
+            return []
+
+        if self._search_text is None:
+            self._search_text = [
+                self._get_row_text(row) for row in range(source.rowCount())
+            ]
+
+        if self.search_regexp.pattern():
+            match = self.search_regexp.match
+            self._filtered_rows = [
+                row for row, text in enumerate(self._search_text)
+                if text is not None and match(text).hasMatch()
+            ]
+        else:
+            self._filtered_rows = [
+                row for row, text in enumerate(self._search_text)
+                if text is not None
+            ]
+        return self._filtered_rows
+
+    def set_search_pattern(self, pattern: str) -> None:
+        """Filter rows by ``pattern``, updating the page if it changed"""
+        if pattern == self.search_regexp.pattern():
+            return
+        self.search_regexp.setPattern(pattern)
+        self._filtered_rows = None
+        self.update_page()
 
-        if allowed:
-            self.total_allowed += 1
-            self.total_pages = math.ceil(
-                self.total_allowed / self.page_size
-            )
-        return accepted
+    def set_page(self, page_no: int) -> None:
+        """Show page #``page_no``"""
+        self.curr_page = page_no
+        self.update_page()
 
-    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+    def page_of_source_row(self, row: int) -> Optional[int]:
         """
-        Assess whether the row at ``source_row`` will be displayed
+        The page showing source row ``row``, or None if it does not match the
+        search
 
         Parameters
         ----------
-        source_row : int
-            row in the source model
-        source_parent : QModelIndex
-            parent index.  Unused here, used in TreeViews
+        row : int
+            the row in the source model
 
         Returns
         -------
-        bool
-            whether the row will be displayed
+        Optional[int]
+            the page number
         """
+        rows = self.filtered_rows()
+        position = bisect.bisect_left(rows, row)
+        if position < len(rows) and rows[position] == row:
+            return position // self.page_size + 1
+        return None
+
+    def update_page(self) -> None:
+        """Slice the rows for the current page from the matching rows"""
+        self._update_timer.stop()
+        rows = self.filtered_rows()
+        start = max(self.curr_page - 1, 0) * self.page_size
+        if self.curr_page < 1:
+            # No page shown
+            rows = []
+
         source = self.sourceModel()
-        index = source.index(source_row, self.filterKeyColumn(), source_parent)
-
-        inside_page_range = ((self.total_allowed >= self.min_count)
-                             and (self.total_allowed < self.max_count))
-        row_text = source.data(index, Qt.ToolTipRole)
-        text_match = self.search_regexp.match(row_text).hasMatch()
-
-        if not source.data(index, Qt.UserRole+1):
-            return self.process_row(False, False, reason='No Data, ignoring row')
-        elif not text_match:
-            return self.process_row(False, False, reason="Text match failed")
-        elif (self.total_displayed >= self.page_size):
-            return self.process_row(False, True, reason='Outside page range')
-        elif inside_page_range and text_match:
-            return self.process_row(True, True, reason="Inside Page Range, text match")
-
-        return self.process_row(False, True, reason="Default")
+        self.beginResetModel()
+        self._page_indexes = [
+            QtCore.QPersistentModelIndex(source.index(row, 0))
+            for row in rows[start:start + self.page_size]
+        ]
+        self.endResetModel()
+
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        """Qt hook: map an index of this model to the source model"""
+        if not proxy_index.isValid():
+            return QModelIndex()
+        try:
+            source_index = self._page_indexes[proxy_index.row()]
+        except IndexError:
+            return QModelIndex()
+        if not source_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(source_index.row(), proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        """Qt hook: map an index of the source model to this model"""
+        if not source_index.isValid():
+            return QModelIndex()
+        for row, page_index in enumerate(self._page_indexes):
+            if page_index.row() == source_index.row():
+                return self.index(row, source_index.column())
+        return QModelIndex()
+
+    def index(
+        self,
+        row: int,
+        column: int,
+        parent: QModelIndex = QModelIndex()
+    ) -> QModelIndex:
+        """Qt hook: the index for ``row`` and ``column``"""
+        if parent.isValid() or not (0 <= row < len(self._page_indexes)):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        """Qt hook: rows have no parents"""
+        return QModelIndex()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Qt hook: the number of rows on the current page"""
+        if parent.isValid():
+            return 0
+        return len(self._page_indexes)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Qt hook: the number of columns in the source model"""
+        if parent.isValid() or self.sourceModel() is None:
+            return 0
+        return self.sourceModel().columnCount()
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.DisplayRole
+    ) -> Any:
+        """Qt hook: horizontal headers come from the source model"""
+        if orientation == Qt.Horizontal and self.sourceModel() is not None:
+            return self.sourceModel().headerData(section, orientation, role)
+        return super().headerData(section, orientation, role)
 
 
 class CustDelegate(QtWidgets.QStyledItemDelegate):
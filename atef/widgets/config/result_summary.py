@@ -5,7 +5,7 @@ from __future__ import annotations
 
 import csv
 import dataclasses
-from typing import Any, List, Optional, Set, Union
+from typing import Any, ClassVar, Dict, List, Optional, Set, Tuple, Union
 
 from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtCore import Qt
@@ -13,10 +13,11 @@ from qtpy.QtCore import Qt
 from atef.config_model.active import PreparedProcedureFile
 from atef.config_model.passive import PreparedFile
 from atef.enums import Severity
+from atef.qt_helpers import get_asyncio_worker
 from atef.type_hints import AnyDataclass
 from atef.walk import walk_config_file, walk_procedure_file
 from atef.widgets.core import DesignerDisplay
-from atef.widgets.utils import insert_widget
+from atef.widgets.utils import UpdateCoalescer, insert_widget
 
 
 @dataclasses.dataclass
@@ -28,6 +29,12 @@ class ResultInfo:
     # An un-prepared dataclass, to match the tree views (will not hold the result)
     origin: AnyDataclass
 
+    # The prepared dataclass holding the result, if available
+    source: Optional[Any] = None
+
+    # Whether the item was skipped, as the result of its group was decided
+    skipped: bool = False
+
     @property
     def type(self) -> str:
         return type(self.origin).__name__
@@ -36,11 +43,77 @@ class ResultInfo:
     def name(self) -> str:
         return getattr(self.origin, 'name', '')
 
+    def update(self) -> bool:
+        """
+        Re-read the result from ``source``.
+
+        Returns
+        -------
+        bool
+            True if the status or reason changed
+        """
+        if self.source is None:
+            return False
+        result = self.source.result
+        status, reason = result.severity, result.reason or ''
+        if (status, reason, result.skipped) == (
+            self.status, self.reason, self.skipped
+        ):
+            return False
+        self.status, self.reason = status, reason
+        self.skipped = result.skipped
+        return True
+
+    @property
+    def status_text(self) -> str:
+        """The status for display: "skipped", or the severity name."""
+        return "skipped" if self.skipped else self.status.name
+
+
+def gather_result_info(
+    file: Union[PreparedFile, PreparedProcedureFile]
+) -> List[ResultInfo]:
+    """Gather ResultInfo for each result-holding item in a prepared file"""
+    data = []
+    if isinstance(file, PreparedFile):
+        datac = [cfg_tuple[0] for cfg_tuple in walk_config_file(file.root)]
+        for c in datac:
+            origin = getattr(c, 'config', None) or getattr(c, 'comparison', None)
+            if origin is None:
+                raise ValueError('could not find origin of passive component')
+            info = ResultInfo(
+                status=c.result.severity,
+                reason=c.result.reason or '',
+                origin=origin,
+                source=c,
+                skipped=c.result.skipped,
+            )
+            data.append(info)
+    elif isinstance(file, PreparedProcedureFile):
+        datac = [st_tuple[0] for st_tuple in walk_procedure_file(file.root)]
+        for s in datac:
+            origin = getattr(s, 'origin', None) or getattr(s, 'comparison', None)
+            if origin is None:
+                raise ValueError('could not find origin of active component')
+            data.append(ResultInfo(
+                status=s.result.severity,
+                reason=s.result.reason or '',
+                origin=origin,
+                source=s,
+                skipped=s.result.skipped,
+            ))
+
+    return data
+
 
 class ResultModel(QtCore.QAbstractTableModel):
     """
     Item model for results.  Read-Only.
     To be proxied for searching
+
+    Results are updated in place: :meth:`result_changed` marks the row for an
+    item as stale, and stale rows are re-read and announced via
+    ``dataChanged`` in batches, at no more than ``max_update_rate`` per second.
     """
     result_info: List[ResultInfo]
     result_icon_map = {
@@ -52,50 +125,100 @@ class ResultModel(QtCore.QAbstractTableModel):
         Severity.error: ('\u2718', QtGui.QColor(255, 0, 0, 255)),
         'N/A': ('nothing', QtGui.QColor())
     }
+    #: Shown in place of the severity icon for skipped items
+    skipped_icon = ('-', QtGui.QColor(128, 128, 128, 255))
+
+    #: Emitted after a batch of rows has been updated
+    results_changed: ClassVar[QtCore.Signal] = QtCore.Signal()
 
     def __init__(
         self,
         *args,
         data: Optional[List[ResultInfo]] = None,
+        max_update_rate: float = 10.0,
         **kwargs
     ) -> None:
         super().__init__(*args, **kwargs)
-        self.result_info = data or []
         self.headers = ['Status', 'Type', 'Name', 'Reason']
+        self._stale_rows: Set[int] = set()
+        self._coalescer = UpdateCoalescer(
+            self.flush_updates, max_rate=max_update_rate, parent=self
+        )
+        self._set_result_info(data or [])
+
+    def _set_result_info(self, data: List[ResultInfo]) -> None:
+        self.result_info = data
+        self._row_by_source: Dict[int, int] = {
+            id(info.source): row for row, info in enumerate(data)
+            if info.source is not None
+        }
+        self._stale_rows.clear()
 
     @classmethod
     def from_file(
         cls,
-        file: Union[PreparedFile, PreparedProcedureFile]
+        file: Union[PreparedFile, PreparedProcedureFile],
+        **kwargs
     ) -> ResultModel:
         """ Build this model from a PreparedFile which contains results"""
-        if isinstance(file, PreparedFile):
-            datac = [cfg_tuple[0] for cfg_tuple in walk_config_file(file.root)]
-            data = []
-            for c in datac:
-                origin = getattr(c, 'config', None) or getattr(c, 'comparison', None)
-                if origin is None:
-                    raise ValueError('could not find origin of passive component')
-                info = ResultInfo(
-                    status=c.result.severity,
-                    reason=c.result.reason or '',
-                    origin=origin
-                )
-                data.append(info)
-        elif isinstance(file, PreparedProcedureFile):
-            datac = [st_tuple[0] for st_tuple in walk_procedure_file(file.root)]
-            data = []
-            for s in datac:
-                origin = getattr(s, 'origin', None) or getattr(s, 'comparison', None)
-                if origin is None:
-                    raise ValueError('could not find origin of active component')
-                data.append(ResultInfo(
-                    status=s.result.severity,
-                    reason=s.result.reason or '',
-                    origin=origin
-                ))
-
-        return cls(data=data)
+        return cls(data=gather_result_info(file), **kwargs)
+
+    def set_result_info(self, data: List[ResultInfo]) -> None:
+        """Replace the contents of the model, resetting it"""
+        self.beginResetModel()
+        self._coalescer.cancel()
+        self._set_result_info(data)
+        self.endResetModel()
+        self.results_changed.emit()
+
+    def sources(self) -> List[Any]:
+        """The result-holding item for each row"""
+        return [info.source for info in self.result_info]
+
+    def result_changed(self, item: Any, *args, **kwargs) -> None:
+        """
+        Slot to mark the row for ``item`` as stale.  Items not in the model
+        are ignored.  Extra arguments (e.g., the new result) are accepted but
+        unused, as the result is re-read from ``item``.
+
+        Parameters
+        ----------
+        item : Any
+            The prepared dataclass whose result changed
+        """
+        row = self._row_by_source.get(id(item))
+        if row is None:
+            return
+        self._stale_rows.add(row)
+        self._coalescer.request()
+
+    def refresh(self) -> None:
+        """Re-read all results immediately, without resetting the model"""
+        self._stale_rows.update(range(len(self.result_info)))
+        self._coalescer.flush()
+
+    def flush_updates(self) -> None:
+        """Re-read stale rows and emit ``dataChanged`` for the modified ones"""
+        rows = sorted(
+            row for row in self._stale_rows if self.result_info[row].update()
+        )
+        self._stale_rows.clear()
+        if not rows:
+            return
+
+        # Announce contiguous runs of rows together
+        last_column = self.columnCount() - 1
+        first = prev = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == prev + 1:
+                prev = row
+                continue
+            self.dataChanged.emit(
+                self.index(first, 0), self.index(prev, last_column)
+            )
+            first = prev = row
+
+        self.results_changed.emit()
 
     def rowCount(
         self,
@@ -164,8 +287,8 @@ class ResultModel(QtCore.QAbstractTableModel):
 
         if role == Qt.DisplayRole:
             if index.column() == 0:
-                sev = self.result_info[index.row()].status
-                return f'[{self.result_icon_map[sev][0]}] {sev.name}'
+                info = self.result_info[index.row()]
+                return f'[{self._get_icon(info)[0]}] {info.status_text}'
             elif index.column() == 1:
                 return self.result_info[index.row()].type
             elif index.column() == 2:
@@ -176,11 +299,15 @@ class ResultModel(QtCore.QAbstractTableModel):
         if role == Qt.ForegroundRole:
             if index.column() == 0:
                 brush = QtGui.QBrush()
-                brush.setColor(
-                    self.result_icon_map[self.result_info[index.row()].status][1]
-                )
+                brush.setColor(self._get_icon(self.result_info[index.row()])[1])
                 return brush
 
+    def _get_icon(self, info: ResultInfo) -> Tuple[str, QtGui.QColor]:
+        """The status icon and color for ``info``."""
+        if info.skipped:
+            return self.skipped_icon
+        return self.result_icon_map[info.status]
+
     def headerData(
         self,
         section: int,
@@ -372,11 +499,15 @@ class ResultsSummaryWidget(DesignerDisplay, QtWidgets.QWidget):
     save_text_button: QtWidgets.QPushButton
     clipboard_button: QtWidgets.QPushButton
 
+    #: The maximum rate of table updates while results arrive [per second]
+    max_update_rate: ClassVar[float] = 10.0
+
     def __init__(self, *args, file: Any, **kwargs):
         super().__init__(*args, **kwargs)
         self.file = file
         self.status_map = {'success': self.success_check,
                            'warning': self.warning_check,
+                           'skipped': self.warning_check,
                            'error': self.error_check,
                            'internal_error': self.error_check}
         self.setup_ui()
@@ -384,12 +515,21 @@ class ResultsSummaryWidget(DesignerDisplay, QtWidgets.QWidget):
 
     def setup_ui(self) -> None:
         """Set up slots and do initial ui setup"""
-        self.model = ResultModel.from_file(self.file)
-        self.proxy_model = ResultFilterProxyModel()
+        self.model = ResultModel.from_file(
+            self.file, max_update_rate=self.max_update_rate, parent=self
+        )
+        self.proxy_model = ResultFilterProxyModel(parent=self)
         self.proxy_model.setSourceModel(self.model)
         self.results_table.setModel(self.proxy_model)
         self.results_table.setSortingEnabled(True)
         self.results_table.horizontalHeader().setStretchLastSection(True)
+        self.model.results_changed.connect(self.update_plain_text)
+
+        # follow results as they arrive from running checkouts
+        worker = get_asyncio_worker()
+        worker.result_ready.connect(self.model.result_changed)
+        # parents combine results of their children, catch them at the end
+        worker.task_finished.connect(self.model.refresh)
 
         # setup type combo box
         self.type_combo = CheckableComboBox()
@@ -412,7 +552,11 @@ class ResultsSummaryWidget(DesignerDisplay, QtWidgets.QWidget):
         self.save_text_button.clicked.connect(self.save_text)
         self.clipboard_button.clicked.connect(self.copy_to_clipboard)
 
-        self.refresh_results()
+        # default filters
+        self.success_check.setChecked(False)
+        self.warning_check.setChecked(True)
+        self.error_check.setChecked(True)
+        self.update_type_combo()
 
     def filters_changed(self, *args, **kwargs) -> None:
         """Update all the filters on the proxy model"""
@@ -464,28 +608,54 @@ class ResultsSummaryWidget(DesignerDisplay, QtWidgets.QWidget):
 
     def refresh_results(self) -> None:
         """
-        Re-initialize the model with the file.  Also refreshes the type combo
-        box for good measure, despite this getting destroyed on RunTree refresh
-        """
-        self.model = ResultModel.from_file(self.file)
-        self.proxy_model = ResultFilterProxyModel()
-        self.proxy_model.setSourceModel(self.model)
-        self.results_table.setModel(self.proxy_model)
+        Re-read results from the file.  Filters and selection are kept.
 
-        # reset all the settings/filters
-        self.name_edit.setText('')
-        self.reason_edit.setText('')
+        Results are updated in place unless the structure of the file has
+        changed, in which case the model is rebuilt.
+        """
+        data = gather_result_info(self.file)
+        if [info.source for info in data] == self.model.sources():
+            self.model.refresh()
+        else:
+            selected = self.get_selected_origins()
+            self.model.set_result_info(data)
+            self.select_origins(selected)
 
-        self.success_check.setChecked(False)
-        self.warning_check.setChecked(True)
-        self.error_check.setChecked(True)
+        self.update_type_combo()
 
-        # re-setup type combo box
-        self.type_combo.clear()
-        # Fill combo box with types
-        for dclass_type in self.model.dclass_types():
+    def update_type_combo(self) -> None:
+        """Add any new dataclass types in the model to the type combo box"""
+        existing = set(
+            self.type_combo.itemText(i) for i in range(self.type_combo.count())
+        )
+        for dclass_type in sorted(self.model.dclass_types() - existing):
             self.type_combo.addItem(dclass_type)
 
+    def get_selected_origins(self) -> List[AnyDataclass]:
+        """The origin dataclasses of the selected rows"""
+        rows = self.results_table.selectionModel().selectedRows()
+        return [
+            self.model.result_info[self.proxy_model.mapToSource(index).row()].origin
+            for index in rows
+        ]
+
+    def select_origins(self, origins: List[AnyDataclass]) -> None:
+        """Select the rows showing any of ``origins``"""
+        origin_ids = set(id(origin) for origin in origins)
+        selection = QtCore.QItemSelection()
+        for row, info in enumerate(self.model.result_info):
+            if id(info.origin) not in origin_ids:
+                continue
+            index = self.proxy_model.mapFromSource(self.model.index(row, 0))
+            if index.isValid():
+                selection.select(index, index)
+
+        self.results_table.selectionModel().select(
+            selection,
+            QtCore.QItemSelectionModel.ClearAndSelect
+            | QtCore.QItemSelectionModel.Rows
+        )
+
     def save_text(self) -> None:
         """Save the csv representation of the filtered results table"""
         text = self.get_plain_text().split('\n')
@@ -6,6 +6,7 @@ Widgets here should map onto edit widgets, often from atef.widgets.config.data
 from __future__ import annotations
 
 import asyncio
+import concurrent.futures
 import logging
 from typing import TYPE_CHECKING, Any, ClassVar, List, Optional, Union
 
@@ -23,11 +24,12 @@ from atef.config_model.passive import (AnyPreparedConfiguration,
                                        ConfigurationFile, PreparedComparison,
                                        PreparedFile)
 from atef.enums import Severity
+from atef.qt_helpers import get_asyncio_worker
 from atef.result import Result, combine_results
-from atef.walk import get_prepared_step, get_relevant_configs_comps
+from atef.walk import get_prepared_map
 from atef.widgets.config.utils import TreeItem, disable_widget
 from atef.widgets.core import DesignerDisplay
-from atef.widgets.utils import BusyCursorThread
+from atef.widgets.utils import UpdateCoalescer
 
 # avoid circular imports
 if TYPE_CHECKING:
@@ -191,6 +193,8 @@ class RunCheck(DesignerDisplay, QWidget):
     next_button: QPushButton
 
     results_updated: ClassVar[QtCore.Signal] = QtCore.Signal()
+    #: The maximum rate of widget updates while results arrive [per second].
+    result_update_rate: ClassVar[float] = 10.0
 
     style_icons = {
         Severity.success: QStyle.SP_DialogApplyButton,
@@ -218,6 +222,10 @@ class RunCheck(DesignerDisplay, QWidget):
         icon = self.style().standardIcon(self.style_icons[Severity.warning])
         self.result_label.setPixmap(icon.pixmap(25, 25))
         self.data = data
+        self.running_task: Optional[concurrent.futures.Future] = None
+        self._result_coalescer = UpdateCoalescer(
+            self._results_arrived, max_rate=self.result_update_rate, parent=self
+        )
 
         self.setup_buttons(configs=data)
         self.update_all_icons_tooltips()
@@ -269,75 +277,78 @@ class RunCheck(DesignerDisplay, QWidget):
         """
         Create and return a slot function to execute configurations, if the root is detected it will create the file-level timestamps.
 
+        Configurations are run in the shared ``AsyncioWorker``, passive
+        comparisons concurrently and active steps in order.  Icons update as
+        results arrive.
+
         Parameters
         ----------
         configs : list
             List of configurations to run when the slot is invoked.
         """
 
+        def get_coroutine(cfg):
+            config_type = infer_step_type(cfg)
+
+            # If running the root PreparedProcedureGroup, run the parent file instead
+            # to ensure file-level timestamps are set
+            config_to_run = cfg
+            if (
+                config_type == 'active' and
+                isinstance(cfg, PreparedProcedureGroup) and
+                isinstance(cfg.parent, PreparedProcedureFile)
+            ):
+                config_to_run = cfg.parent
+
+            if config_type == 'active':
+                return config_to_run.run()
+            elif config_type == 'passive':
+                return cfg.compare()
+            else:
+                raise TypeError('incompatible type found: '
+                                f'{config_type}, {cfg}')
+
+        async def run_configs():
+            if all(infer_step_type(cfg) == 'passive' for cfg in configs):
+                await asyncio.gather(*(get_coroutine(cfg) for cfg in configs))
+            else:
+                for cfg in configs:
+                    await get_coroutine(cfg)
+
         def run_slot(*args, **kwargs):
-            """Slot that runs each step in the config list"""
+            """Slot that submits each step in the config list to the worker"""
+            page_widget = self.get_page_widget()
+            worker = get_asyncio_worker()
             self.reveal_run_or_abort(running=True)
-            for cfg in configs:
-                page_widget = self.get_page_widget()
-
-                try:
-                    loop = asyncio.get_running_loop()
-                except RuntimeError:
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-
-                # create task
-                config_type = infer_step_type(cfg)
-
-                # If running the root PreparedProcedureGroup, run the parent file instead
-                # to ensure file-level timestamps are set
-                config_to_run = cfg
-                if (
-                    config_type == 'active' and
-                    isinstance(cfg, PreparedProcedureGroup) and
-                    isinstance(cfg.parent, PreparedProcedureFile)
-                ):
-                    config_to_run = cfg.parent
-
-                if config_type == 'active':
-                    task = loop.create_task(config_to_run.run())
-                elif config_type == 'passive':
-                    task = loop.create_task(cfg.compare())
-                else:
-                    raise TypeError('incompatible type found: '
-                                    f'{config_type}, {cfg}')
-
-                def stop_loop(task):
-                    """
-                    For use in task.add_done_callback, takes and ignores task
-                    Signals loop to stop running
-                    """
-                    logger.debug("task complete, stopping async loop")
-                    if loop.is_running():
-                        loop.stop()
-
-                # stash task in containing DualTree
-                page_widget.full_tree.running_task = task
-
-                task.add_done_callback(stop_loop)
-                loop.run_forever()
-
-                # finalize and update when task is complete
-                logger.debug("task complete, updating widgets")
-                self.results_updated.emit()
-                self.update_all_icons_tooltips()
+            worker.result_ready.connect(self._result_coalescer.request)
+            worker.task_finished.connect(self._task_finished)
+            self.running_task = worker.submit(run_configs())
+
+            # stash task in containing DualTree
+            page_widget.full_tree.running_task = self.running_task
 
-                self.reveal_run_or_abort(running=False)
-                logger.debug("task complete, run_slot finished")
+        self.run_button.clicked.connect(run_slot)
 
-        # send this to a non-gui thread, non-blocking
-        self.busy_thread = BusyCursorThread(func=run_slot)
+    def _results_arrived(self) -> None:
+        """Update widgets for a batch of newly arrived results"""
+        self.update_all_icons_tooltips()
+        self.results_updated.emit()
+
+    def _task_finished(self, task: concurrent.futures.Future) -> None:
+        """Slot for finalizing and updating widgets when the run is complete"""
+        if task is not self.running_task:
+            return
 
-        def run_thread():
-            self.busy_thread.start()
+        worker = get_asyncio_worker()
+        worker.result_ready.disconnect(self._result_coalescer.request)
+        worker.task_finished.disconnect(self._task_finished)
+        self._result_coalescer.cancel()
+        self.running_task = None
 
-        self.run_button.clicked.connect(run_thread)
+        logger.debug("task complete, updating widgets")
+        self.results_updated.emit()
+        self.update_all_icons_tooltips()
+        self.reveal_run_or_abort(running=False)
 
     def abort_task(self):
         """
@@ -347,7 +358,7 @@ class RunCheck(DesignerDisplay, QWidget):
         page = self.get_page_widget()
         task = page.full_tree.running_task
         if task and not task.done():
-            task.cancel()
+            get_asyncio_worker().cancel(task)
 
     def get_page_widget(self) -> PageWidget:
         # we expect page widget at second parent, we start there
@@ -532,6 +543,9 @@ def create_tree_from_file(
 
     For use in ConfigTreeModel, show showing a tree view with result status icons
 
+    The tree is built in a single pass, matching original dataclasses to their
+    prepared counterparts by way of ``get_prepared_map``.
+
     Parameters
     ----------
     data : Union[ConfigurationFile, ProcedureFile]
@@ -551,25 +565,26 @@ def create_tree_from_file(
         If data is neither a ConfigurationFile nor ProcedureFile
     """
     root_item = TreeItem()
-    if isinstance(data, ConfigurationFile):
-        gather_fn = get_relevant_configs_comps
-    elif isinstance(data, ProcedureFile):
-        gather_fn = get_prepared_step
-    else:
+    if not isinstance(data, (ConfigurationFile, ProcedureFile)):
         raise TypeError("Data was not a passive or active checkout file")
 
-    def create_tree(data, parent: TreeItem, prepared_data=None):
+    if prepared_file:
+        prepared_map = get_prepared_map(prepared_file)
+    else:
+        prepared_map = None
+
+    def create_tree(data, parent: TreeItem):
         if not hasattr(data, 'children'):
             return
         for child_data in data.children():
-            if prepared_data:
-                prepared_subset = gather_fn(prepared_data, child_data)
+            if prepared_map is not None:
+                prepared_subset = prepared_map.get(id(child_data), [])
             else:
                 prepared_subset = None
             item = TreeItem(child_data, prepared_data=prepared_subset)
-            create_tree(child_data, item, prepared_data)
+            create_tree(child_data, item)
             parent.addChild(item)
 
-    create_tree(data, root_item, prepared_file)
+    create_tree(data, root_item)
 
     return root_item
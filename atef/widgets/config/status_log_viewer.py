@@ -5,12 +5,37 @@ from uuid import UUID
 
 from qtpy import QtCore, QtWidgets
 
-from atef.status_logging import get_status_tempfile_cache
+from atef.status_logging import _SIMPLE_FORMATTER, get_status_tempfile_cache
 from atef.widgets.core import DesignerDisplay
 
 logger = logging.getLogger(__name__)
 
 
+class QtLoggingStream(QtCore.QObject):
+    """QObject handler to emit logging messages to the Qt main thread"""
+    new_message = QtCore.Signal(str)
+
+    def write(self, message: str):
+        self.new_message.emit(message)
+
+    def flush(self):
+        ...
+
+
+class QtLogHandler(logging.Handler):
+    """
+    Logging handler that writes to Qt Stream object
+    """
+    def __init__(self, stream: QtLoggingStream, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setFormatter(_SIMPLE_FORMATTER)
+        self.stream = stream
+
+    def emit(self, record: logging.LogRecord):
+        msg = self.format(record)
+        self.stream.write(msg)
+
+
 class StatusLogWidget(DesignerDisplay, QtWidgets.QWidget):
     """
     Main widget for viewing all status log files.
@@ -8,7 +8,7 @@ from dataclasses import fields
 from enum import IntEnum
 from itertools import zip_longest
 from typing import (Any, Callable, ClassVar, Dict, Generator, List, Optional,
-                    Tuple, Type, Union)
+                    Set, Tuple, Type, Union)
 from weakref import WeakValueDictionary
 
 import numpy as np
@@ -40,7 +40,7 @@ from atef.exceptions import DynamicValueError, MissingHappiDeviceError
 from atef.qt_helpers import (QDataclassBridge, QDataclassList, QDataclassValue,
                              ThreadWorker)
 from atef.result import combine_results
-from atef.tools import Ping
+from atef.tools import Ping, PortCheck
 from atef.type_hints import AnyDataclass, Number
 from atef.widgets.archive_viewer import get_archive_viewer
 from atef.widgets.core import DesignerDisplay
@@ -403,6 +403,7 @@ class ComponentListWidget(StringListWithDialog):
 
         def open_arch_viewer():
             arch_widget = get_archive_viewer()
+            signals = []
             for datum in data:
                 try:
                     parent_dev = (datum.signal.parent
@@ -412,10 +413,9 @@ class ComponentListWidget(StringListWithDialog):
                     logger.debug('unable to resolve full device-attribute '
                                  f'string: {e}')
                     dev_attr = 'N/A'
-                arch_widget.add_signal(
-                    datum.pvname, dev_attr=dev_attr, update_curves=False
-                )
-                arch_widget.update_curves()
+                signals.append((datum.pvname, dev_attr))
+            arch_widget.add_signals(signals, update_curves=False)
+            arch_widget.update_curves()
             arch_widget.show()
 
         menu.addSection("Open Archive Data viewer")
@@ -804,6 +804,29 @@ def describe_comparison_context(
             return (
                 f'Comparison to {attr} result from pinging {num_hosts} hosts'
             )
+        if isinstance(parent.tool, PortCheck):
+            num_targets = len(parent.tool.targets)
+            if num_targets == 0:
+                return 'Invalid comparison to zero port check targets'
+            if attr == 'shared':
+                if num_targets == 1:
+                    return (
+                        'Comparison to all different results from connecting '
+                        f'to {parent.tool.targets[0]}'
+                    )
+                return (
+                    'Comparison to all different results from connecting '
+                    f'to {num_targets} targets'
+                )
+            if num_targets == 1:
+                return (
+                    f'Comparison to {attr} result '
+                    f'from connecting to {parent.tool.targets[0]}'
+                )
+            return (
+                f'Comparison to {attr} result from connecting to '
+                f'{num_targets} targets'
+            )
         return 'Comparison to unknown tool results'
     if isinstance(parent, SetValueStep):
         return f'Comparison is success critiera of {parent.name or "SetValueStep"}'
@@ -1020,12 +1043,90 @@ class ConfigTreeModel(QtCore.QAbstractItemModel):
     Expects the item to be specifically a TreeItem, which each holds a
     Configuration or Comparison.  This TreeItem must also have a root node whose
     only child contains the desired data.  This root node will be invisible
+
+    If ``lazy`` is set, the children of an item are only exposed to views once
+    requested through ``fetchMore`` (e.g. when the item is expanded), keeping
+    views responsive for very large trees.
     """
-    def __init__(self, *args, data: TreeItem, **kwargs):
+    def __init__(self, *args, data: TreeItem, lazy: bool = False, **kwargs):
         super().__init__(*args, **kwargs)
         self.tree_data = data or TreeItem()
         self.root_item = self.tree_data
         self.headers = ['Name', 'Status', 'Type']
+        self.lazy = lazy
+        # items whose children have been exposed to views, if lazy
+        self._fetched: Set[TreeItem] = {self.root_item}
+
+    def _item_from_index(self, index: QtCore.QModelIndex) -> TreeItem:
+        if not index.isValid():
+            return self.root_item
+        return index.internalPointer()
+
+    def is_fetched(self, item: TreeItem) -> bool:
+        """Returns True if the children of ``item`` are exposed to views"""
+        return not self.lazy or item in self._fetched
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        """Report children before they are fetched, to allow expanding items"""
+        return self._item_from_index(parent).childCount() > 0
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        """
+        Called by views to determine if the children of ``parent`` are yet to
+        be exposed.
+
+        Parameters
+        ----------
+        parent : QtCore.QModelIndex
+            index of the parent item being queried
+
+        Returns
+        -------
+        bool
+        """
+        item = self._item_from_index(parent)
+        return not self.is_fetched(item) and item.childCount() > 0
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        """
+        Expose the children of ``parent`` to views.
+
+        Parameters
+        ----------
+        parent : QtCore.QModelIndex
+            index of the parent item to populate
+        """
+        item = self._item_from_index(parent)
+        if self.is_fetched(item):
+            return
+
+        count = item.childCount()
+        if count > 0:
+            self.beginInsertRows(parent, 0, count - 1)
+        self._fetched.add(item)
+        if count > 0:
+            self.endInsertRows()
+
+    def fetch_all(self) -> None:
+        """Expose every item in the tree to views"""
+        if not self.lazy:
+            return
+        self.beginResetModel()
+        self._fetched.update(walk_tree_items(self.root_item))
+        self.endResetModel()
+
+    def ensure_fetched(self, item: TreeItem) -> None:
+        """Expose ``item`` to views by fetching each of its ancestors"""
+        ancestors = []
+        parent = item.parent()
+        while parent is not None:
+            ancestors.append(parent)
+            parent = parent.parent()
+
+        for ancestor in reversed(ancestors):
+            if self.is_fetched(ancestor):
+                continue
+            self.fetchMore(self._index_from_item(ancestor))
 
     def headerData(
         self,
@@ -1100,6 +1201,10 @@ class ConfigTreeModel(QtCore.QAbstractItemModel):
         return QtCore.QModelIndex()
 
     def index_from_item(self, item: TreeItem) -> QtCore.QModelIndex:
+        self.ensure_fetched(item)
+        return self._index_from_item(item)
+
+    def _index_from_item(self, item: TreeItem) -> QtCore.QModelIndex:
         return self.createIndex(item.row(), 0, item)
 
     def parent(self, index: QtCore.QModelIndex) -> QtCore.QModelIndex:
@@ -1145,6 +1250,8 @@ class ConfigTreeModel(QtCore.QAbstractItemModel):
             parent_item = self.root_item
         else:
             parent_item = parent.internalPointer()
+        if not self.is_fetched(parent_item):
+            return 0
         return parent_item.childCount()
 
     def columnCount(self, parent: QtCore.QModelIndex) -> int:
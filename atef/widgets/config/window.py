@@ -3,13 +3,13 @@ Top-level widgets that contain all the other widgets.
 """
 from __future__ import annotations
 
+import concurrent.futures
 import json
 import logging
 import os
 import os.path
 import traceback
 import webbrowser
-from asyncio import Task
 from collections import OrderedDict
 from contextlib import contextmanager
 from copy import deepcopy
@@ -18,7 +18,6 @@ from pprint import pprint
 from typing import ClassVar, Dict, Generator, Optional
 
 import qtawesome
-from apischema import serialize
 from pcdsutils.qt.callbacks import WeakPartialMethodSlot
 from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtCore import Qt, QTimer
@@ -39,15 +38,19 @@ from atef.config_model.passive import (Configuration, ConfigurationFile,
                                        TemplateConfiguration)
 from atef.exceptions import PreparationError
 from atef.report import ActiveAtefReport, PassiveAtefReport
-from atef.status_logging import (QtLoggingStream, QtLogHandler,
-                                 cleanup_status_logger,
+from atef.serialization import dumps_json, gc_paused, get_serializer
+from atef.status_logging import (cleanup_status_logger,
                                  configure_and_get_status_logger)
 from atef.type_hints import AnyDataclass
-from atef.walk import get_prepared_step, get_relevant_configs_comps
+from atef.walk import (get_prepared_map, get_prepared_step,
+                       get_relevant_configs_comps)
 from atef.widgets.config.find_replace import (FillTemplatePage,
                                               FindReplaceWidget)
-from atef.widgets.config.status_log_viewer import StatusLogWidget
-from atef.widgets.utils import reset_cursor, set_wait_cursor
+from atef.widgets.config.status_log_viewer import (QtLoggingStream,
+                                                   QtLogHandler,
+                                                   StatusLogWidget)
+from atef.widgets.utils import (reset_cursor, run_with_progress,
+                                set_wait_cursor)
 
 from ..archive_viewer import get_archive_viewer
 from ..core import DesignerDisplay
@@ -436,7 +439,7 @@ class Window(DesignerDisplay, QMainWindow):
             filename += '.json'
         try:
             with open(filename, 'w') as fd:
-                json.dump(serialized, fd, indent=2)
+                fd.write(dumps_json(serialized))
                 # Ends file on newline as per pre-commit
                 fd.write('\n')
         except OSError:
@@ -450,7 +453,8 @@ class Window(DesignerDisplay, QMainWindow):
         Return the serialized data from a DualTree widget.
         """
         try:
-            return serialize(type(tree.orig_file), tree.orig_file)
+            with gc_paused():
+                return get_serializer(type(tree.orig_file))(tree.orig_file)
         except Exception:
             logger.exception('Error serializing file')
 
@@ -609,6 +613,10 @@ class DualTree(DesignerDisplay, QWidget):
     mode_switch_finished: ClassVar[QSignal] = QSignal()
     model_refreshed: ClassVar[QSignal] = QSignal()
 
+    #: Trees with more items than this are not fully expanded.  Their items
+    #: are populated as they are expanded instead.
+    expand_all_limit: ClassVar[int] = 1000
+
     built_widgets: OrderedDict
 
     def __init__(
@@ -645,16 +653,32 @@ class DualTree(DesignerDisplay, QWidget):
         self.results_button.clicked.connect(self.show_results_summary)
 
         # store serialized edit
-        serialized_edit_config = serialize(type(self.orig_file), self.orig_file)
-        self.last_edit_config = deepcopy(serialized_edit_config)
-        self._orig_config = deepcopy(self.last_edit_config)
+        self.last_edit_config = self.get_edit_config()
+        self._orig_config = self.last_edit_config
 
         self.toggle = Toggle()
 
-        self.running_task: Optional[Task] = None
+        self.running_task: Optional[concurrent.futures.Future] = None
+
+    def get_edit_config(self) -> str:
+        """
+        Get the serialized edit tree, for detecting changes to it.
+
+        This is JSON text rather than the serialized data, which may share
+        (mutable) lists with the file and would otherwise need to be copied.
+        """
+        with gc_paused():
+            serialized = get_serializer(type(self.orig_file))(self.orig_file)
+        return json.dumps(serialized, default=str)
 
     def assemble_tree(self) -> None:
-        """init-time tree setup.  Sets the tree into edit mode"""
+        """
+        init-time tree setup.  Sets the tree into edit mode
+
+        The edit tree is built from the original file alone.  Preparation,
+        which may instantiate devices and signals, is deferred until run mode
+        is requested.
+        """
         # self.tree_view = QtWidgets.QTreeView()
         self.refresh_model()
         self.tree_view.resizeColumnToContents(1)
@@ -662,25 +686,45 @@ class DualTree(DesignerDisplay, QWidget):
         # starting in edit mode, hide statuses
         self.tree_view.setColumnHidden(1, True)
         self.tree_view.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.tree_view.expandAll()
 
         self.print_report_button.hide()
         self.results_button.hide()
 
+    def discard_prepared_file(self) -> None:
+        """
+        Drop the stored Prepared file, if any.  It will be rebuilt from the
+        original file when next needed.
+        """
+        if self.prepared_file is not None:
+            # Clean up old temp files
+            cleanup_status_logger(self.prepared_file.uuid)
+        self.prepared_file = None
+
     def refresh_prepared_file(self) -> None:
         """
         Refreshes the stored Prepared file (passive or active).
         Alone, this does not update the TreeView or ConfigTreeModel.
+
+        Preparation happens in a background thread, with a progress dialog
+        shown if it takes a noticeable amount of time.
         """
-        # Clean up old temp files
-        if self.prepared_file is not None:
-            cleanup_status_logger(self.prepared_file.uuid)
+        self.discard_prepared_file()
 
         if isinstance(self.orig_file, ConfigurationFile):
-            self.prepared_file = PreparedFile.from_config(self.orig_file,
-                                                          cache=DataCache())
+            self.prepared_file = run_with_progress(
+                PreparedFile.from_config,
+                self.orig_file,
+                cache=DataCache(),
+                message='Preparing checkout...',
+                parent=self,
+            )
         if isinstance(self.orig_file, ProcedureFile):
-            self.prepared_file = PreparedProcedureFile.from_origin(self.orig_file)
+            self.prepared_file = run_with_progress(
+                PreparedProcedureFile.from_origin,
+                self.orig_file,
+                message='Preparing checkout...',
+                parent=self,
+            )
 
         self.status_logger = configure_and_get_status_logger(
             self.prepared_file.uuid
@@ -691,12 +735,51 @@ class DualTree(DesignerDisplay, QWidget):
         self.log_handler = QtLogHandler(self.log_stream)
         self.status_logger.addHandler(self.log_handler)
 
+    def update_prepared_file(self) -> None:
+        """
+        Re-prepare only the parts of the original file edited since the stored
+        Prepared file was built, keeping the results of unchanged parts.
+        Alone, this does not update the TreeView or ConfigTreeModel.
+        """
+        if self.prepared_file is None:
+            self.refresh_prepared_file()
+            return
+
+        if isinstance(self.prepared_file, PreparedFile):
+            update = self.prepared_file.update_from_config
+        else:
+            update = self.prepared_file.update_from_origin
+
+        updated = run_with_progress(
+            update, message='Preparing edits...', parent=self
+        )
+        logger.debug(f'Re-prepared {len(updated)} edited configurations or steps')
+
+    def link_prepared_data(self) -> None:
+        """
+        Attach the stored Prepared file's dataclasses to the matching items in
+        the tree, and refresh the statuses shown.
+        """
+        if self.prepared_file is None:
+            return
+
+        prepared_map = get_prepared_map(self.prepared_file)
+        for item in walk_tree_items(self.root_item):
+            if item.orig_data is not None:
+                item.prepared_data = prepared_map.get(id(item.orig_data), [])
+
+        self.model.data_updated()
+
     def refresh_model(self) -> None:
         """
-        Rebuild the model, refreshing the Prepared file primarily
+        Rebuild the model.  In run mode the Prepared file is refreshed and
+        attached to the tree.  In edit mode the tree is built from the original
+        file alone, and the Prepared file is brought up to date on switching to
+        run mode.
         """
         # TODO: Make sure prepared file is attached at every tree item modification
-        self.refresh_prepared_file()
+        if self.mode == 'run':
+            self.refresh_prepared_file()
 
         # Clear widget caches
         for cache in (self.edit_widget_cache, self.run_widget_cache):
@@ -708,11 +791,11 @@ class DualTree(DesignerDisplay, QWidget):
             prepared_file=self.prepared_file
         )
         self._item_list = list(walk_tree_items(self.root_item))
-        self.model = ConfigTreeModel(data=self.root_item)
+        self.model = ConfigTreeModel(data=self.root_item, lazy=True)
         self.tree_view.setModel(self.model)
         self.model.beginResetModel()
         self.model.endResetModel()
-        self.tree_view.expandAll()
+        self.expand_tree()
 
         # selection model tied to data model, need to re-connect on refresh
         self.tree_view.selectionModel().selectionChanged.connect(
@@ -723,6 +806,20 @@ class DualTree(DesignerDisplay, QWidget):
         self.tree_view.setCurrentIndex(self.model.index(0, 0, QtCore.QModelIndex()))
         self.model_refreshed.emit()
 
+    def expand_tree(self) -> None:
+        """
+        Expand the tree view.  Small trees are expanded fully, larger ones only
+        show the top level, populating items as they are expanded.
+        """
+        if len(self._item_list) <= self.expand_all_limit:
+            self.model.fetch_all()
+            self.tree_view.expandAll()
+            return
+
+        top_item = self.root_item.child(0)
+        if top_item is not None:
+            self.tree_view.expand(self.model.index_from_item(top_item))
+
     def select_by_item(self, item: TreeItem) -> None:
         """Select desired TreeItem(and show corresponding page) in TreeView"""
         # check if item is in tree before selecting?
@@ -812,14 +909,16 @@ class DualTree(DesignerDisplay, QWidget):
         else:  # run mode
             if self.prepared_file is None:
                 self.refresh_prepared_file()
+                self.link_prepared_data()
 
-            if isinstance(self.orig_file, ConfigurationFile):
-                get_prepare_fn = get_relevant_configs_comps
-            elif isinstance(self.orig_file, ProcedureFile):
-                get_prepare_fn = get_prepared_step
+            prepared_data = item.prepared_data
+            if prepared_data is None:
+                if isinstance(self.orig_file, ConfigurationFile):
+                    get_prepare_fn = get_relevant_configs_comps
+                elif isinstance(self.orig_file, ProcedureFile):
+                    get_prepare_fn = get_prepared_step
 
-            # TODO: Is this just the stored data now?  Yea I think so
-            prepared_data = get_prepare_fn(self.prepared_file, data)
+                prepared_data = get_prepare_fn(self.prepared_file, data)
             if type(data) in EDIT_TO_RUN_PAGE:
                 if len(prepared_data) != 1:
                     run_widget = FailPage(
@@ -917,10 +1016,14 @@ class DualTree(DesignerDisplay, QWidget):
 
     def switch_mode(self, value) -> None:
         """Switch tree modes between 'edit' and 'run'"""
-        if (not value and self.mode == 'edit') or (value and self.mode == 'run'):
+        if not value and self.mode == 'edit':
+            return
+        if value and self.mode == 'run' and self.prepared_file is not None:
             return
 
         set_wait_cursor()
+        # preparation keeps the event loop running, prevent re-entrant switches
+        self.toggle.setEnabled(False)
         try:
             self.mode_switch_finished.connect(reset_cursor)
             prev_toggle_state = not self.toggle.isChecked()
@@ -946,6 +1049,7 @@ class DualTree(DesignerDisplay, QWidget):
             warning_msg.exec()
             QTimer.singleShot(0, reset_to_edit)
         finally:
+            self.toggle.setEnabled(True)
             self.mode_switch_finished.emit()
             self.mode_switch_finished.disconnect(reset_cursor)
 
@@ -957,24 +1061,27 @@ class DualTree(DesignerDisplay, QWidget):
         if self.mode == 'run':
             # store a copy of the edit tree to detect diffs
             try:
-                ser = serialize(type(self.orig_file), self.orig_file)
+                current_edit_config = self.get_edit_config()
             except Exception:
                 logger.debug(f'Unable to serialize file as defined: {self.orig_file}')
                 raise PreparationError('Unable to serialize file with current settings')
-            current_edit_config = deepcopy(ser)
 
             if self.prepared_file is None:
                 update_run = True
-            elif not (current_edit_config == self.last_edit_config):
-                # run tree found, and edit configs are different
                 # remember last edit config
-                self.last_edit_config = deepcopy(current_edit_config)
-                update_run = True
-
-            if update_run:
+                self.last_edit_config = current_edit_config
                 self.run_widget_cache.clear()
                 # generate new tree with prep file
                 self.refresh_model()
+            else:
+                if not (current_edit_config == self.last_edit_config):
+                    # run tree found, and edit configs are different.  Only
+                    # re-prepare the edited parts
+                    self.last_edit_config = current_edit_config
+                    self.run_widget_cache.clear()
+                    self.update_prepared_file()
+                # the edit tree may have been modified or rebuilt
+                self.link_prepared_data()
 
             self.print_report_button.show()
             self.results_button.show()
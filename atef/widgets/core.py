@@ -1,32 +1,211 @@
 """
 Core classes for atef Qt-based display GUIs.
+
+Designer .ui files are compiled to Python modules on first use and cached by
+file hash and atef version (see :func:`load_ui_form`), so later starts skip
+parsing the XML.
 """
-from typing import ClassVar
+import functools
+import hashlib
+import io
+import logging
+import os
+import pathlib
+import tempfile
+import types
+from typing import ClassVar, Dict, Optional
 
+from qtpy import API_NAME
 from qtpy.uic import loadUiType
 
+from .. import __version__
 from ..util import ATEF_SOURCE_PATH
 
+logger = logging.getLogger(__name__)
+
+UI_SOURCE_PATH = ATEF_SOURCE_PATH / 'ui'
+#: The first line of compiled forms, holding the SHA-256 of the remainder.
+_UI_FORM_HEADER = '# atef ui form sha256: '
+
+
+def get_ui_cache_path() -> pathlib.Path:
+    """
+    The directory holding compiled .ui forms.
+
+    Set by the ``ATEF_UI_CACHE`` environment variable, defaulting to
+    ``atef/ui`` under the user cache directory (``$XDG_CACHE_HOME`` or
+    ``~/.cache``).
+    """
+    cache_path = os.environ.get('ATEF_UI_CACHE')
+    if cache_path:
+        return pathlib.Path(cache_path).expanduser()
+    cache_home = (
+        os.environ.get('XDG_CACHE_HOME') or pathlib.Path.home() / '.cache'
+    )
+    return pathlib.Path(cache_home) / 'atef' / 'ui'
+
+
+def get_compiled_ui_path(
+    ui_path: pathlib.Path,
+    cache_path: Optional[pathlib.Path] = None,
+) -> pathlib.Path:
+    """
+    The cache location of the compiled form for ``ui_path``.  The name
+    includes a hash of the file contents, the Qt binding and the atef version,
+    so edited files or upgrades are compiled again.
+    """
+    digest = hashlib.sha256(f'{__version__}\0{API_NAME}\0'.encode())
+    digest.update(ui_path.read_bytes())
+    cache_path = cache_path or get_ui_cache_path()
+    return cache_path / f'{ui_path.stem}_{digest.hexdigest()[:16]}.py'
+
+
+def _read_ui_form(py_path: pathlib.Path) -> Optional[str]:
+    """
+    Read the compiled form at ``py_path``, or None if missing or if its
+    contents do not match the checksum written with them.
+    """
+    try:
+        header, _, source = py_path.read_text().partition('\n')
+    except (OSError, UnicodeDecodeError):
+        return None
+    checksum = hashlib.sha256(source.encode()).hexdigest()
+    if header != _UI_FORM_HEADER + checksum:
+        return None
+    return source
+
+
+def compile_ui_form(
+    ui_path: pathlib.Path,
+    cache_path: Optional[pathlib.Path] = None,
+) -> pathlib.Path:
+    """
+    Compile ``ui_path`` to a Python module in the cache, if not already there.
+
+    The module is written atomically, with a checksum of its contents that
+    is verified before use.  Entries failing verification are compiled again.
+
+    Returns
+    -------
+    pathlib.Path
+        The path to the compiled module.
+    """
+    from qtpy.uic import compileUi
+
+    py_path = get_compiled_ui_path(ui_path, cache_path)
+    if _read_ui_form(py_path) is not None:
+        return py_path
+
+    source = io.StringIO()
+    compileUi(str(ui_path), source)
+    source = source.getvalue()
+    checksum = hashlib.sha256(source.encode()).hexdigest()
+
+    py_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, as other processes may be starting up
+    fd, tmp_name = tempfile.mkstemp(
+        dir=py_path.parent, prefix=f'.{py_path.stem}', suffix='.py'
+    )
+    try:
+        with os.fdopen(fd, 'w') as fp:
+            fp.write(f'{_UI_FORM_HEADER}{checksum}\n{source}')
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_name, py_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return py_path
+
+
+def _import_ui_form(py_path: pathlib.Path) -> type:
+    """
+    Import the compiled module at ``py_path`` and return its form class.
+    The module is only executed if its checksum matches.
+    """
+    source = _read_ui_form(py_path)
+    if source is None:
+        raise ValueError(f'Compiled form failed verification: {py_path}')
+
+    module = types.ModuleType(f'atef._ui_forms.{py_path.stem}')
+    module.__file__ = str(py_path)
+    exec(compile(source, str(py_path), 'exec'), vars(module))
+    for name, obj in vars(module).items():
+        if name.startswith('Ui_') and isinstance(obj, type):
+            return obj
+    raise ValueError(f'No form class found in {py_path}')
+
+
+@functools.lru_cache(maxsize=None)
+def load_ui_form(filename: str) -> type:
+    """
+    Get the form class for ``filename`` in ``atef/ui``.
+
+    The compiled form is imported from the cache, compiling it first if
+    needed.  Should that fail (e.g., an unwritable cache or a Qt binding
+    without ``compileUi``), the form is generated in memory instead.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the .ui file.
+
+    Returns
+    -------
+    type
+        The form class, providing ``setupUi`` and ``retranslateUi``.
+    """
+    ui_path = UI_SOURCE_PATH / filename
+    try:
+        return _import_ui_form(compile_ui_form(ui_path))
+    except Exception as ex:
+        logger.debug('Unable to use cached form for %s (%s)', filename, ex)
+
+    ui_form, _ = loadUiType(str(ui_path))
+    return ui_form
+
+
+def precompile_ui_forms(
+    cache_path: Optional[pathlib.Path] = None
+) -> Dict[str, pathlib.Path]:
+    """
+    Compile all .ui files in ``atef/ui`` into the cache, e.g. at install time.
+
+    Returns
+    -------
+    Dict[str, pathlib.Path]
+        Paths to the compiled modules, keyed by .ui file name.
+    """
+    return {
+        ui_path.name: compile_ui_form(ui_path, cache_path)
+        for ui_path in sorted(UI_SOURCE_PATH.glob('*.ui'))
+    }
+
 
 class DesignerDisplay:
     """Helper class for loading designer .ui files and adding logic."""
     filename: ClassVar[str]
+    #: The form class for ``filename``, loaded on first instantiation.
+    ui_form: ClassVar[Optional[type]] = None
 
     def __init_subclass__(cls):
-        """Read the file when the class is created"""
+        """Defer reading the file until the class is first instantiated"""
         super().__init_subclass__()
-        if cls.filename:
-            cls.ui_form, _ = loadUiType(
-                str(ATEF_SOURCE_PATH / 'ui' / cls.filename)
-            )
-        else:
-            cls.ui_form = None
+        cls.ui_form = None
+
+    @classmethod
+    def get_ui_form(cls) -> Optional[type]:
+        """Load the form class for this display, if not yet loaded"""
+        if cls.ui_form is None and getattr(cls, 'filename', None):
+            cls.ui_form = load_ui_form(cls.filename)
+        return cls.ui_form
 
     def __init__(self, *args, **kwargs):
         """Apply the file to this widget when the instance is created"""
         super().__init__(*args, **kwargs)
-        if self.ui_form is not None:
-            self.ui_form.setupUi(self, self)
+        ui_form = self.get_ui_form()
+        if ui_form is not None:
+            ui_form.setupUi(self, self)
 
     def retranslateUi(self, *args, **kwargs):
         """Required function for setupUi to work in __init__"""
@@ -8,7 +8,7 @@ import enum
 import logging
 import threading
 import time
-from typing import Any, Callable, ClassVar, Dict, List, Optional, Set
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Set, Tuple
 
 import numpy as np
 import ophyd
@@ -130,11 +130,30 @@ class DeviceColumn(enum.IntEnum):
     total_columns = 5
 
 
-class _DevicePollThread(QtCore.QThread):
+def can_monitor(signal: ophyd.Signal) -> bool:
     """
-    Polling thread for updating a PolledDeviceModel.
+    Does ``signal`` report all of its value changes to subscribers?
 
-    Emits ``data_changed(attr: str)`` when an attribute has new data.
+    EPICS signals are backed by channel access monitors.  Soft signals only
+    change through ``put``, which notifies subscribers.  Signals computing
+    their value on ``get`` (e.g., simulated or derived signals) must be polled.
+    """
+    if isinstance(signal, ophyd.signal.EpicsSignalBase):
+        return True
+    return type(signal).get is ophyd.Signal.get
+
+
+class _DevicePollJob:
+    """
+    Update state for a PolledDeviceModel, serviced by the shared
+    :class:`_DevicePoller` thread.
+
+    Changes are coalesced and emitted through the poller's ``data_changed``
+    at most once per ``update_period``.
+
+    In monitor mode, each signal that supports it (see :func:`can_monitor`)
+    is subscribed to once, and only the remaining signals are polled.  The
+    job is then serviced until stopped.
 
     Parameters
     ----------
@@ -144,22 +163,26 @@ class _DevicePollThread(QtCore.QThread):
     poll_rate : float
         The poll rate in seconds. A zero or negative poll rate will indicate
         single-shot mode.  In "single shot" mode, the data is queried exactly
-        once and then the thread exits.
+        once and then the job finishes, unless monitoring.
 
     data : dict of attr to OphydAttributeData
         Per-attribute OphydAttributeData, potentially generated previously.
 
-    parent : QWidget, optional, keyword-only
-        The parent widget.
+    monitor : bool, optional, keyword-only
+        Subscribe to signals rather than polling them, where possible.
     """
 
-    data_ready: ClassVar[QtCore.Signal] = QtCore.Signal()
-    data_changed: ClassVar[QtCore.Signal] = QtCore.Signal(str)
     running: bool
     device: ophyd.Device
     data: Dict[str, OphydAttributeData]
     poll_rate: float
+    monitor: bool
+    #: Set once the poller has finished with this job.
+    finished: threading.Event
+    #: The minimum time between data_changed emissions [sec].
+    update_period: float = 0.1
     _attrs: Set[str]
+    _monitored: Set[str]
 
     def __init__(
         self,
@@ -167,18 +190,39 @@ class _DevicePollThread(QtCore.QThread):
         poll_rate: float,
         data: Dict[str, OphydAttributeData],
         *,
-        parent: Optional[QtWidgets.QWidget] = None
+        monitor: bool = False,
     ):
-        super().__init__(parent=parent)
         self.device = device
         self.data = data
         self.poll_rate = poll_rate
+        self.monitor = monitor
         self.running = False
+        self.finished = threading.Event()
+        self._poller: Optional[_DevicePoller] = None
+        self._started = False
+        self._next_poll = 0.0
         self._attrs = set()
+        self._monitored = set()
+        self._subscriptions: List[Tuple[ophyd.Signal, int]] = []
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        self._changed: Set[str] = set()
+        self._update_requested = False
 
     def stop(self) -> None:
-        """Stop the polling thread."""
+        """
+        Stop the job.  This does not wait: the poller finishes the job once
+        any read in progress returns.
+        """
         self.running = False
+        if self._poller is not None:
+            self._poller.wake()
+
+    def request_update(self) -> None:
+        """Request that every attribute, monitored or not, be read again."""
+        self._update_requested = True
+        if self._poller is not None:
+            self._poller.wake()
 
     def _instantiate_device(self) -> Set[str]:
         """Instantiate the device and return the attrs to pay attention to."""
@@ -190,7 +234,7 @@ class _DevicePollThread(QtCore.QThread):
                     getattr(self.device, attr)
                 except Exception:
                     logger.exception(
-                        "Poll thread for %s.%s @ %.3f sec failure on initial access",
+                        "Poll job for %s.%s @ %.3f sec failure on initial access",
                         self.device.name,
                         attr,
                         self.poll_rate,
@@ -203,6 +247,34 @@ class _DevicePollThread(QtCore.QThread):
 
         return attrs
 
+    def _store_new_data(self, attr: str, new_data: Dict[str, Any]) -> None:
+        """Store new values for ``attr``, noting it as changed if necessary."""
+        data = self.data[attr]
+        for key, value in new_data.items():
+            old_value = getattr(data, key)
+
+            try:
+                changed = np.any(old_value != value)
+            except Exception:
+                ...
+            else:
+                if changed or old_value is None:
+                    for key, value in new_data.items():
+                        setattr(data, key, value)
+                    self._changed.add(attr)
+                    return
+
+    def _update_description(self, data: OphydAttributeData) -> None:
+        """Fill in the description of ``data`` if not yet known."""
+        if data.description:
+            return
+        try:
+            data.description = data.signal.describe()[data.signal.name] or {}
+        except Exception:
+            data.description = {
+                "units": data.signal.metadata.get("units", ""),
+            }
+
     def _update_attr(self, attr: str):
         """Update an attribute of the device."""
         setpoint = None
@@ -214,13 +286,7 @@ class _DevicePollThread(QtCore.QThread):
         except TimeoutError:
             return
 
-        if not data.description:
-            try:
-                data.description = data.signal.describe()[data.signal.name] or {}
-            except Exception:
-                data.description = {
-                    "units": data.signal.metadata.get("units", ""),
-                }
+        self._update_description(data)
 
         try:
             get_setpoint = getattr(data.signal, "get_setpoint", None)
@@ -235,7 +301,7 @@ class _DevicePollThread(QtCore.QThread):
             return
         except Exception:
             logger.exception(
-                "Poll thread for %s.%s @ %.3f sec failure",
+                "Poll job for %s.%s @ %.3f sec failure",
                 self.device.name,
                 attr,
                 self.poll_rate,
@@ -250,53 +316,254 @@ class _DevicePollThread(QtCore.QThread):
         if setpoint is not None:
             new_data["setpoint"] = setpoint
 
-        for key, value in new_data.items():
-            old_value = getattr(data, key)
+        self._store_new_data(attr, new_data)
+
+    def _monitor_callback(self, attr: str, key: str) -> Callable:
+        """Create a subscription callback storing ``key`` of ``attr``."""
+        def callback(*args, value: Any = None, **kwargs) -> None:
+            if value is None:
+                return
+            with self._pending_lock:
+                self._pending.setdefault(attr, {})[key] = value
+
+        return callback
+
+    def _subscribe(self) -> None:
+        """Subscribe to value changes of all signals that support it."""
+        for attr in sorted(self._attrs):
+            signal = self.data[attr].signal
+            if not can_monitor(signal):
+                continue
+
+            event_types = {"readback": signal.SUB_VALUE}
+            if getattr(signal, "setpoint_pvname", None) is not None:
+                event_types["setpoint"] = signal.SUB_SETPOINT
 
             try:
-                changed = np.any(old_value != value)
-            except Exception:
-                ...
+                for key, event_type in event_types.items():
+                    cid = signal.subscribe(
+                        self._monitor_callback(attr, key),
+                        event_type=event_type,
+                        run=False,
+                    )
+                    self._subscriptions.append((signal, cid))
+            except Exception as ex:
+                logger.debug(
+                    "Unable to monitor %s.%s, polling instead (%s)",
+                    self.device.name, attr, ex
+                )
             else:
-                if changed or old_value is None:
-                    for key, value in new_data.items():
-                        setattr(data, key, value)
-                    self.data_changed.emit(attr)
-                    return
+                self._monitored.add(attr)
 
-    def run(self):
-        """The thread polling loop."""
-        self.running = True
-        self._attrs = self._instantiate_device()
+            if not self.running:
+                break
+
+    def _unsubscribe(self) -> None:
+        """Remove all subscriptions made by this job."""
+        for signal, cid in self._subscriptions:
+            try:
+                signal.unsubscribe(cid)
+            except Exception:
+                logger.debug("Failed to unsubscribe from %s", signal.name)
+
+        self._subscriptions.clear()
+        self._monitored.clear()
+
+    def _apply_monitor_updates(self) -> None:
+        """Store values received through subscriptions since the last call."""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+
+        for attr, new_data in pending.items():
+            data = self.data[attr]
+            self._update_description(data)
+            new_data["units"] = data.description.get("units", "") or ""
+            self._store_new_data(attr, new_data)
+
+    def _emit_changes(self) -> None:
+        """Emit data_changed for the attributes changed since the last call."""
+        if self._changed:
+            changed, self._changed = sorted(self._changed), set()
+            self._poller.data_changed.emit(self, changed)
+
+    def _poll(self, attrs: Set[str]) -> None:
+        """Read ``attrs``, emitting changes at intervals along the way."""
+        t_emit = time.monotonic()
+        for attr in sorted(attrs):
+            if attr not in self._attrs:
+                continue
+            self._update_attr(attr)
+            if not self.running:
+                break
+
+            if time.monotonic() - t_emit >= self.update_period:
+                self._apply_monitor_updates()
+                self._emit_changes()
+                t_emit = time.monotonic()
+            time.sleep(0)
 
+        self._apply_monitor_updates()
+        self._emit_changes()
+
+    def _start(self) -> None:
+        """Read the device structure, subscribe and read everything once."""
         # We may have already created the dictionary; only do it if necessary:
         if not self.data:
-            self.data.update(**OphydAttributeData.from_device(self.device))
+            with ophyd.device.do_not_wait_for_lazy_connection(self.device):
+                self.data.update(**OphydAttributeData.from_device(self.device))
 
-        self.data_ready.emit()
+        self._attrs = self._instantiate_device()
+        self._poller.data_ready.emit(self)
 
-        while self.running:
-            t0 = time.monotonic()
-            for attr in list(self._attrs):
-                self._update_attr(attr)
-                if not self.running:
-                    break
-                time.sleep(0)
+        if self.monitor and self.running:
+            self._subscribe()
 
-            if self.poll_rate <= 0.0:
-                # A zero or below means "single shot" updates.
-                break
+        # Read everything once, including the initial value of monitors
+        self._update_requested = False
+        if self.running:
+            self._poll(self._attrs)
+        self._next_poll = time.monotonic() + self.poll_rate
+
+    def service(self) -> Optional[float]:
+        """
+        Perform any updates that are due.  Called from the poller thread.
+
+        Returns
+        -------
+        float or None
+            The time until the job should next be serviced [sec], or None if
+            the job is done.
+        """
+        if not self._started:
+            self._started = True
+            self._start()
+        elif self._update_requested:
+            self._update_requested = False
+            self._poll(self._attrs)
+        elif self.poll_rate > 0 and time.monotonic() >= self._next_poll:
+            self._next_poll = time.monotonic() + self.poll_rate
+            self._poll(self._attrs - self._monitored)
+
+        if not self.running:
+            return None
+        if not self.monitor and self.poll_rate <= 0.0:
+            # A zero or below means "single shot" updates.
+            return None
+
+        self._apply_monitor_updates()
+        self._emit_changes()
 
-            elapsed = time.monotonic() - t0
-            time.sleep(max((0, self.poll_rate - elapsed)))
+        if self.poll_rate > 0:
+            wait = self._next_poll - time.monotonic()
+        else:
+            wait = self.update_period
+        if self.monitor:
+            wait = min(wait, self.update_period)
+        return max((0, wait))
+
+
+class _DevicePoller(QtCore.QObject):
+    """
+    A long-lived background thread servicing the poll jobs of all device
+    views in turn.
+
+    Stopped jobs are finished by the thread itself, such that stopping never
+    waits on a read in progress.  Signals are emitted with the job they
+    concern, and are queued to receivers in the GUI thread.
+
+    Use :func:`get_device_poller` to get the shared instance.
+    """
+    #: Emitted with the job once its data dictionary is ready.
+    data_ready: ClassVar[QtCore.Signal] = QtCore.Signal(object)
+    #: Emitted with the job and the attributes that have new data.
+    data_changed: ClassVar[QtCore.Signal] = QtCore.Signal(object, list)
+    #: Emitted with the job once it has finished.
+    job_finished: ClassVar[QtCore.Signal] = QtCore.Signal(object)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jobs: List[_DevicePollJob] = []
+        self._jobs_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="atef-device-poller", daemon=True
+        )
+        self._thread.start()
+
+    def add(self, job: _DevicePollJob) -> None:
+        """Start servicing ``job``."""
+        job._poller = self
+        job.running = True
+        with self._jobs_lock:
+            self.jobs.append(job)
+        self.wake()
+
+    def wake(self) -> None:
+        """Service the jobs now, rather than when next due."""
+        self._wakeup.set()
+
+    def _finish(self, job: _DevicePollJob) -> None:
+        """Clean up after ``job``, which will no longer be serviced."""
+        try:
+            job._unsubscribe()
+        finally:
+            with self._jobs_lock:
+                self.jobs.remove(job)
+            job.finished.set()
+            self.job_finished.emit(job)
+
+    def _run(self) -> None:
+        """The thread update loop."""
+        while True:
+            with self._jobs_lock:
+                jobs = list(self.jobs)
+
+            wait = None
+            for job in jobs:
+                job_wait = None
+                if job.running:
+                    try:
+                        job_wait = job.service()
+                    except Exception:
+                        logger.exception(
+                            "Poll job for %s failed", job.device.name
+                        )
+
+                if job_wait is None:
+                    self._finish(job)
+                elif wait is None or job_wait < wait:
+                    wait = job_wait
+
+            self._wakeup.wait(timeout=wait)
+            self._wakeup.clear()
+
+
+_device_poller: Optional[_DevicePoller] = None
+
+
+def get_device_poller() -> _DevicePoller:
+    """
+    Get the shared :class:`_DevicePoller`, starting it if necessary.  Must be
+    first called from the GUI thread.
+    """
+    global _device_poller
+    if _device_poller is None:
+        _device_poller = _DevicePoller()
+    return _device_poller
 
 
 class PolledDeviceModel(QtCore.QAbstractTableModel):
     """
-    A table model representing an ophyd Device with periodic data polling.
+    A table model representing an ophyd Device with live data updates.
+
+    Signals are monitored where possible, with periodic polling as the
+    fallback for those that can't be monitored.
+
+    Updates are performed by the thread shared between all models (see
+    :func:`get_device_poller`).
 
     Emits ``data_updates_started`` when polling begins.
-    Emits ``data_updates_finished`` when the polling thread stops.
+    Emits ``data_updates_finished`` when polling stops.
 
     Parameters
     ----------
@@ -306,6 +573,10 @@ class PolledDeviceModel(QtCore.QAbstractTableModel):
     poll_rate : float, optional, keyword-only
         The poll rate in seconds.
 
+    monitor : bool, optional, keyword-only
+        Subscribe to signals that support it rather than polling them.
+        Defaults to ``True``.
+
     read_only : bool, optional
         Defaults to read-only or ``True``. Allow for puts to the control system
         via ophyd if ``read_only`` is ``False``.
@@ -315,10 +586,12 @@ class PolledDeviceModel(QtCore.QAbstractTableModel):
     """
 
     _data: Dict[str, OphydAttributeData]
-    _poll_thread: Optional[_DevicePollThread]
+    _poll_job: Optional[_DevicePollJob]
     _polling: bool
     _row_to_data: Dict[int, OphydAttributeData]
+    _attr_to_row: Dict[str, int]
     device: ophyd.Device
+    monitor: bool
     horizontal_header: List[str]
     read_only: bool
     data_updates_started: ClassVar[QtCore.Signal] = QtCore.Signal()
@@ -329,6 +602,7 @@ class PolledDeviceModel(QtCore.QAbstractTableModel):
         device: ophyd.Device,
         *,
         poll_rate: float = 1.0,
+        monitor: bool = True,
         parent: Optional[QtWidgets.QWidget] = None,
         read_only: bool = True,
         **kwargs
@@ -337,11 +611,14 @@ class PolledDeviceModel(QtCore.QAbstractTableModel):
         self._polling = False
         self.device = device
         self._poll_rate = float(poll_rate)
-        self.poll_thread = None
+        self._poll_job = None
+        self._poll_jobs: Set[_DevicePollJob] = set()
+        self.monitor = monitor
         self.read_only = read_only
 
         self._data = {}
         self._row_to_data = {}
+        self._attr_to_row = {}
         self.horizontal_header = [
             "Attribute",
             "Readback",
@@ -349,72 +626,103 @@ class PolledDeviceModel(QtCore.QAbstractTableModel):
             "Read PV Name",
             "Setpoint PV Name"
         ]
+        poller = get_device_poller()
+        poller.data_ready.connect(self._data_ready)
+        poller.data_changed.connect(self._data_changed)
+        poller.job_finished.connect(self._poll_job_finished)
         self.start()
 
     def start(self) -> None:
-        "Start the polling thread"
+        """
+        Start polling.  If already running, request that all data be read
+        again.
+        """
         if self._polling:
+            if self._poll_job is not None:
+                self._poll_job.request_update()
             return
 
         self._polling = True
-        self._poll_thread = _DevicePollThread(
+        job = _DevicePollJob(
             device=self.device,
             data=self._data,
             poll_rate=self.poll_rate,
-            parent=self,
+            monitor=self.monitor,
         )
-        self._data = self._poll_thread.data  # A shared reference
-        self._poll_thread.data_ready.connect(self._data_ready)
-        self._poll_thread.finished.connect(self._poll_thread_finished)
+        self._poll_job = job
+        self._poll_jobs.add(job)
+        self._data = job.data  # A shared reference
+        # Jobs hold no reference to the model; stop monitoring with it
+        self.destroyed.connect(job.stop)
         self.data_updates_started.emit()
-        self._poll_thread.start()
+        get_device_poller().add(job)
 
-    def stop(self) -> None:
-        """Stop the polling thread for the model."""
-        thread = self._poll_thread
-        if not self._polling or not thread:
-            return
-
-        thread.stop()
-        self._poll_thread = None
-        self._polling = False
+    def stop(self, wait: bool = False) -> None:
+        """
+        Stop polling for the model.  By default, this does not wait for a
+        read in progress.
 
-    @QtCore.Slot()
-    def _poll_thread_finished(self):
-        """Slot: poll thread finished and returned."""
-        self.data_updates_finished.emit()
-        if self._poll_thread is None:
+        Parameters
+        ----------
+        wait : bool, optional
+            Block until all jobs of this model have finished.
+        """
+        job = self._poll_job
+        if self._polling and job:
+            job.stop()
+            self._poll_job = None
+            self._polling = False
+
+        if wait:
+            for job in list(self._poll_jobs):
+                job.finished.wait()
+
+    @QtCore.Slot(object)
+    def _poll_job_finished(self, job: _DevicePollJob):
+        """Slot: a poll job finished."""
+        if job not in self._poll_jobs:
             return
 
-        self._poll_thread.data_ready.disconnect(self._data_ready)
-        self._poll_thread.finished.disconnect(self._poll_thread_finished)
-        self._polling = False
+        self._poll_jobs.discard(job)
+        self.data_updates_finished.emit()
+        if job is self._poll_job:
+            self._poll_job = None
+            self._polling = False
 
-    @QtCore.Slot()
-    def _data_ready(self) -> None:
+    @QtCore.Slot(object)
+    def _data_ready(self, job: _DevicePollJob) -> None:
         """
-        Slot: initial indication from _DevicePollThread that the data dictionary is ready.
+        Slot: initial indication from a poll job that the data dictionary is
+        ready.
         """
+        if job is not self._poll_job:
+            return
+
         self.beginResetModel()
         self._row_to_data = {
             row: data for row, (_, data) in enumerate(sorted(self._data.items()))
         }
+        self._attr_to_row = {
+            data.attr: row for row, data in self._row_to_data.items()
+        }
         self.endResetModel()
-        if self._poll_thread is not None:
-            self._poll_thread.data_changed.connect(self._data_changed)
 
-    @QtCore.Slot(str)
-    def _data_changed(self, attr: str) -> None:
-        """Slot: data changed for the given attribute in the thread."""
-        try:
-            row = list(self._data).index(attr)
-        except IndexError:
-            ...
-        else:
-            self.dataChanged.emit(
-                self.createIndex(row, DeviceColumn.readback),
-                self.createIndex(row, DeviceColumn.set_pvname),
-            )
+    @QtCore.Slot(object, list)
+    def _data_changed(self, job: _DevicePollJob, attrs: List[str]) -> None:
+        """Slot: data changed for the given attributes in the poll job."""
+        if job not in self._poll_jobs:
+            return
+
+        rows = [
+            self._attr_to_row[attr] for attr in attrs if attr in self._attr_to_row
+        ]
+        if not rows:
+            return
+
+        self.dataChanged.emit(
+            self.createIndex(min(rows), DeviceColumn.readback),
+            self.createIndex(max(rows), DeviceColumn.set_pvname),
+        )
 
     def get_data_for_row(self, row: int) -> Optional[OphydAttributeData]:
         """Get the OphydAttributeData for the provided row."""
@@ -425,14 +733,14 @@ class PolledDeviceModel(QtCore.QAbstractTableModel):
 
     @property
     def poll_rate(self) -> float:
-        """The poll rate for the underlying thread."""
+        """The poll rate for the underlying poll job."""
         return self._poll_rate
 
     @poll_rate.setter
     def poll_rate(self, rate: float) -> None:
         self._poll_rate = rate
-        if self._poll_thread is not None and self._polling:
-            self._poll_thread.poll_rate = rate
+        if self._poll_job is not None and self._polling:
+            self._poll_job.poll_rate = rate
 
     def hasChildren(self, index: QtCore.QModelIndex) -> bool:
         """Qt hook: does the index have children?"""
@@ -548,11 +856,13 @@ class OphydDeviceTableView(QtWidgets.QTableView):
         The ophyd device to look at.  May be set later.
     """
 
-    #: The default poll rate for the model update thread.
+    #: The default poll rate for the model updates.
     poll_rate: float = 0.0
-    #: Signal indicating the model's poll thread has started executing.
+    #: Monitor signals for live updates where possible.
+    monitor: bool = True
+    #: Signal indicating the model's polling has started.
     data_updates_started: ClassVar[QtCore.Signal] = QtCore.Signal()
-    #: Signal indicating the model's poll thread has finished executing.
+    #: Signal indicating the model's polling has finished.
     data_updates_finished: ClassVar[QtCore.Signal] = QtCore.Signal()
     #: Signal indicating the attributes have been selected by the user.
     attributes_selected: ClassVar[QtCore.Signal] = QtCore.Signal(
@@ -602,7 +912,10 @@ class OphydDeviceTableView(QtWidgets.QTableView):
             ...
 
     def clear(self):
-        """Clear all models and reset the device."""
+        """
+        Clear all models and reset the device.  Does not wait for reads in
+        progress, which finish in the background.
+        """
         self.stop()
         for model in self.models.values():
             model.stop()
@@ -684,7 +997,9 @@ class OphydDeviceTableView(QtWidgets.QTableView):
         try:
             model = self.models[device]
         except KeyError:
-            model = PolledDeviceModel(device=device, poll_rate=self.poll_rate)
+            model = PolledDeviceModel(
+                device=device, poll_rate=self.poll_rate, monitor=self.monitor
+            )
             self.models[device] = model
             new_model = True
         else:
@@ -774,12 +1089,15 @@ class OphydDeviceTableWidget(DesignerDisplay, QtWidgets.QFrame):
 
         self.edit_filter.textEdited.connect(set_filter)
         self.button_update_data.clicked.connect(update_data)
-        # For now, we are disabling polling for device tables.  Update at the
-        # request of the user.
+        # Device tables follow monitored signals live.  Polling is disabled,
+        # signals that can't be monitored are updated at the request of the
+        # user.
         self.device_table_view.poll_rate = 0.0
 
         def disable_button():
-            self.button_update_data.setEnabled(False)
+            # Updates continue until the table is closed when monitoring
+            if not self.device_table_view.monitor:
+                self.button_update_data.setEnabled(False)
 
         self.device_table_view.data_updates_started.connect(disable_button)
 
@@ -834,9 +1152,10 @@ class OphydDeviceTableWidget(DesignerDisplay, QtWidgets.QFrame):
         data = self.device_table_view.selected_attribute_data
 
         arch_widget = get_archive_viewer()
-        for datum in data:
-            dev_attr = '.'.join((datum.signal.parent.name, datum.attr))
-            arch_widget.add_signal(datum.pvname, dev_attr=dev_attr)
+        arch_widget.add_signals([
+            (datum.pvname, '.'.join((datum.signal.parent.name, datum.attr)))
+            for datum in data
+        ])
         arch_widget.show()
 
     def closeEvent(self, ev: QtGui.QCloseEvent):
@@ -1,13 +1,15 @@
 """
 Non-core utilities. Primarily dynamic styling tools.
 """
-from typing import ClassVar, Generator, Optional, Union
+from typing import Any, Callable, ClassVar, Generator, Optional, Union
 
 from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtCore import QEvent, QObject, QRegularExpression, Qt
 from qtpy.QtGui import QPalette, QRegularExpressionValidator
 from qtpy.QtWidgets import QLabel, QLineEdit
 
+from atef.qt_helpers import ThreadWorker
+
 PV_regexp = QRegularExpression(r'.*')
 PV_validator = QRegularExpressionValidator(PV_regexp)
 
@@ -147,6 +149,138 @@ def busy_cursor(func):
     return wrapper
 
 
+def run_with_progress(
+    func: Callable,
+    *args,
+    message: str = 'Working...',
+    parent: Optional[QtWidgets.QWidget] = None,
+    show_delay: int = 250,
+    **kwargs
+) -> Any:
+    """
+    Run ``func`` in a background thread, showing a busy progress dialog if it
+    takes longer than ``show_delay`` milliseconds.
+
+    The GUI event loop keeps running while waiting, so the application stays
+    responsive (repaints, progress), but this function only returns once
+    ``func`` does.  Exceptions raised by ``func`` are re-raised here.
+
+    Parameters
+    ----------
+    func : Callable
+        The function to run.
+    *args
+        Arguments for the function call.
+    message : str, optional
+        The label of the progress dialog.
+    parent : QtWidgets.QWidget, optional
+        The parent of the progress dialog.
+    show_delay : int, optional
+        Time to wait before showing the progress dialog [ms].
+    **kwargs
+        Keyword arguments for the function call.
+
+    Returns
+    -------
+    Any
+        The return value of ``func``.
+    """
+    worker = ThreadWorker(func, *args, **kwargs)
+    dialogs = []
+    loop = QtCore.QEventLoop()
+    worker.finished.connect(loop.quit)
+
+    def show_if_running():
+        if not worker.isRunning() or dialogs:
+            return
+        # Indeterminate (busy) progress, with no cancel button
+        dialog = QtWidgets.QProgressDialog(message, None, 0, 0, parent)
+        dialog.setWindowTitle('Please wait')
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.show()
+        dialogs.append(dialog)
+
+    timer = QtCore.QTimer()
+    timer.setSingleShot(True)
+    timer.timeout.connect(show_if_running)
+
+    set_wait_cursor()
+    try:
+        worker.start()
+        timer.start(show_delay)
+        if not worker.isFinished():
+            loop.exec_()
+        worker.wait()
+    finally:
+        timer.stop()
+        for dialog in dialogs:
+            dialog.close()
+            dialog.deleteLater()
+        reset_cursor()
+
+    if isinstance(worker.return_value, Exception):
+        raise worker.return_value
+    return worker.return_value
+
+
+class UpdateCoalescer(QObject):
+    """
+    Coalesce bursts of update requests into calls to ``callback`` at no more
+    than ``max_rate`` per second.
+
+    The first request after a quiet period is serviced on the next pass of the
+    event loop; further requests inside the interval are folded into a single
+    trailing call.
+
+    Parameters
+    ----------
+    callback : Callable[[], None]
+        The function performing the (possibly expensive) update.
+    max_rate : float, optional
+        The maximum number of calls to ``callback`` per second.
+    parent : QObject, optional
+        The parent of this object.
+    """
+    def __init__(
+        self,
+        callback: Callable[[], None],
+        max_rate: float = 10.0,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self.callback = callback
+        self.interval = int(1000 / max_rate) if max_rate > 0 else 0
+        self._elapsed = QtCore.QElapsedTimer()
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def pending(self) -> bool:
+        """True if a call to ``callback`` is scheduled."""
+        return self._timer.isActive()
+
+    def request(self, *args, **kwargs) -> None:
+        """Schedule a call to ``callback``, unless one is already pending."""
+        if self._timer.isActive():
+            return
+        if self._elapsed.isValid():
+            delay = max(self.interval - self._elapsed.elapsed(), 0)
+        else:
+            delay = 0
+        self._timer.start(delay)
+
+    def cancel(self) -> None:
+        """Drop any pending call to ``callback``."""
+        self._timer.stop()
+
+    def flush(self) -> None:
+        """Call ``callback`` now, dropping any pending call."""
+        self._timer.stop()
+        self._elapsed.start()
+        self.callback()
+
+
 class IgnoreInteractionFilter(QObject):
     interaction_events = (
         QEvent.KeyPress, QEvent.KeyRelease, QEvent.MouseButtonPress,